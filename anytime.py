@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import gurobipy as gp
+
+from utils import RESULT_COLUMNS, export_path, result_tables, shown_path, tabulate_results, write_tables
+
+
+INCUMBENT_FILENAME = 'course_schedule_incumbent.xlsx'
+
+
+def write_incumbent(m, where):
+    """
+    MIPSOL callback: writes every improved incumbent to m._stream['path']
+    in m._stream['fmt'] (see utils.write_tables), each file through a
+    temporary one, so readers never see a partial file.
+    """
+    if where != gp.GRB.Callback.MIPSOL:
+        return
+    stream = m._stream
+    lazy = getattr(m, '_lazy', None)
+    if lazy is not None and lazy.get('rejected'):
+        return
+    objective = m.cbGet(gp.GRB.Callback.MIPSOL_OBJ)
+    if stream['objective'] is not None and stream['sense'] * (objective - stream['objective']) >= -1e-9:
+        return
+
+    tables = []
+    for block, var_dict in stream['vars'].items():
+        keys = list(var_dict.keys())
+        values = np.asarray(m.cbGetSolution(list(var_dict.values()))) if keys else np.zeros(0)
+        tables.append(pd.DataFrame([keys[n] for n in np.flatnonzero(values > 0.5)], columns=RESULT_COLUMNS[block]))
+    results = tabulate_results(*tables, objective, *stream['attrs'])
+
+    root, ext = os.path.splitext(stream['path'])
+    tmp_root = f"{root}.{os.getpid()}.tmp"
+    for tmp_path in write_tables(result_tables(results), f"{tmp_root}{ext}", stream['fmt']):
+        os.replace(tmp_path, root + tmp_path[len(tmp_root):])
+
+    stream['objective'] = objective
+    stream['written'].append({'objective': objective, 'seconds': m.cbGet(gp.GRB.Callback.RUNTIME)})
+    print(f"Incumbent {objective} written to {shown_path(stream['path'], stream['fmt'])}")
+
+
+def stream_incumbents(m, v, data, path=INCUMBENT_FILENAME, fmt='xlsx'):
+    """
+    Registers write_incumbent with m (model.solve runs every callback in
+    m._callbacks), so each improved schedule found during the solve is
+    written like utils.export_results: to path with the extension of fmt.
+    m._stream['written'] lists the objective and solver runtime of every
+    write.
+    """
+    m._stream = {
+        'path': export_path(path, fmt),
+        'fmt': fmt,
+        'vars': {'x': v['x'], 'y': v['y'], 'l': v['l']},
+        'attrs': (data['courses_attr'], data['times_attr']),
+        'objective': None,
+        'sense': m.ModelSense,
+        'written': [],
+    }
+    m._callbacks = getattr(m, '_callbacks', []) + [write_incumbent]
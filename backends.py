@@ -0,0 +1,149 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+import gurobipy as gp
+
+from matrix import assemble, model_from_spec
+from model import DEFAULT_PARAMS, solve
+from utils import RESULT_COLUMNS, STATUS_CODES, tabulate_results
+
+try:
+    import highspy
+except ImportError:  # HiGHS is optional
+    highspy = None
+
+
+# Gurobi parameter names and their HiGHS options (name, type); other names are passed to HiGHS as is
+HIGHS_PARAMS = {
+    'OutputFlag': ('output_flag', bool),
+    'TimeLimit': ('time_limit', float),
+    'MIPGap': ('mip_rel_gap', float),
+    'Threads': ('threads', int),
+    'Seed': ('random_seed', int),
+}
+
+
+# --- Backends ---
+# Each solves an assemble() spec and returns a solution dict with the same keys:
+# backend, status (a STATUS_CODES name), objective, bound, values (one per column,
+# or None without a solution) and runtime.
+
+def solve_gurobi(spec, params=None, env=None):
+    """Solves a matrix spec with Gurobi."""
+    m, _ = model_from_spec(spec, env)
+    try:
+        solve(m, params)
+        has_solution = m.SolCount > 0
+        return {
+            'backend': 'gurobi',
+            'status': STATUS_CODES.get(m.status, 'UNKNOWN'),
+            'objective': m.ObjVal if has_solution else None,
+            'bound': m.ObjBound if has_solution else None,
+            'values': np.asarray(m.getAttr('X', m.getVars())) if has_solution else None,
+            'runtime': m.Runtime,
+        }
+    finally:
+        m.dispose()
+
+
+def _highs_status(model_status):
+    """Maps a HighsModelStatus onto the STATUS_CODES names."""
+    status = highspy.HighsModelStatus
+    return {
+        status.kOptimal: 'OPTIMAL',
+        status.kInfeasible: 'INFEASIBLE',
+        status.kUnboundedOrInfeasible: 'INF_OR_UNBD',
+        status.kUnbounded: 'UNBOUNDED',
+        status.kTimeLimit: 'TIME_LIMIT',
+        status.kInterrupt: 'INTERRUPTED',
+        status.kSolutionLimit: 'SUBOPTIMAL',
+        status.kIterationLimit: 'SUBOPTIMAL',
+    }.get(model_status, 'UNKNOWN')
+
+
+def solve_highs(spec, params=None, env=None):
+    """Solves a matrix spec with HiGHS (highspy). env is ignored."""
+    if highspy is None:
+        raise ImportError("The highs backend needs highspy (pip install highspy)")
+
+    n = len(spec['obj'])
+    A = spec['A'].tocsr()
+    sense, rhs = spec['sense'], spec['rhs']
+
+    lp = highspy.HighsLp()
+    lp.num_col_ = n
+    lp.num_row_ = A.shape[0]
+    lp.col_cost_ = spec['obj']
+    lp.col_lower_ = spec['lb']
+    lp.col_upper_ = spec['ub']
+    lp.row_lower_ = np.where(sense == '<', -highspy.kHighsInf, rhs)
+    lp.row_upper_ = np.where(sense == '>', highspy.kHighsInf, rhs)
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+    lp.a_matrix_.num_col_ = n
+    lp.a_matrix_.num_row_ = A.shape[0]
+    lp.a_matrix_.start_ = A.indptr
+    lp.a_matrix_.index_ = A.indices
+    lp.a_matrix_.value_ = A.data
+    lp.integrality_ = [highspy.HighsVarType.kInteger if vtype == gp.GRB.BINARY else highspy.HighsVarType.kContinuous
+                       for vtype in spec['vtype']]
+    if spec['model_sense'] == gp.GRB.MAXIMIZE:
+        lp.sense_ = highspy.ObjSense.kMaximize
+
+    h = highspy.Highs()
+    for key, value in {**DEFAULT_PARAMS, **(params or {})}.items():
+        if key in HIGHS_PARAMS:
+            key, cast = HIGHS_PARAMS[key]
+            value = cast(value)
+        h.setOptionValue(key, value)
+    h.passModel(lp)
+
+    start = time.perf_counter()
+    h.run()
+    runtime = time.perf_counter() - start
+
+    info = h.getInfo()
+    has_solution = info.primal_solution_status == 2
+    return {
+        'backend': 'highs',
+        'status': _highs_status(h.getModelStatus()),
+        'objective': info.objective_function_value if has_solution else None,
+        'bound': info.mip_dual_bound if has_solution else None,
+        'values': np.asarray(h.getSolution().col_value) if has_solution else None,
+        'runtime': runtime,
+    }
+
+
+BACKENDS = {
+    'gurobi': solve_gurobi,
+    'highs': solve_highs,
+}
+
+
+# --- Backend API ---
+
+def solve_data(data, options=None, backend='gurobi', params=None, env=None):
+    """
+    Assembles the model (see matrix.assemble) and solves it with the named
+    backend. Returns the spec and the solution dict.
+    """
+    spec = assemble(data, options)
+    return spec, BACKENDS[backend](spec, params, env)
+
+
+def solution_values(spec, values):
+    """Splits a column vector into {block: {key: value}} with the model's variable keys."""
+    blocks, start = {}, 0
+    for block, keys in spec['var_keys'].items():
+        blocks[block] = dict(zip(keys, values[start:start + len(keys)].tolist()))
+        start += len(keys)
+    return blocks
+
+
+def solution_results(spec, solution, data):
+    """Returns the result tables of a backend solution (see utils.extract_results)."""
+    blocks = solution_values(spec, solution['values'])
+    tables = [pd.DataFrame([key for key, value in blocks[block].items() if value > 0.5], columns=RESULT_COLUMNS[block])
+              for block in ('x', 'y', 'l')]
+    return tabulate_results(*tables, solution['objective'], data['courses_attr'], data['times_attr'])
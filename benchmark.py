@@ -0,0 +1,303 @@
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import gurobipy as gp
+
+from backends import BACKENDS
+from data import load_data
+from generator import generate_workbook
+from model import build_model, prof_classes, solve, time_classes
+from matrix import assemble, equivalent
+
+
+# Synthetic instance sizes for the scaling benchmark (x1 ~ CoursePreferences.xlsx)
+SCALING_SIZES = {
+    'x1': {'num_profs': 23, 'num_courses': 26, 'num_time_blocks': 7},
+    'x2': {'num_profs': 46, 'num_courses': 52, 'num_time_blocks': 10},
+    'x4': {'num_profs': 92, 'num_courses': 104, 'num_time_blocks': 17},
+    'x8': {'num_profs': 184, 'num_courses': 208, 'num_time_blocks': 35},
+}
+
+
+# --- Constraint 9 Formulations ---
+
+def bench_double_booking(file_path="CoursePreferences.xlsx", repeats=1):
+    """
+    Solves the model with the linear and the bilinear form of Constraint 9
+    (no_double_booking) and returns a DataFrame comparing solve times.
+    """
+    data = load_data(file_path)
+
+    rows = []
+    for label, linearize in [('linear', True), ('bilinear', False)]:
+        for rep in range(repeats):
+            m, _ = build_model(data, {'linearize': linearize})
+            row = {'formulation': label, 'repeat': rep, 'num_vars': m.NumVars, 'num_constrs': m.NumConstrs,
+                   'num_qconstrs': m.NumQConstrs}
+            try:
+                status = solve(m)
+                row.update({
+                    'status': status,
+                    'objective': m.ObjVal if m.SolCount > 0 else None,
+                    'runtime': m.Runtime,
+                    'nodes': m.NodeCount,
+                })
+            except gp.GurobiError as e:
+                row['error'] = str(e)
+            rows.append(row)
+            m.dispose()
+
+    return pd.DataFrame(rows)
+
+
+# --- Expression vs Matrix Builder ---
+
+def bench_builders(file_path="CoursePreferences.xlsx", repeats=1):
+    """
+    Times the expression and matrix-API builders for the sparse and dense
+    variable sets, and checks that both produce the same model (same
+    columns, objective and rows, matched by name).
+    """
+    data = load_data(file_path)
+
+    rows = []
+    for sparse in (True, False):
+        for rep in range(repeats):
+            timings, models = {}, {}
+            for builder in ('expr', 'matrix'):
+                start = time.perf_counter()
+                models[builder], _ = build_model(data, {'sparse': sparse, 'builder': builder})
+                timings[builder] = time.perf_counter() - start
+            rows.append({
+                'sparse': sparse,
+                'repeat': rep,
+                'expr_seconds': timings['expr'],
+                'matrix_seconds': timings['matrix'],
+                'num_vars': models['matrix'].NumVars,
+                'num_constrs': models['matrix'].NumConstrs,
+                'equivalent': equivalent(models['expr'], models['matrix']),
+            })
+            for m in models.values():
+                m.dispose()
+
+    return pd.DataFrame(rows)
+
+
+# --- Symmetry Breaking ---
+
+def bench_symmetry(file_path="CoursePreferences.xlsx", repeats=1):
+    """
+    Solves the model with and without the symmetry-breaking rows and returns a
+    DataFrame comparing node counts and runtimes. The Seed is varied per repeat
+    since node counts of a single run are noisy.
+    """
+    data = load_data(file_path)
+    print(f"Interchangeable professors: {prof_classes(data)}; time slots: {time_classes(data)}")
+
+    rows = []
+    for symmetry in (False, True):
+        for rep in range(repeats):
+            m, _ = build_model(data, {'symmetry': symmetry})
+            row = {'symmetry': symmetry, 'repeat': rep, 'num_constrs': m.NumConstrs}
+            try:
+                status = solve(m, {'Seed': rep})
+                row.update({
+                    'status': status,
+                    'objective': m.ObjVal if m.SolCount > 0 else None,
+                    'runtime': m.Runtime,
+                    'nodes': m.NodeCount,
+                })
+            except gp.GurobiError as e:
+                row['error'] = str(e)
+            rows.append(row)
+            m.dispose()
+
+    return pd.DataFrame(rows)
+
+
+# --- Lab Linking ---
+
+def _lab_case(label, data, params):
+    """Root LP bound, size and solve statistics of the fractional and the tight Constraint 11."""
+    rows = []
+    for tight in (False, True):
+        m, _ = build_model(data, {'tight_labs': tight})
+        row = {'instance': label, 'tight_labs': tight, 'num_constrs': m.NumConstrs, 'num_nzs': m.NumNZs}
+        try:
+            relaxed = m.relax()
+            relaxed.setParam('OutputFlag', 0)
+            relaxed.optimize()
+            row.update({'root_lp_bound': relaxed.ObjVal if relaxed.SolCount > 0 else None,
+                        'root_lp_seconds': relaxed.Runtime})
+            relaxed.dispose()
+
+            solve(m, params)
+            row.update({
+                'status': m.status,
+                'objective': m.ObjVal if m.SolCount > 0 else None,
+                'bound': m.ObjBound,
+                'runtime': m.Runtime,
+                'nodes': m.NodeCount,
+            })
+        except gp.GurobiError as e:
+            row['error'] = str(e)
+        rows.append(row)
+        m.dispose()
+    return rows
+
+
+def bench_labs(file_path="CoursePreferences.xlsx", sizes=(), time_limit=60, seed=0):
+    """
+    Compares the fractional and the tight (aggregated) lab linking rows of
+    Constraint 11 on the workbook and on generated instances of the given
+    scaling sizes: rows, nonzeros, root LP bound and time, and the MIP solve.
+    The objective is pinned to the total credits by Constraint 1, so a tighter
+    relaxation shows up in the node count and solve time rather than the bound.
+    """
+    params = {'OutputFlag': 0, 'TimeLimit': time_limit}
+    rows = _lab_case(os.path.basename(file_path), load_data(file_path), params)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in sizes:
+            path = generate_workbook(os.path.join(tmp_dir, f"{name}.xlsx"), seed=seed, **SCALING_SIZES[name])
+            rows += _lab_case(name, load_data(path, cache_dir=None), params)
+    return pd.DataFrame(rows)
+
+
+# --- Solver Backends ---
+
+def bench_backends(file_path="CoursePreferences.xlsx", sizes=(), backends=None, time_limit=60, seed=0):
+    """
+    Solves the same matrix-form model with every backend (see backends.py)
+    on the workbook and on generated instances of the given scaling sizes,
+    and returns status, objective, bound and solve seconds per engine.
+    """
+    params = {'OutputFlag': 0, 'TimeLimit': time_limit}
+    instances = [(os.path.basename(file_path), load_data(file_path))]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in sizes:
+            path = generate_workbook(os.path.join(tmp_dir, f"{name}.xlsx"), seed=seed, **SCALING_SIZES[name])
+            instances.append((name, load_data(path, cache_dir=None)))
+
+    rows = []
+    for label, data in instances:
+        start = time.perf_counter()
+        spec = assemble(data)
+        build_seconds = time.perf_counter() - start
+        for backend in backends or list(BACKENDS):
+            row = {'instance': label, 'backend': backend, 'build_seconds': build_seconds,
+                   'num_vars': spec['A'].shape[1], 'num_constrs': spec['A'].shape[0]}
+            try:
+                solution = BACKENDS[backend](spec, params)
+                row.update({key: solution[key] for key in ('status', 'objective', 'bound', 'runtime')})
+            except gp.GurobiError as e:
+                row['error'] = str(e)
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+# --- Scaling ---
+
+def _scaling_case(name, size, options, params, seed):
+    """Generates, loads, builds and solves one instance; runs in its own process so peak RSS is per size."""
+    row = {'size': name, **size, 'seed': seed}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = generate_workbook(os.path.join(tmp_dir, f"{name}.xlsx"), seed=seed, **size)
+
+        start = time.perf_counter()
+        data = load_data(file_path, cache_dir=None)
+        row['load_seconds'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    m, _ = build_model(data, options)
+    row['build_seconds'] = time.perf_counter() - start
+    row.update({'num_vars': m.NumVars, 'num_constrs': m.NumConstrs, 'num_nzs': m.NumNZs})
+
+    try:
+        solve(m, params)
+        row.update({
+            'status': m.status,
+            'solve_seconds': m.Runtime,
+            'objective': m.ObjVal if m.SolCount > 0 else None,
+            'mip_gap': m.MIPGap if m.SolCount > 0 else None,
+            'nodes': m.NodeCount,
+        })
+    except gp.GurobiError as e:
+        row['error'] = str(e)
+
+    # ru_maxrss is in KB on Linux
+    row['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return row
+
+
+def bench_scaling(sizes=None, options=None, time_limit=60, seed=0, out="bench_scaling.json"):
+    """
+    Runs the model on generated instances of growing size and reports load and
+    build seconds, variable/constraint/nonzero counts, peak RSS, solve time and
+    MIP gap per size. Results are written to out as JSON.
+    """
+    sizes = sizes or list(SCALING_SIZES)
+    params = {'OutputFlag': 0, 'TimeLimit': time_limit}
+
+    rows = []
+    context = multiprocessing.get_context('spawn')
+    for name in sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            rows.append(pool.submit(_scaling_case, name, SCALING_SIZES[name], options, params, seed).result())
+
+    report = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'gurobi': '.'.join(map(str, gp.gurobi.version())),
+        'options': options or {},
+        'params': params,
+        'results': rows,
+    }
+    with open(out, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks for the course scheduling model.")
+    parser.add_argument("benchmark", choices=['double_booking', 'builders', 'symmetry', 'labs', 'backends', 'scaling'], help="Benchmark to run")
+    parser.add_argument("--file", default="CoursePreferences.xlsx", help="Course preferences workbook")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per configuration")
+    parser.add_argument("--sizes", default=','.join(SCALING_SIZES), help="Comma separated generated sizes (scaling, labs, backends)")
+    parser.add_argument("--builder", default='expr', choices=['expr', 'matrix'], help="Model builder for the scaling run")
+    parser.add_argument("--time-limit", type=float, default=60, help="TimeLimit per solve in seconds")
+    parser.add_argument("--out", default="bench_scaling.json", help="JSON report for the scaling run")
+    args = parser.parse_args()
+
+    if args.benchmark == 'double_booking':
+        results = bench_double_booking(args.file, args.repeats)
+        print(results.to_string(index=False))
+        if 'runtime' in results:
+            print(results.groupby('formulation')['runtime'].describe())
+    elif args.benchmark == 'builders':
+        results = bench_builders(args.file, args.repeats)
+        print(results.to_string(index=False))
+        if not results['equivalent'].all():
+            raise SystemExit("Matrix builder does not match the expression builder")
+    elif args.benchmark == 'symmetry':
+        results = bench_symmetry(args.file, args.repeats)
+        print(results.to_string(index=False))
+        if 'runtime' in results:
+            print(results.groupby('symmetry')[['runtime', 'nodes']].describe())
+    elif args.benchmark == 'labs':
+        results = bench_labs(args.file, args.sizes.split(','), args.time_limit)
+        print(results.to_string(index=False))
+    elif args.benchmark == 'backends':
+        results = bench_backends(args.file, args.sizes.split(','), time_limit=args.time_limit)
+        print(results.to_string(index=False))
+    elif args.benchmark == 'scaling':
+        results = bench_scaling(args.sizes.split(','), {'builder': args.builder}, args.time_limit, out=args.out)
+        print(results.to_string(index=False))
+        print(f"\nWrote {args.out}")
@@ -0,0 +1,209 @@
+import hashlib
+import os
+import pickle
+
+import pandas as pd
+import numpy as np
+
+from profiler import phase
+from utils import df_with_letter_index
+
+
+# Bump when the parsed layout changes so stale cache entries are ignored
+CACHE_VERSION = 2
+CACHE_DIR = ".cache"
+
+# Credits per course in a professor's load (max_credit = NumCourses * LOAD_MULTIPLIER)
+LOAD_MULTIPLIER = 3
+
+
+# --- Input Cache ---
+
+def file_hash(file_path):
+    """Returns the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_data(file_path="CoursePreferences.xlsx", cache_dir=CACHE_DIR, profiler=None):
+    """
+    Returns the parsed input data for a workbook (see parse_workbook).
+    Results are cached in cache_dir keyed on the file's content hash, so the
+    xlsx is only reparsed when it changes. Pass cache_dir=None to always parse.
+    """
+    if cache_dir is None:
+        return parse_workbook(file_path, profiler)
+
+    with phase(profiler, 'hash'):
+        key = f"{file_hash(file_path)[:16]}-v{CACHE_VERSION}"
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    cache_path = os.path.join(cache_dir, f"{stem}-{key}.pkl")
+
+    if os.path.exists(cache_path):
+        with phase(profiler, 'read_cache'), open(cache_path, 'rb') as f:
+            return pickle.load(f)
+
+    data = parse_workbook(file_path, profiler)
+    with phase(profiler, 'write_cache'):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    return data
+
+
+# --- Input Data (Replaces Sections 1-3) ---
+
+def parse_workbook(file_path="CoursePreferences.xlsx", profiler=None):
+    """
+    Reads the course preferences workbook and returns the attribute tables,
+    the model parameters and the index sets as a dict (see tables_from_sheets).
+    """
+    with phase(profiler, 'read_excel'):
+        all_sheets = pd.read_excel(file_path, sheet_name=None)
+    with phase(profiler, 'tables'):
+        return tables_from_sheets(all_sheets)
+
+def tables_from_sheets(all_sheets):
+    """
+    Builds the attribute tables, the model parameters and the index sets from
+    the workbook's sheets. Parameters come both as NumPy arrays (a_arr ...
+    e_arr, axes ordered like idx_prof, idx_course and idx_time) and as
+    label-keyed dicts (a_var ... e_var).
+    """
+    # Data frames Courses, loads, and times
+    courses_df = all_sheets.get("Courses")
+    loads_df = all_sheets.get("Loads")
+    times_df = all_sheets.get("Times")
+
+    ###############################
+    ### Section 2: Attr Tables  ###
+    ###############################
+
+    # Get the number of Prof, look at A and then full length
+    num_prof = courses_df.shape[1] - courses_df.columns.get_loc('A')
+
+    # Create inital prof data.frame
+    prof_attr = df_with_letter_index(num_prof)
+
+    # Maximal course load for professor
+    prof_attr = prof_attr.merge(loads_df, on='Prof', how='left')
+    prof_attr = prof_attr.rename(columns={'NumCourses': 'max_credit'})
+    prof_attr['max_credit'] = prof_attr['max_credit'] * LOAD_MULTIPLIER
+
+    # Drop the trailing legend rows
+    times_df = times_df[:-2].reset_index() # Issue with x=no in xlsx
+    courses_df = courses_df[:-2] #issue with xlsx
+
+    times_attr = times_df[['index','Times','Days']].copy() # Create times attr
+    courses_attr = courses_df[['Number','Name','Grad/Ugrad','Credits','Labs/Discussion Sections','Total Enrollment']].copy() # Create courses attr
+
+    # Clean times attr table
+    times_attr['Times_Grp'] = times_attr['Times'].factorize()[0]
+    times_attr['Times_Grp_Day'] = (times_attr.index // 4) * 2 + (times_attr.index % 4 == 3).astype(int)
+
+    # Clean courses attr table
+    courses_attr.loc[courses_attr['Grad/Ugrad'] == 'Ugrad', 'Credits'] *= 3
+    courses_attr['Number'] = courses_attr['Number'].astype(int)
+    courses_attr['Number_Group'] = np.where(
+        (courses_attr['Number'] >= 500) & (courses_attr['Number'] <= 699),
+        6,
+        ((courses_attr['Number'] - 1) // 100)
+    )
+    courses_attr['Labs'] = (courses_attr['Labs/Discussion Sections'] > 0).astype(int)
+
+    ### Index Sets
+
+    # Idx arrays
+    idx_prof = np.unique(prof_attr['Prof'].to_numpy())          # Set of Professors (i)
+    idx_course = np.unique(courses_attr['Number'].to_numpy())  # Set of Courses (j)
+    idx_time = np.unique(times_attr['index'].to_numpy())       # Set of Time Slots (k)
+    course_groups = courses_attr.groupby('Number_Group')['Number'].apply(list).to_dict()
+    idx_group = list(course_groups)                           # Set of Course Groups (g)
+    day_time_groups = times_attr.groupby('Times_Grp_Day')['index'].apply(list).to_dict()
+    idx_day_time = list(day_time_groups)                      # Set of Day-Time Group IDs (t)
+    prime_indices = times_attr.iloc[4:16]['index'].tolist()   # Find index of prime class scheduling times
+    class_grp_701 = courses_attr[courses_attr['Number'] == 701]['Number_Group'].iloc[0] # Auto find 700 level classes
+    tues_thurs_indices = times_attr[times_attr['Days'] == "T/TH"]['index'].tolist() # Find index of tuesday/thursday classes
+
+    # Position of each label along the array axes
+    prof_index = {i: n for n, i in enumerate(idx_prof.tolist())}
+    course_index = {j: n for n, j in enumerate(idx_course.tolist())}
+    time_index = {k: n for n, k in enumerate(idx_time.tolist())}
+
+    #################################
+    ### Section 3: Vars for Optim ###
+    #################################
+
+    ### Pre-Determined (arrays ordered by idx_prof, idx_course, idx_time)
+    # a_i prof max credit loads
+    a_arr = prof_attr.set_index('Prof')['max_credit'].reindex(idx_prof).to_numpy(dtype=float)
+
+    # b_j class total credits
+    b_arr = courses_attr.set_index('Number')['Credits'].reindex(idx_course).to_numpy(dtype=float)
+
+    # c_{i,j} prof class elig (x = yes)
+    course_cells = courses_df.set_index(courses_attr['Number'])[idx_prof].reindex(idx_course)
+    c_arr = (np.char.strip(course_cells.to_numpy(dtype=str)) == 'x').T.astype(int)
+
+    # d_{i,k} prof time elig (x = no)
+    time_cells = times_df.set_index('index')[idx_prof].reindex(idx_time)
+    d_arr = (np.char.strip(time_cells.to_numpy(dtype=str)) != 'x').T.astype(int)
+
+    # e_j class has labs
+    e_arr = courses_attr.set_index('Number')['Labs'].reindex(idx_course).to_numpy(dtype=int)
+
+    ### Parameter dicts keyed by labels
+    profs, courses, times = idx_prof.tolist(), idx_course.tolist(), idx_time.tolist()
+    a_var = dict(zip(profs, a_arr.tolist()))
+    b_var = dict(zip(courses, b_arr.tolist()))
+    c_var = {(i, j): c for i, row in zip(profs, c_arr.tolist()) for j, c in zip(courses, row)}
+    d_var = {(i, k): d for i, row in zip(profs, d_arr.tolist()) for k, d in zip(times, row)}
+    e_var = dict(zip(courses, e_arr.tolist()))
+
+    return {
+        'prof_attr': prof_attr,
+        'courses_attr': courses_attr,
+        'times_attr': times_attr,
+        'a_var': a_var,
+        'b_var': b_var,
+        'c_var': c_var,
+        'd_var': d_var,
+        'e_var': e_var,
+        'a_arr': a_arr,
+        'b_arr': b_arr,
+        'c_arr': c_arr,
+        'd_arr': d_arr,
+        'e_arr': e_arr,
+        'prof_index': prof_index,
+        'course_index': course_index,
+        'time_index': time_index,
+        'idx_prof': idx_prof,
+        'idx_course': idx_course,
+        'idx_time': idx_time,
+        'course_groups': course_groups,
+        'idx_group': idx_group,
+        'day_time_groups': day_time_groups,
+        'idx_day_time': idx_day_time,
+        'prime_indices': prime_indices,
+        'class_grp_701': class_grp_701,
+        'tues_thurs_indices': tues_thurs_indices,
+    }
+
+
+# --- Scenario Variants ---
+
+def scale_loads(data, multiplier):
+    """
+    Returns a copy of data with the professor loads recomputed as
+    NumCourses * multiplier instead of NumCourses * LOAD_MULTIPLIER.
+    """
+    scaled = dict(data)
+    scaled['prof_attr'] = data['prof_attr'].copy()
+    scaled['prof_attr']['max_credit'] = data['prof_attr']['max_credit'] / LOAD_MULTIPLIER * multiplier
+    scaled['a_arr'] = data['a_arr'] / LOAD_MULTIPLIER * multiplier
+    scaled['a_var'] = dict(zip(data['idx_prof'].tolist(), scaled['a_arr'].tolist()))
+    return scaled
@@ -0,0 +1,196 @@
+import copy
+import time
+
+import numpy as np
+
+import gurobipy as gp
+
+from model import DEFAULT_OPTIONS, build_model, one_prof, prof_max, set_objective, solve
+from utils import STATUS_CODES
+
+
+# Position of the course number within each variable block's keys
+COURSE_POS = {'x': 1, 'y': 0, 'z': None, 'l': 1, 'w': 1}
+
+
+# --- Stage One: Professor to Course ---
+
+def build_master(data, env=None):
+    """
+    Builds the assignment MIP over x only: the objective and Constraints 1-3,
+    plus the slot count implied by Constraints 5, 8 and 9 (a professor
+    teaches each course in its own time slot, so at most ceil(a_i/3) courses
+    and no more courses than available slots). Returns the model and x.
+    """
+    profs, courses = data['idx_prof'].tolist(), data['idx_course'].tolist()
+    m = gp.Model('course_assign', env=env)
+
+    # Constraint 3 through the sparse index set
+    ii, jj = np.nonzero(data['c_arr'] == 1)
+    x_var = gp.tupledict({
+    (profs[n], courses[p]): m.addVar(name=f"x_{profs[n]}_{courses[p]}", vtype=gp.GRB.BINARY)
+    for n, p in zip(ii.tolist(), jj.tolist())
+    })
+    v = {'x': x_var}
+    m.update()
+
+    set_objective(m, v, data, None)
+    one_prof(m, v, data, None)
+    prof_max(m, v, data, None)
+
+    slots = (data['d_arr'] == 1).sum(axis=1)
+    m.addConstrs(
+        (x_var.sum(i, '*') <= min(-(-data['a_var'][i]//3), slots[n])
+         for n, i in enumerate(profs)),
+        name='slot_count'
+    )
+    m.update()
+    return m, x_var
+
+
+def assigned_pairs(m, x_var):
+    """Returns the (prof, course) pairs chosen in the master's solution."""
+    values = m.getAttr('X', list(x_var.values()))
+    return [key for key, value in zip(x_var.keys(), values) if value > 0.5]
+
+
+# --- Stage Two: Timetabling ---
+
+def restrict_to_assignment(data, pairs):
+    """Returns a copy of data whose only eligible (prof, course) pairs are the given ones."""
+    data = copy.copy(data)
+    prof_index, course_index = data['prof_index'], data['course_index']
+    data['c_arr'] = np.zeros_like(data['c_arr'])
+    for i, j in pairs:
+        data['c_arr'][prof_index[i], course_index[j]] = 1
+    chosen = set(pairs)
+    data['c_var'] = {key: int(key in chosen) for key in data['c_var']}
+    return data
+
+
+def iis_courses(m, v):
+    """
+    Computes an IIS of an infeasible timetabling model and returns the
+    courses whose variables appear in it. Returns None if no IIS is found.
+    """
+    course_of = [None] * m.NumVars
+    for block, pos in COURSE_POS.items():
+        if pos is None:
+            continue
+        for key, var in v[block].items():
+            course_of[var.index] = key[pos]
+
+    try:
+        m.computeIIS()
+    except gp.GurobiError:
+        return None
+
+    courses = set()
+    constrs = m.getConstrs()
+    for constr, in_iis in zip(constrs, m.getAttr('IISConstr', constrs) if constrs else []):
+        if in_iis:
+            row = m.getRow(constr)
+            courses.update(course_of[row.getVar(n).index] for n in range(row.size()))
+    for qc in m.getQConstrs():
+        if qc.IISQConstr:
+            row = m.getQCRow(qc)
+            courses.update(course_of[row.getVar1(n).index] for n in range(row.size()))
+            courses.update(course_of[row.getVar2(n).index] for n in range(row.size()))
+            lin = row.getLinExpr()
+            courses.update(course_of[lin.getVar(n).index] for n in range(lin.size()))
+    variables = m.getVars()
+    for var, lb, ub in zip(variables, m.getAttr('IISLB', variables), m.getAttr('IISUB', variables)):
+        if lb or ub:
+            courses.add(course_of[var.index])
+    courses.discard(None)
+    return courses
+
+
+# --- Decomposition ---
+
+def solve_stage2(m, params=None):
+    """
+    Solves a stage-two model and returns (status, outcome): 'solved' once it
+    holds a timetable, 'infeasible', or 'inconclusive' when the solve stopped
+    (time limit, interrupt) without one. Presolve may only report
+    INF_OR_UNBD for an infeasible MIP, so that status is re-solved with
+    DualReductions off to tell.
+    """
+    status = solve(m, params)
+    if status == gp.GRB.INF_OR_UNBD and m.SolCount == 0:
+        status = solve(m, {**(params or {}), 'DualReductions': 0})
+    if m.SolCount > 0:
+        return status, 'solved'
+    if status == gp.GRB.INFEASIBLE:
+        return status, 'infeasible'
+    return status, 'inconclusive'
+
+
+def solve_decomposed(data, options=None, params=None, env=None, max_iters=50, iis_cuts=True):
+    """
+    Logic-based Benders decomposition of the course scheduling model.
+    Stage one assigns professors to courses (build_master); stage two fixes
+    that assignment and solves the timetabling model over y/z/l, which is
+    build_model on the restricted data. When stage two is infeasible, a
+    no-good cut excludes the assignment from stage one: over the courses in
+    the stage-two IIS when iis_cuts is set, else over every course.
+
+    Returns the last stage-two model, its variables and one history row per
+    iteration; row['stage2'] is the outcome of solve_stage2, and the loop
+    stops at the first 'solved' or 'inconclusive' one. The model is optimal
+    for the full problem when its status is OPTIMAL; the full model's
+    objective only depends on x, so the first feasible timetable is optimal.
+    The model is None when the master found no assignment (see the last
+    row's master_status).
+    """
+    options = {**DEFAULT_OPTIONS, **(options or {}), 'sparse': True}
+    master, x_var = build_master(data, env)
+
+    history = []
+    m, v = None, None
+    for it in range(max_iters):
+        start = time.perf_counter()
+        row = {'iteration': it, 'master_status': solve(master, params)}
+        if master.SolCount == 0:
+            history.append(row)
+            break
+        pairs = assigned_pairs(master, x_var)
+
+        if m is not None:
+            m.dispose()
+        m, v = build_model(restrict_to_assignment(data, pairs), options, env)
+        row['stage2_status'], row['stage2'] = solve_stage2(m, params)
+        if row['stage2'] != 'infeasible':
+            row['seconds'] = time.perf_counter() - start
+            history.append(row)
+            break
+
+        courses = iis_courses(m, v) if iis_cuts else None
+        if courses is None:
+            courses = {j for (_, j) in pairs}
+        cut = [(i, j) for (i, j) in pairs if j in courses]
+        master.addConstr(gp.quicksum(x_var[key] for key in cut) <= len(cut) - 1, name=f"no_good[{it}]")
+        row['cut_size'] = len(cut)
+        row['seconds'] = time.perf_counter() - start
+        history.append(row)
+
+    master.dispose()
+    return m, v, history
+
+
+def stop_message(history):
+    """
+    Why a decomposition ended without a schedule, from its last history row:
+    a stage-two solve was inconclusive (row['stage2']), the iteration limit
+    cut off the loop, the master stopped (time limit, interrupt) before
+    finding an assignment, or the master proved that no assignment is left.
+    """
+    row = history[-1]
+    if row.get('stage2') == 'inconclusive':
+        return "Stage 2 inconclusive: a timetable solve stopped before finding a timetable."
+    if row.get('cut_size') or row.get('cuts'):
+        return "The iteration limit was reached before an assignment admitted a feasible timetable."
+    if row['master_status'] in (gp.GRB.INFEASIBLE, gp.GRB.INF_OR_UNBD):
+        return "No professor-course assignment admits a feasible timetable."
+    return (f"The assignment master stopped with status {STATUS_CODES.get(row['master_status'], 'UNKNOWN')} "
+            "before finding an assignment.")
@@ -0,0 +1,165 @@
+import argparse
+import math
+
+import numpy as np
+import pandas as pd
+
+from utils import df_with_letter_index
+
+
+# Meeting patterns of each time block, in the order of the Times sheet
+DAY_PATTERNS = ['M/W', 'W/F', 'M/F', 'T/TH']
+
+# Time blocks per day (8:30am to 7:15pm, 95 minutes apart). Further blocks are
+# added as staggered rounds, each starting ROUND_OFFSET minutes later.
+BLOCKS_PER_DAY = 7
+ROUND_OFFSET = 15
+MAX_ROUNDS = 95 // ROUND_OFFSET
+
+# Course levels (hundreds) and their share of the catalogue. 500 and 600 level
+# courses form one course group (Number_Group 6), so every group gets a sixth.
+LEVEL_SHARES = {1: 1/6, 2: 1/6, 3: 1/6, 4: 1/6, 5: 1/12, 6: 1/12, 7: 1/6}
+
+
+# --- Sheets ---
+
+def _time_label(start_minutes, length=75):
+    """Formats a class time like the Times sheet does (e.g. '8:30-9:45am')."""
+    def clock(minutes):
+        hours, mins = divmod(minutes, 60)
+        return f"{(hours - 1) % 12 + 1}:{mins:02d}"
+    end = start_minutes + length
+    return f"{clock(start_minutes)}-{clock(end)}{'am' if end < 12 * 60 else 'pm'}"
+
+
+def _block_starts(num_time_blocks):
+    """
+    Start minutes of each time block: BLOCKS_PER_DAY blocks a day from 8:30,
+    then further rounds of the same blocks shifted by ROUND_OFFSET minutes,
+    so every block has its own label and no class runs past the evening.
+    """
+    rounds = -(-num_time_blocks // BLOCKS_PER_DAY)
+    if rounds > MAX_ROUNDS:
+        raise ValueError(f"At most {MAX_ROUNDS * BLOCKS_PER_DAY} time blocks can have distinct start times")
+    starts = [8 * 60 + 30 + 95 * (b % BLOCKS_PER_DAY) + ROUND_OFFSET * (b // BLOCKS_PER_DAY)
+              for b in range(num_time_blocks)]
+    labels = [_time_label(start) for start in starts]
+    assert len(set(labels)) == num_time_blocks, "time block labels must be unique"
+    return starts
+
+
+def _course_numbers(num_courses, rng):
+    """Draws unique course numbers spread over the levels; 701 is always included."""
+    counts = {level: max(1, round(share * num_courses)) for level, share in LEVEL_SHARES.items()}
+    while sum(counts.values()) > num_courses:
+        counts[max(counts, key=counts.get)] -= 1
+    while sum(counts.values()) < num_courses:
+        counts[min(counts, key=counts.get)] += 1
+
+    numbers = []
+    for level, count in counts.items():
+        pool = np.arange(level * 100 + 1, level * 100 + 100)
+        if level == 7:
+            pool = pool[pool != 701]
+            count -= 1
+            numbers.append(701)
+        numbers += rng.choice(pool, size=count, replace=False).tolist()
+    return sorted(numbers)
+
+
+def generate_sheets(num_profs=23, num_courses=26, num_time_blocks=7, eligibility=0.35,
+                    availability=0.45, lab_fraction=0.4, load_slack=1.2, seed=0):
+    """
+    Generates Courses, Loads and Times sheets in the CoursePreferences.xlsx
+    layout (including the two trailing legend rows that parse_workbook drops).
+
+    eligibility:  share of (prof, course) cells marked 'x' (eligible)
+    availability: share of (time, prof) cells left blank (available)
+    lab_fraction: share of courses with labs/discussion sections
+    load_slack:   total professor load (in courses) relative to the number of courses
+    Every course gets at least one eligible professor, every professor at
+    least enough available slots for their load, and the total load covers
+    the total credits, but the instances are not guaranteed to be feasible.
+    """
+    if num_time_blocks < 4:
+        raise ValueError("At least 4 time blocks are needed (prime time and the 701 slots)")
+    rng = np.random.default_rng(seed)
+    profs = df_with_letter_index(num_profs)['Prof'].tolist()
+
+    # Courses
+    numbers = _course_numbers(num_courses, rng)
+    grad = np.array([n >= 500 for n in numbers])
+    credits = np.where(grad, 3.0, 1.0)
+    credits[numbers.index(701)] = 1.0
+    has_lab = rng.random(num_courses) < lab_fraction
+    has_lab[numbers.index(701)] = False
+    eligible = rng.random((num_courses, num_profs)) < eligibility
+    eligible[np.arange(num_courses), rng.integers(num_profs, size=num_courses)] = True
+
+    courses = pd.DataFrame({
+        'Number': numbers,
+        'Name': [f"Course {n}" for n in numbers],
+        'Grad/Ugrad': np.where(grad, 'Grad', 'Ugrad'),
+        'Credits': credits,
+        'Labs/Discussion Sections': np.where(has_lab, rng.integers(1, 5, size=num_courses), 0).astype(float),
+        'Total Enrollment': rng.integers(10, 200, size=num_courses).astype(float),
+    })
+    courses = pd.concat([courses, pd.DataFrame(np.where(eligible, 'x', None), columns=profs)], axis=1)
+
+    # Loads: mostly one course, topped up until they cover every course with some slack
+    loads = rng.choice([0.5, 1.0, 1.5, 2.0], size=num_profs, p=[0.05, 0.75, 0.05, 0.15])
+    while loads.sum() < load_slack * num_courses:
+        loads[rng.integers(num_profs)] += 1.0
+    loads_df = pd.DataFrame({'Prof': profs, 'NumCourses': loads})
+
+    # Times: blocks of the four day patterns (see _block_starts), 'x' = unavailable
+    starts = _block_starts(num_time_blocks)
+    times = pd.DataFrame({
+        'Times': [_time_label(s) for s in starts for _ in DAY_PATTERNS],
+        'Days': DAY_PATTERNS * num_time_blocks,
+    })
+    num_times = len(times)
+    available = rng.random((num_times, num_profs)) < availability
+    for p in range(num_profs):
+        needed = min(num_times, 2 * math.ceil(loads[p]) + 2)
+        missing = needed - available[:, p].sum()
+        if missing > 0:
+            available[rng.choice(np.flatnonzero(~available[:, p]), size=missing, replace=False), p] = True
+    # The 701 research seminar must be able to meet in slot 8 or 10
+    for p in np.flatnonzero(eligible[numbers.index(701)]):
+        available[[8, 10], p] = True
+    times = pd.concat([times, pd.DataFrame(np.where(available, None, 'x'), columns=profs)], axis=1)
+
+    # Trailing legend rows, as in the hand-maintained workbook
+    courses = pd.concat([courses, pd.DataFrame([{}, {'Number': 'x=yes'}])], ignore_index=True)
+    times = pd.concat([times, pd.DataFrame([{}, {'Times': 'x=no'}])], ignore_index=True)
+
+    return {'Courses': courses, 'Loads': loads_df, 'Times': times}
+
+
+def generate_workbook(file_path, **kwargs):
+    """Writes a synthetic course preferences workbook (see generate_sheets) and returns its path."""
+    sheets = generate_sheets(**kwargs)
+    with pd.ExcelWriter(file_path) as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    return file_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic course preferences workbook.")
+    parser.add_argument("out", help="Output xlsx path")
+    parser.add_argument("--profs", type=int, default=23, help="Number of professors")
+    parser.add_argument("--courses", type=int, default=26, help="Number of courses")
+    parser.add_argument("--time-blocks", type=int, default=7, help=f"Number of time blocks (4 slots each, {BLOCKS_PER_DAY} per day before staggering)")
+    parser.add_argument("--eligibility", type=float, default=0.35, help="Share of eligible (prof, course) pairs")
+    parser.add_argument("--availability", type=float, default=0.45, help="Share of available (prof, time) pairs")
+    parser.add_argument("--lab-fraction", type=float, default=0.4, help="Share of courses with labs")
+    parser.add_argument("--load-slack", type=float, default=1.2, help="Total load relative to the number of courses")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    generate_workbook(args.out, num_profs=args.profs, num_courses=args.courses, num_time_blocks=args.time_blocks,
+                      eligibility=args.eligibility, availability=args.availability,
+                      lab_fraction=args.lab_fraction, load_slack=args.load_slack, seed=args.seed)
+    print(f"Wrote {args.out}")
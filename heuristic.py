@@ -0,0 +1,231 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from model import DEFAULT_OPTIONS, RESEARCH_SLOTS
+from utils import RESULT_COLUMNS, tabulate_results
+
+
+# --- Schedule State ---
+
+class _Schedule:
+    """
+    A (prof, time, lab time) choice per course with counters for every
+    constraint family the choices can violate. penalty is the total amount
+    of violation: 0 means the schedule satisfies Constraints 1-15.
+    """
+
+    def __init__(self, data, options):
+        self.data = data
+        profs, courses, times = data['idx_prof'].tolist(), data['idx_course'].tolist(), data['idx_time'].tolist()
+        self.profs, self.courses, self.times = profs, courses, times
+
+        self.day_time = {k: t for t, ks in data['day_time_groups'].items() for k in ks}
+        self.group = {j: g for g, js in data['course_groups'].items() for j in js}
+        self.group_size = {g: len(js) for g, js in data['course_groups'].items()}
+        self.prime, self.tth = set(data['prime_indices']), set(data['tues_thurs_indices'])
+        self.share = {'prime': options['max_prime_share'], 'tth': options['max_tth_share']}
+
+        # Eligible professors per course and available times per professor
+        c_arr, d_arr = data['c_arr'], data['d_arr']
+        self.eligible = {j: [profs[n] for n in np.flatnonzero(c_arr[:, p]).tolist()] for p, j in enumerate(courses)}
+        self.available = {i: [times[q] for q in np.flatnonzero(d_arr[n]).tolist()] for n, i in enumerate(profs)}
+        self.available_set = {i: set(ks) for i, ks in self.available.items()}
+        self.slots = {j: list(RESEARCH_SLOTS) if j == 701 else times for j in courses}
+        self.has_lab = {j: data['e_var'][j] == 1 for j in courses}
+        self.load = {i: data['a_var'][i] for i in profs}
+        self.cap = {i: -(-data['a_var'][i] // 3) for i in profs}
+
+        self.choice = {}
+        self.counters = {'prof_dt': {}, 'group_dt': {}, 'credits': {}, 'count': {}, 'prime': {}, 'tth': {}}
+        self.penalty = len(courses)  # every course starts unassigned
+
+    def _cost(self, family, key, value):
+        """Violation contributed by one counter value."""
+        if family in ('prof_dt', 'group_dt'):
+            return max(0, value - 1)
+        if family == 'credits':
+            return max(0, value - self.load[key]) / 3
+        if family == 'count':
+            return max(0, value - self.cap[key])
+        return max(0, value - self.share[family] * self.group_size[key])
+
+    def _bump(self, family, key, amount):
+        counter = self.counters[family]
+        old = counter.get(key, 0)
+        counter[key] = old + amount
+        self.penalty += self._cost(family, key, old + amount) - self._cost(family, key, old)
+
+    def _apply(self, j, choice, sign):
+        i, k, lab = choice
+        g = self.group[j]
+        self._bump('prof_dt', (i, self.day_time[k]), sign)
+        self._bump('group_dt', (g, self.day_time[k]), sign)
+        self._bump('credits', i, sign * self.data['b_var'][j])
+        self._bump('count', i, sign)
+        if k in self.prime:
+            self._bump('prime', g, sign)
+        if k in self.tth:
+            self._bump('tth', g, sign)
+        if lab is not None:
+            self._bump('prof_dt', (i, self.day_time[lab]), sign)
+            self._bump('group_dt', (g, self.day_time[lab]), sign)
+        elif self.has_lab[j]:
+            # Constraint 10: a lab course without a lab time
+            self.penalty += sign
+
+    def assign(self, j, choice):
+        """Sets (or replaces) the course's choice and updates the penalty."""
+        if j in self.choice:
+            self._apply(j, self.choice[j], -1)
+        else:
+            self.penalty -= 1
+        self.choice[j] = choice
+        self._apply(j, choice, 1)
+
+    def delta(self, j, choice):
+        """Penalty change of assigning choice to course j."""
+        before = self.penalty
+        previous = self.choice.get(j)
+        self.assign(j, choice)
+        after = self.penalty
+        if previous is None:
+            self._apply(j, choice, -1)
+            del self.choice[j]
+            self.penalty += 1
+        else:
+            self.assign(j, previous)
+        # Rounded so float noise from the credit and share terms does not break ties
+        return round(after - before, 9)
+
+    # --- Moves ---
+
+    def time_options(self, j, i):
+        """Lecture times of course j that professor i is available for."""
+        return [k for k in self.slots[j] if k in self.available_set[i]]
+
+    def best_lab(self, j, i, k, rng):
+        """Cheapest lab time for course j taught by i at k (None for courses without labs)."""
+        if not self.has_lab[j]:
+            return None
+        labs = [q for q in self.available[i] if q != k]
+        if not labs:
+            return None
+        return _argmin([(i, k, q) for q in labs], lambda c: self.delta(j, c), rng)[2]
+
+    def moves(self, j, kind, rng):
+        """Candidate choices for course j that change its time, lab time or professor."""
+        i, k, lab = self.choice[j]
+        if kind == 'time':
+            return [(i, q, lab if lab != q else self.best_lab(j, i, q, rng)) for q in self.time_options(j, i) if q != k]
+        if kind == 'lab':
+            return [(i, k, q) for q in self.available[i] if q != k and q != lab] if self.has_lab[j] else []
+        return [(p, k, lab) for p in self.eligible[j] if p != i
+                and k in self.available_set[p] and (lab is None or lab in self.available_set[p])]
+
+    def violated_courses(self):
+        """Courses that touch a violated counter."""
+        bad = []
+        for j, (i, k, lab) in self.choice.items():
+            g = self.group[j]
+            keys = [('prof_dt', (i, self.day_time[k])), ('group_dt', (g, self.day_time[k])),
+                    ('credits', i), ('count', i), ('prime', g), ('tth', g)]
+            if lab is not None:
+                keys += [('prof_dt', (i, self.day_time[lab])), ('group_dt', (g, self.day_time[lab]))]
+            elif self.has_lab[j]:
+                bad.append(j)
+                continue
+            if any(self._cost(family, key, self.counters[family].get(key, 0)) > 0 for family, key in keys):
+                bad.append(j)
+        return bad
+
+
+def _argmin(options, cost, rng):
+    """Lowest-cost option, ties broken at random."""
+    costs = [cost(option) for option in options]
+    best = min(costs)
+    ties = [option for option, c in zip(options, costs) if c == best]
+    return ties[rng.integers(len(ties))]
+
+
+# --- Heuristic ---
+
+def construct(state, rng):
+    """Greedy: most constrained course first, cheapest (prof, time), then cheapest lab time."""
+    def options(j):
+        return sum(len(state.time_options(j, i)) for i in state.eligible[j])
+
+    for j in sorted(state.courses, key=lambda j: (options(j), rng.random())):
+        choices = [(i, k, None) for i in state.eligible[j] for k in state.time_options(j, i)]
+        if not choices:
+            continue
+        # Prefer the professor with the most unused load on ties
+        slack = {i: state.load[i] - state.counters['credits'].get(i, 0) for i in state.eligible[j]}
+        i, k, _ = _argmin(choices, lambda c: (state.delta(j, c), -slack[c[0]]), rng)
+        state.assign(j, (i, k, state.best_lab(j, i, k, rng)))
+
+
+def local_search(state, rng, max_moves=20000, time_limit=None, noise=0.1):
+    """
+    Min-conflicts search: moves a course involved in a violation to its best
+    time, lab time or professor (a random one with probability noise) until
+    the penalty reaches 0 or the move or time budget runs out. Ends on the
+    best schedule seen.
+    """
+    start = time.perf_counter()
+    best_penalty, best_choice = state.penalty, dict(state.choice)
+    for _ in range(max_moves):
+        if state.penalty < 1e-9 or (time_limit is not None and time.perf_counter() - start > time_limit):
+            break
+        bad = state.violated_courses()
+        if not bad:
+            break
+        j = bad[rng.integers(len(bad))]
+        kind = ('time', 'lab', 'prof')[rng.integers(3)]
+        candidates = state.moves(j, kind, rng)
+        if not candidates:
+            continue
+        if rng.random() < noise:
+            state.assign(j, candidates[rng.integers(len(candidates))])
+        else:
+            best = _argmin(candidates, lambda c: state.delta(j, c), rng)
+            if state.delta(j, best) <= 0:
+                state.assign(j, best)
+        if state.penalty < best_penalty - 1e-9:
+            best_penalty, best_choice = state.penalty, dict(state.choice)
+
+    if state.penalty > best_penalty + 1e-9:
+        for j, choice in best_choice.items():
+            state.assign(j, choice)
+
+
+def heuristic_schedule(data, options=None, seed=0, max_moves=20000, time_limit=None):
+    """
+    Builds a schedule with the greedy construction and the local search.
+    Returns the schedule as {'x', 'y', 'l'} sets of keys (the format of
+    warm_start.load_schedule, so it can be passed to warm_start.apply_start)
+    and the remaining penalty (0 = feasible for Constraints 1-15).
+    """
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    rng = np.random.default_rng(seed)
+    state = _Schedule(data, options)
+    construct(state, rng)
+    local_search(state, rng, max_moves, time_limit)
+
+    schedule = {'x': set(), 'y': set(), 'l': set()}
+    for j, (i, k, lab) in state.choice.items():
+        schedule['x'].add((i, j))
+        schedule['y'].add((j, k))
+        if lab is not None:
+            schedule['l'].add((i, j, lab))
+    return schedule, max(0.0, round(state.penalty, 9))
+
+
+def schedule_results(schedule, data):
+    """Returns the result tables of a schedule (see utils.extract_results)."""
+    objective = sum(data['b_var'][j] for (_, j) in schedule['x'])
+    return tabulate_results(
+        *(pd.DataFrame(sorted(schedule[block]), columns=RESULT_COLUMNS[block]) for block in ('x', 'y', 'l')),
+        objective, data['courses_attr'], data['times_attr']
+    )
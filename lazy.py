@@ -0,0 +1,85 @@
+import numpy as np
+import scipy.sparse as sp
+
+import gurobipy as gp
+
+from matrix import FAMILIES, column_keys, key_name, layout
+
+
+# Families worth separating lazily: large and rarely binding
+LAZY_FAMILIES = ('double_booking_within_grp', 'group_conflict')
+
+# Violation tolerance for separated rows
+LAZY_TOL = 1e-6
+
+
+def lazy_rows(data, options, names, cols=None):
+    """
+    Assembles the rows of the given constraint families (see matrix.FAMILIES)
+    as A @ v <= rhs over the columns of matrix.layout (cols, computed if not
+    given). '>' rows are negated and '=' rows split in two. Returns A (CSR),
+    rhs and the row names.
+    """
+    cols = layout(data, options) if cols is None else cols
+    all_rows, all_cols, all_vals, rhss, row_names = [], [], [], [], []
+    num_rows = 0
+    for name in names:
+        block = FAMILIES[name](data, cols, options)
+        if block is None:
+            continue
+        keys, rows, col, vals, sense, rhs = block
+        rhs = np.asarray(rhs, dtype=float)
+        key_names = [name] if keys is None else [key_name(name, key) for key in keys]
+        signs = {'<': [1.0], '>': [-1.0], '=': [1.0, -1.0]}[sense]
+        for sign in signs:
+            all_rows.append(rows + num_rows)
+            all_cols.append(col)
+            all_vals.append(sign * vals)
+            rhss.append(sign * rhs)
+            row_names += key_names
+            num_rows += len(rhs)
+
+    if not num_rows:
+        return sp.csr_matrix((0, cols['num_vars'])), np.zeros(0), []
+    A = sp.csr_matrix(
+        (np.concatenate(all_vals), (np.concatenate(all_rows), np.concatenate(all_cols))),
+        shape=(num_rows, cols['num_vars'])
+    )
+    A.sum_duplicates()
+    return A, np.concatenate(rhss), row_names
+
+
+def separate(m, where):
+    """MIPSOL callback: adds the lazy rows the new incumbent violates."""
+    if where != gp.GRB.Callback.MIPSOL:
+        return
+    pool = m._lazy
+    values = np.array(m.cbGetSolution(pool['vars']))
+    violated = np.flatnonzero(pool['A'] @ values > pool['rhs'] + LAZY_TOL)
+    A = pool['A']
+    for r in violated.tolist():
+        lo, hi = A.indptr[r], A.indptr[r + 1]
+        expr = gp.LinExpr(A.data[lo:hi].tolist(), [pool['vars'][c] for c in A.indices[lo:hi].tolist()])
+        m.cbLazy(expr <= pool['rhs'][r])
+    pool['added'] += len(violated)
+    # Later callbacks (e.g. anytime.stream_incumbents) must not keep a rejected solution
+    pool['rejected'] = len(violated) > 0
+
+
+def attach(m, v, data, options):
+    """
+    Registers the families in options['lazy'] (a subset of LAZY_FAMILIES)
+    with m, to be enforced by the separate callback (model.solve runs
+    everything in m._callbacks), and sets LazyConstraints. The pool's
+    columns are mapped to m's variables by key through v.
+    m._lazy['added'] counts the rows added during the solve.
+    """
+    unsupported = sorted(set(options['lazy']) - set(LAZY_FAMILIES))
+    if unsupported:
+        raise ValueError(f"Families {unsupported} cannot be enforced lazily; choose from {list(LAZY_FAMILIES)}")
+    cols = layout(data, options)
+    A, rhs, names = lazy_rows(data, options, options['lazy'], cols)
+    variables = [v[block][key] for block, keys in column_keys(data, cols).items() for key in keys]
+    m._lazy = {'A': A, 'rhs': rhs, 'names': names, 'vars': variables, 'added': 0}
+    m._callbacks = getattr(m, '_callbacks', []) + [separate]
+    m.setParam('LazyConstraints', 1)
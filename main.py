@@ -1,276 +1,325 @@
-################################
-### Section 1: Initial Setup ###
-################################
-
-import pandas as pd
-import numpy as np
+import argparse
+import importlib.util
+import os
 
 import gurobipy as gp
-from utils import df_with_letter_index, print_results
-
-
-FILE_PATH = "CoursePreferences.xlsx"
-
-all_sheets = pd.read_excel(FILE_PATH, sheet_name=None)
 
-# Data frames Courses, loads, and times
-courses_df = all_sheets.get("Courses")
-loads_df = all_sheets.get("Loads")
-times_df = all_sheets.get("Times")
-
-###############################
-### Section 2: Attr Tables  ###
-###############################
-
-# Get the number of Prof, look at A and then full length
-num_prof = courses_df.shape[1] - courses_df.columns.get_loc('A')
-
-# Create inital prof data.frame
-prof_attr = df_with_letter_index(num_prof)
-
-# Maximal course load for professor
-prof_attr = prof_attr.merge(loads_df, on='Prof', how='left')
-prof_attr = prof_attr.rename(columns={'NumCourses': 'max_credit'})
-prof_attr['max_credit'] = prof_attr['max_credit'] * 3
-
-# Melt the times and the courses matrix
-times_df = times_df[:-2] # Issue with x=no in xlsx
-times_df = times_df.reset_index()
-times_attr = times_df[['index','Times','Days']] # Create times attr
-times_df = times_df.drop(columns=['Times', 'Days']).melt(id_vars='index', var_name='Prof', value_name='Value')
-times_df = times_df.fillna(1).replace('x', 0) # x = no
-
-courses_df = courses_df[:-2] #issue with xlsx
-courses_attr = courses_df[['Number','Name','Grad/Ugrad','Credits','Labs/Discussion Sections','Total Enrollment']] # Create courses attr
-courses_df = courses_df.drop(columns=['Name','Grad/Ugrad','Credits','Labs/Discussion Sections','Total Enrollment']).melt(id_vars='Number', var_name='Prof', value_name='Value')
-courses_df = courses_df.fillna(0).replace('x', 1) # x = yes
-
-# Join in times, courses to the prof attr table
-prof_attr = prof_attr.merge(times_df, on='Prof', how='left').rename(columns={'index': 'time_idx', 'Value': 'time_bin'})
-prof_attr = prof_attr.merge(courses_df, on='Prof', how='left').rename(columns={'Number': 'course_idx', 'Value': 'course_bin'})
-prof_attr['course_idx'] = prof_attr['course_idx'].astype(int)
-prof_attr['course_bin'] = prof_attr['course_bin'].astype(str).str.strip().replace('', 0)
-prof_attr['course_bin'] = prof_attr['course_bin'].astype(int)
-
-# Clean times attr table
-times_attr['Times_Grp'] = times_attr['Times'].factorize()[0]
-times_attr['Times_Grp_Day'] = (times_attr.index // 4) * 2 + (times_attr.index % 4 == 3).astype(int)
-
-# Clean courses attr table
-courses_attr.loc[courses_attr['Grad/Ugrad'] == 'Ugrad', 'Credits'] *= 3
-courses_attr['Number'] = courses_attr['Number'].astype(int)
-courses_attr['Number_Group'] = np.where(
-    (courses_attr['Number'] >= 500) & (courses_attr['Number'] <= 699),
-    6,
-    ((courses_attr['Number'] - 1) // 100)
-)
-courses_attr['Labs'] = (courses_attr['Labs/Discussion Sections'] > 0).astype(int)
-
-#################################
-### Section 3: Vars for Optim ###
-#################################
-
-### Pre-Determined
-# a_i prof max credit loads
-a_var = prof_attr.groupby("Prof")["max_credit"].mean().to_dict()
-
-# b_j class total credits
-b_var = courses_attr.set_index("Number")["Credits"].to_dict()
-
-# c_{i,j} prof class elig
-c_var = prof_attr.set_index(["Prof", "course_idx"])["course_bin"].to_dict()
-
-# d_{i,k} prof time elig
-d_var = prof_attr.set_index(["Prof", "time_idx"])["time_bin"].to_dict()
-
-# d_{i,k} prof time elig
-e_var = courses_attr.set_index("Number")["Labs"].to_dict()
-
-
-### Set Model
-
-# Create the model
-m = gp.Model('course_sched') 
-
-# Set parameters
-m.setParam('OutputFlag', True)
-m.setParam("Seed", 123)
-
-### Decision Vars
-
-# Idx arrays
-idx_prof = np.unique(np.array(prof_attr["Prof"]))         # Set of Professors (i)
-idx_course = np.unique(np.array(prof_attr["course_idx"])) # Set of Courses (j)
-idx_time = np.unique(np.array(prof_attr["time_idx"]))     # Set of Time Slots (k)
-course_groups = courses_attr.groupby('Number_Group')['Number'].apply(list).to_dict()
-idx_group = course_groups.keys()                          # Set of Course Groups (g)
-day_time_groups = times_attr.groupby('Times_Grp_Day')['index'].apply(list).to_dict()
-idx_day_time = day_time_groups.keys()                     # Set of Day-Time Group IDs (t)
-prime_indices = times_attr.iloc[4:16]['index'].tolist()   # Find index of prime class scheduling times
-class_grp_701 = courses_attr[courses_attr['Number'] == 701]['Number_Group'].iloc[0] # Auto find 700 level classes
-tues_thurs_indices = times_attr[times_attr['Days'] == "T/TH"]['index'].tolist() # Find index of tuesday/thursday classes
-
-# x_{i,j} prof to class
-x_var = {
-(i, j): m.addVar(name=f"x_{i}_{j}", vtype=gp.GRB.BINARY)
-for i in idx_prof for j in idx_course
-}
-
-# y_{j,k} class to time
-y_var = {
-(j, k): m.addVar(name=f"y_{j}_{k}", vtype=gp.GRB.BINARY)
-for j in idx_course for k in idx_time
-}
-
-# z_{i,k} prof to time
-z_var = {
-(i, k): m.addVar(name=f"z_{i}_{k}", vtype=gp.GRB.BINARY)
-for i in idx_prof for k in idx_time
-}
-
-# l_{j,k} lab to time
-l_var = {
-(i, j, k): m.addVar(name=f"l_{i}_{j}_{k}", vtype=gp.GRB.BINARY)
-for i in idx_prof for j in idx_course for k in idx_time
-}
-
-### Modelling
-
-# Update model to integrate new variables
-m.update()
-
-# Objective Func
-m.setObjective(
-    (gp.quicksum(x_var[i, j] * b_var[j] for i in idx_prof for j in idx_course)),
-    gp.GRB.MAXIMIZE
-)
-
-# Constraint 1 ...
-m.addConstrs(
-    (gp.quicksum(x_var[i, j] for i in idx_prof) == 1
-     for j in idx_course),
-    name= f'one_prof'
-)
-
-# Constraint 2 ...
-m.addConstrs(
-    (gp.quicksum(x_var[i, j]*b_var[j] for j in idx_course) <= a_var[i]
-     for i in idx_prof),
-    name= f'prof_max'
-)
-
-# Constraint 3 ...
-m.addConstrs(
-    (x_var[i, j] <= c_var[i,j]
-     for j in idx_course for i in idx_prof),
-    name= f'prop_course'
-)
-
-# Constraint 4 ...
-m.addConstrs(
-    (gp.quicksum(y_var[j, k] for k in idx_time) == 1
-     for j in idx_course),
-    name= f'one_class'
-)
-
-# Constraint 5 ...
-m.addConstrs(
-    (gp.quicksum(z_var[i, k] for k in idx_time) <= -(-a_var[i]//3)
-     for i in idx_prof),
-    name= f'limit_prof'
-)
-
-# Constraint 6 ...
-m.addConstrs(
-    (gp.quicksum(z_var[i, k] for k in day_time_groups[t]) + 
-    gp.quicksum(l_var[i, j, k] for k in day_time_groups[t] for j in idx_course)  <= 1
-     for i in idx_prof for t in idx_day_time),
-    name= f'double_booking_within_grp'
-)
-
-# Constraint 7 ...
-m.addConstrs(
-    (z_var[i, k] <= d_var[i,k]
-     for i in idx_prof for k in idx_time),
-    name= f'proper_prof_time'
-)
-
-# Constraint 8 ...
-m.addConstrs(
-    (x_var[i, j] + y_var[j, k] - 1 <= z_var[i, k]
-     for i in idx_prof for j in idx_course for k in idx_time),
-    name= f'link_prof_class'
-)
-
-# Constraint 9 ...
-m.addConstrs(
-    (gp.quicksum(x_var[i, j] * y_var[j, k] for j in idx_course) <= 1
-     for i in idx_prof for k in idx_time),
-    name='no_double_booking'
-)
-
-# Constraint 10 ...
-m.addConstrs(
-    (gp.quicksum(l_var[i, j, k] for i in idx_prof for k in idx_time) == gp.quicksum(y_var[j, k]*e_var[j] for k in idx_time)
-     for j in idx_course),
-    name= f'lab_exists'
-)
-
-# Constraint 11 ...
-m.addConstrs(
-    (((1/3)*(x_var[i, j] + (1 - y_var[j, k]) + d_var[i, k])) >= l_var[i, j, k]
-     for i in idx_prof for j in idx_course for k in idx_time),
-    name= f'prof_lab_time'
-)
-
-# Constraint 12 ...
-m.addConstrs(
-    (gp.quicksum(y_var[j, k] for j in course_groups[g] for k in day_time_groups[t]) 
-     + gp.quicksum(l_var[i, j, k] for i in idx_prof for j in course_groups[g] for k in day_time_groups[t]) <= 1
-     for g in idx_group for t in idx_day_time),
-    name= f'group_conflict'
-)
-
-# Constraint 13 ...
-m.addConstr(
-    y_var[701, 8] + y_var[701,10] == 1,
-    name= f'grad_research_preffered'
-)
-
-# Constraint 14 ...
-m.addConstrs(
-    (gp.quicksum(y_var[j, k] for j in course_groups[g] for k in prime_indices if j != class_grp_701) * 2 <= 
-     gp.quicksum(y_var[j, k] for j in course_groups[g] for k in idx_time if j != class_grp_701)
-     for g in idx_group),
-    name= f'max_50_percent_prime'
-)
-
-# Constraint 15 ...
-m.addConstrs(
-    (gp.quicksum(y_var[j, k] for j in course_groups[g] for k in tues_thurs_indices if j != class_grp_701) * 2 <= 
-     gp.quicksum(y_var[j, k] for j in course_groups[g] for k in idx_time if j != class_grp_701)
-     for g in idx_group),
-    name= f'max_50_percent_T/Th'
-)
-
-# Update model to integrate new variables
-m.update()
-
-# Optimize the model
-m.optimize()
-
-# Print the result
-status_codes = {
-1: 'LOADED',
-2: 'OPTIMAL',
-3: 'INFEASIBLE',
-4: 'INF_OR_UNBD',
-5: 'UNBOUNDED'
-}
-status = m.status
-
-#################################
-### Section 4: Output Results ###
-#################################
-
-print_results(m, x_var, y_var, l_var, courses_attr, times_attr)
\ No newline at end of file
+from anytime import INCUMBENT_FILENAME, stream_incumbents
+from backends import BACKENDS, solution_results
+from data import CACHE_DIR, file_hash, load_data
+from decompose import solve_decomposed, stop_message
+from heuristic import heuristic_schedule, schedule_results
+from lazy import LAZY_FAMILIES
+from matrix import assemble
+from model import build_model, solve
+from model_cache import cached_build_model
+from multiterm import (annual_loads, build_multiterm, load_summary, load_terms, solve_multiterm_decomposed,
+                       term_results)
+from portfolio import solve_portfolio
+from precheck import check_data, diagnose, suspects
+from profiler import Profiler, phase
+from sweep import split_threads
+from utils import (EXPORT_FORMATS, OUTPUT_FILENAME, POOL_FILENAME, STATUS_CODES, export_results, pool_params,
+                   print_results, show_results)
+from warm_start import apply_start, load_schedule
+
+
+# Export format (see utils.EXPORT_FORMATS) and whether to print the result tables
+DEFAULT_OUTPUT = {'fmt': 'xlsx', 'show': True}
+
+
+def report(results, output=None, output_filename=OUTPUT_FILENAME, status='OPTIMAL'):
+    """
+    Prints (unless output['show'] is off) and exports one schedule's result
+    tables; status words the objective line (see utils.objective_label).
+    """
+    output = {**DEFAULT_OUTPUT, **(output or {})}
+    if output['show']:
+        show_results(results, status)
+    return export_results(results, output_filename, fmt=output['fmt'])
+
+
+def run_backend(backend, data, options, params=None, profiler=None, output=None):
+    """
+    Assembles the model in matrix form, solves it with the named backend (see
+    backends.py) and reports it like utils.print_results. Returns the solution.
+    """
+    with phase(profiler, 'build'):
+        spec = assemble(data, options, profiler)
+    with phase(profiler, 'solve'):
+        solution = BACKENDS[backend](spec, params)
+    print(f"\n{backend} finished with status {solution['status']} in {solution['runtime']:.2f}s")
+
+    if solution['values'] is not None:
+        with phase(profiler, 'export'):
+            report(solution_results(spec, solution, data), output, status=solution['status'])
+    return solution
+
+
+def report_diagnosis(data, course_sets, options=None):
+    """Runs precheck.diagnose on the course sets and prints the IIS of the first infeasible one."""
+    diagnosis = diagnose(data, course_sets, options)
+    if diagnosis is None:
+        print("Every reduced model is feasible (they leave out Constraints 14 and 15); "
+              "only an IIS of the full model (m.computeIIS()) can tell.")
+        return None
+    print(f"Infeasible around courses {diagnosis['courses']} (professors {diagnosis['profs']}). IIS:")
+    for name in diagnosis['iis']:
+        print(f"  {name}")
+    return diagnosis
+
+
+def run_portfolio(file_path, data, options, size, threads=None, params=None, cache_dir=CACHE_DIR, start=None,
+                  profiler=None, output=None):
+    """
+    Races size differently seeded solves (see portfolio.solve_portfolio),
+    prints one line per finished member and reports the winner's schedule.
+    Returns the winning row.
+    """
+    members, _ = split_threads(size, threads)
+    if members < size:
+        print(f"Racing {members} members instead of {size}: each member needs at least one of the {members} threads")
+    with phase(profiler, 'portfolio'):
+        winner, rows = solve_portfolio(file_path, options, size, threads, params, cache_dir, start)
+    for row in rows:
+        outcome = row['error'] if 'error' in row else f"{row['status_name']}, objective {row['objective']}"
+        print(f"Member {row['member']} {row['params']}: {outcome}, {row['wall_seconds']:.2f}s wall")
+    if winner is None:
+        print("No portfolio member found a schedule.")
+        return None
+    print(f"\nMember {winner['member']} won with status {winner['status_name']}")
+
+    if 'schedule' in winner:
+        with phase(profiler, 'export'):
+            report(schedule_results(winner['schedule'], data), output, status=winner['status_name'])
+    return winner
+
+
+def run_multiterm(file_paths, options, loads_file=None, decompose=False, params=None, cache_dir=CACHE_DIR,
+                  profiler=None, output=None):
+    """
+    Schedules several terms together under shared annual professor loads
+    (see multiterm.py), monolithically or by decomposition. Each term's
+    schedule is exported next to OUTPUT_FILENAME with the term label
+    appended, and the per-term credits are printed against the annual loads.
+    Returns the {label: results} dict, or None without a schedule.
+    """
+    with phase(profiler, 'load'):
+        terms = load_terms(file_paths, cache_dir)
+        annual = annual_loads(terms, loads_file)
+
+    with phase(profiler, 'solve'):
+        if decompose:
+            models, history = solve_multiterm_decomposed(terms, annual, options, params)
+            for row in history:
+                print(row)
+        else:
+            m, v = build_multiterm(terms, annual, options)
+            solve(m, params)
+            models = {label: (m, term_v) for label, term_v in v.items()} if m.SolCount > 0 else None
+            if models is None:
+                print(f"\nOptimization ended with status: {STATUS_CODES.get(m.status, 'UNKNOWN')}")
+    if decompose and (models is None or any(m.SolCount == 0 for m, _ in models.values())):
+        print(stop_message(history))
+        return None
+    if models is None:
+        print("No schedule satisfies every term under the annual loads.")
+        return None
+
+    results = {}
+    root, ext = os.path.splitext(OUTPUT_FILENAME)
+    with phase(profiler, 'export'):
+        for label, (m, v) in models.items():
+            print(f"\n=== Term {label} ===")
+            results[label] = term_results(m, v, terms[label])
+            report(results[label], output, f"{root}_{label}{ext}", STATUS_CODES.get(m.status, 'UNKNOWN'))
+    print("\n--- Credits per Term and Annual Load ---")
+    print(load_summary(results, annual).to_string(index=False))
+    return results
+
+
+def main(argv=None):
+    """Command line entry point: checks the arguments and runs them (see run), profiled with --profile."""
+    parser = argparse.ArgumentParser(description="Build and solve the course scheduling model.")
+    parser.add_argument("--file", default="CoursePreferences.xlsx", help="Course preferences workbook")
+    parser.add_argument("--terms", nargs="+", metavar="XLSX",
+                        help="Schedule several term workbooks together with shared annual professor loads")
+    parser.add_argument("--annual-loads", metavar="XLSX",
+                        help="Workbook whose Loads sheet holds the annual loads for --terms (default: sum of the terms' loads)")
+    parser.add_argument("--dense", action="store_true", help="Create x/z/l vars for every (prof, course, time) tuple")
+    parser.add_argument("--no-cache", action="store_true", help="Always reparse the workbook instead of using the input cache")
+    parser.add_argument("--bilinear", action="store_true", help="Use the bilinear x*y form of Constraint 9 (nonconvex MIQCP)")
+    parser.add_argument("--matrix", action="store_true", help="Build the model through the matrix API (addMVar)")
+    parser.add_argument("--model-cache", action="store_true",
+                        help="Read the built model from the cache (compressed MPS) instead of rebuilding it")
+    parser.add_argument("--warm-start", metavar="XLSX", help="Previous results workbook to use as a MIP start")
+    parser.add_argument("--hint", action="store_true", help="Pass the --warm-start schedule as variable hints instead of a MIP start")
+    parser.add_argument("--symmetry", action="store_true",
+                        help="Add ordering rows for interchangeable professors and time slots")
+    parser.add_argument("--lazy", action="store_true",
+                        help="Enforce Constraints 6 and 12 through a lazy-constraint callback")
+    parser.add_argument("--decompose", action="store_true",
+                        help="Solve prof-course assignment and timetabling in two stages with no-good cuts")
+    parser.add_argument("--diagnose", action="store_true",
+                        help="On an infeasible input, compute an IIS of a reduced model around the suspect courses")
+    parser.add_argument("--time-limit", type=float, help="Stop the solve after this many seconds and report the best schedule")
+    parser.add_argument("--mip-gap", type=float, help="Stop the solve at this relative MIP gap")
+    parser.add_argument("--stream", nargs="?", const=INCUMBENT_FILENAME, metavar="PATH",
+                        help=f"Write every improved incumbent during the solve, in the --export format "
+                             f"(default: {INCUMBENT_FILENAME})")
+    parser.add_argument("--pool", type=int, metavar="K",
+                        help=f"Also export the K best distinct schedules from the solution pool to {POOL_FILENAME}")
+    parser.add_argument("--heuristic", choices=['only', 'start'],
+                        help="Greedy + local search schedule: on its own (only) or as MIP start (start)")
+    parser.add_argument("--backend", default="gurobi", choices=list(BACKENDS),
+                        help="Solver engine; non-Gurobi engines solve the matrix form of the linear model")
+    parser.add_argument("--portfolio", type=int, metavar="N",
+                        help="Race N differently seeded solves in separate processes; the first to finish wins")
+    parser.add_argument("--threads", type=int, help="Total solver threads shared by the --portfolio members")
+    parser.add_argument("--export", default=DEFAULT_OUTPUT['fmt'], choices=list(EXPORT_FORMATS),
+                        help="Result format: one workbook (xlsx), one file per table (csv, parquet), "
+                             "one JSON file, or no export (none)")
+    parser.add_argument("--quiet", action="store_true", help="Do not print the result tables")
+    parser.add_argument("--profile", nargs="?", const="profile.json", metavar="JSON",
+                        help="Write per-phase timings, memory and constraint family sizes (default: profile.json)")
+    args = parser.parse_args(argv)
+    if args.matrix and args.bilinear:
+        parser.error("--matrix only builds the linearized Constraint 9, so it cannot be combined with --bilinear")
+    if args.decompose and args.warm_start:
+        parser.error("--warm-start is not supported with --decompose")
+    if args.heuristic and args.warm_start:
+        parser.error("--heuristic and --warm-start both set the MIP start")
+    if args.stream and (args.decompose or args.backend != 'gurobi'):
+        parser.error("--stream needs the Gurobi monolithic model")
+    if args.stream and args.export == 'none':
+        parser.error("--stream writes incumbents in the --export format, so it needs one")
+    if args.model_cache and (args.no_cache or args.decompose or args.backend != 'gurobi'):
+        parser.error("--model-cache needs the cache and the Gurobi monolithic model")
+    if args.heuristic == 'start' and (args.decompose or args.backend != 'gurobi'):
+        parser.error("--heuristic start needs the Gurobi monolithic model")
+    if args.portfolio and (args.decompose or args.stream or args.model_cache or args.backend != 'gurobi'):
+        parser.error("--portfolio does not support --decompose, --stream, --model-cache or other backends")
+    if args.pool and (args.decompose or args.portfolio or args.backend != 'gurobi'):
+        parser.error("--pool needs the Gurobi monolithic model")
+    if args.terms and (args.matrix or args.lazy or args.symmetry or args.warm_start or args.heuristic or args.stream
+                       or args.model_cache or args.portfolio or args.pool or args.diagnose or args.backend != 'gurobi'):
+        parser.error("--terms only supports --decompose, --dense, --bilinear, --no-cache and the solver limits")
+    if args.export == 'parquet' and not any(importlib.util.find_spec(engine) for engine in ('pyarrow', 'fastparquet')):
+        parser.error("--export parquet needs pyarrow or fastparquet")
+    if args.annual_loads and not args.terms:
+        parser.error("--annual-loads needs --terms")
+    if args.backend != 'gurobi' and (args.decompose or args.lazy or args.warm_start or args.bilinear):
+        parser.error(f"--backend {args.backend} does not support --decompose, --lazy, --warm-start or --bilinear")
+
+    profiler = Profiler().start() if args.profile else None
+    try:
+        return run(args, profiler)
+    finally:
+        # Every mode returns through here, so each one writes its profile
+        if profiler is not None:
+            profiler.stop()
+            profiler.write(args.profile)
+            print(f"Wrote profile to {args.profile}")
+
+
+def run(args, profiler=None):
+    """Runs the mode selected by the parsed command line arguments (see main) and returns its result pair."""
+    output = {'fmt': args.export, 'show': not args.quiet}
+    params = {}
+    if args.time_limit is not None:
+        params['TimeLimit'] = args.time_limit
+    if args.mip_gap is not None:
+        params['MIPGap'] = args.mip_gap
+    if args.pool:
+        params.update(pool_params(args.pool))
+
+    if args.terms:
+        options = {'sparse': not args.dense, 'linearize': not args.bilinear}
+        results = run_multiterm(args.terms, options, args.annual_loads, args.decompose, params,
+                                None if args.no_cache else CACHE_DIR, profiler, output)
+        return results, None
+
+    with phase(profiler, 'load'):
+        data = load_data(args.file, cache_dir=None if args.no_cache else CACHE_DIR, profiler=profiler)
+    with phase(profiler, 'precheck'):
+        issues = check_data(data)
+    if issues:
+        print("The input is infeasible:")
+        for issue in issues:
+            print(f"  [{issue['check']}] {issue['message']}")
+        if args.diagnose:
+            report_diagnosis(data, suspects(data, issues))
+        return None, issues
+    options = {
+        'sparse': not args.dense,
+        'linearize': not args.bilinear,
+        'builder': 'matrix' if args.matrix else 'expr',
+        'symmetry': args.symmetry,
+        'lazy': LAZY_FAMILIES if args.lazy else (),
+    }
+    if args.heuristic:
+        with phase(profiler, 'heuristic'):
+            schedule, penalty = heuristic_schedule(data, options)
+        print(f"Heuristic schedule with {len(schedule['x'])} courses, remaining violation {penalty}")
+        if args.heuristic == 'only':
+            if penalty == 0:
+                with phase(profiler, 'export'):
+                    report(schedule_results(schedule, data), output, status='HEURISTIC')
+            return schedule, penalty
+
+    if args.backend != 'gurobi':
+        solution = run_backend(args.backend, data, options, params, profiler, output)
+        return solution, None
+
+    if args.portfolio:
+        start = None
+        if args.warm_start:
+            start = (load_schedule(args.warm_start), 'hint' if args.hint else 'start')
+        elif args.heuristic == 'start':
+            start = (schedule, 'hint' if args.hint else 'start')
+        winner = run_portfolio(args.file, data, options, args.portfolio, args.threads, params,
+                               None if args.no_cache else CACHE_DIR, start, profiler, output)
+        return winner, None
+
+    if args.decompose:
+        with phase(profiler, 'decompose'):
+            m, v, history = solve_decomposed(data, options, params)
+        for row in history:
+            print(row)
+        if m is None or m.SolCount == 0:
+            print(stop_message(history))
+            return None, None
+    else:
+        with phase(profiler, 'build'):
+            if args.model_cache:
+                m, v = cached_build_model(data, file_hash(args.file), options, profiler=profiler)
+            else:
+                m, v = build_model(data, options, profiler=profiler)
+
+    if args.warm_start:
+        with phase(profiler, 'warm_start'):
+            missing = apply_start(m, v, load_schedule(args.warm_start), 'hint' if args.hint else 'start')
+        print(f"Warm start from {args.warm_start}; assignments not in this model: {missing}")
+    elif args.heuristic == 'start':
+        apply_start(m, v, schedule, 'hint' if args.hint else 'start')
+    if args.stream:
+        stream_incumbents(m, v, data, args.stream, output['fmt'])
+
+    if not args.decompose:
+        with phase(profiler, 'solve'):
+            solve(m, params)
+
+    with phase(profiler, 'export'):
+        print_results(m, v['x'], v['y'], v['l'], data['courses_attr'], data['times_attr'], profiler=profiler,
+                      pool=args.pool, fmt=output['fmt'], show=output['show'])
+    if args.diagnose and m.status == gp.GRB.INFEASIBLE:
+        with phase(profiler, 'diagnose'):
+            report_diagnosis(data, suspects(data, []), options)
+
+    if profiler is not None:
+        profiler.count_families(m)
+    return m, v
+
+
+if __name__ == "__main__":
+    main()
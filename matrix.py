@@ -0,0 +1,487 @@
+import numpy as np
+import scipy.sparse as sp
+
+import gurobipy as gp
+
+from model import DEFAULT_OPTIONS, RESEARCH_SLOTS, prof_classes, time_classes, variable_masks
+from profiler import phase
+
+
+# --- Column Layout ---
+
+def _positions(mask, start):
+    """Numbers the True cells of mask (row-major) from start; absent cells get -1."""
+    pos = np.full(mask.shape, -1, dtype=np.int64)
+    n = int(mask.sum())
+    pos[mask] = np.arange(start, start + n)
+    return pos, start + n
+
+
+def layout(data, options):
+    """
+    Assigns a column to every x, y, z, l (and w) variable. Returns a dict of
+    position arrays shaped like the parameter arrays, with -1 where the
+    variable does not exist. Columns follow the order of model.add_vars
+    (both number the masks of model.variable_masks).
+    """
+    cols, n = {}, 0
+    for block, mask in variable_masks(data, options).items():
+        cols[block], n = _positions(mask, n)
+    cols['num_vars'] = n
+    return cols
+
+
+def column_keys(data, cols):
+    """Keys of every variable in column order, as {block: [key, ...]} (keys as in model.add_vars)."""
+    profs, courses, times = data['idx_prof'].tolist(), data['idx_course'].tolist(), data['idx_time'].tolist()
+    labels = {'x': (profs, courses), 'y': (courses, times), 'z': (profs, times),
+              'l': (profs, courses, times), 'w': (profs, courses, times)}
+    keys = {}
+    for block, axes in labels.items():
+        idx = np.nonzero(cols[block] >= 0)
+        keys[block] = [tuple(axis[p] for axis, p in zip(axes, pos)) for pos in zip(*(a.tolist() for a in idx))]
+    return keys
+
+
+# --- Constraint Families ---
+# Each returns (keys, rows, cols, vals, sense, rhs) with rows numbered within the family.
+
+def _one_prof(data, cols, options):
+    """Constraint 1: every course is taught by exactly one professor."""
+    ii, jj = np.nonzero(cols['x'] >= 0)
+    keys = [(j,) for j in data['idx_course'].tolist()]
+    return keys, jj, cols['x'][ii, jj], np.ones(len(ii)), '=', np.ones(len(keys))
+
+
+def _prof_max(data, cols, options):
+    """Constraint 2: a professor's assigned credits stay within their load."""
+    ii, jj = np.nonzero(cols['x'] >= 0)
+    keys = [(i,) for i in data['idx_prof'].tolist()]
+    return keys, ii, cols['x'][ii, jj], data['b_arr'][jj], '<', data['a_arr']
+
+
+def _prop_course(data, cols, options):
+    """Constraint 3: professors only teach eligible courses (dense mode only)."""
+    if options['sparse']:
+        return None
+    I, J = data['c_arr'].shape
+    jj, ii = np.divmod(np.arange(J * I), I)
+    keys = [(j, i) for j in data['idx_course'].tolist() for i in data['idx_prof'].tolist()]
+    return keys, np.arange(J * I), cols['x'][ii, jj], np.ones(J * I), '<', data['c_arr'][ii, jj]
+
+
+def _one_class(data, cols, options):
+    """Constraint 4: every course gets exactly one time slot."""
+    jj, kk = np.nonzero(cols['y'] >= 0)
+    keys = [(j,) for j in data['idx_course'].tolist()]
+    return keys, jj, cols['y'][jj, kk], np.ones(len(jj)), '=', np.ones(len(keys))
+
+
+def _limit_prof(data, cols, options):
+    """Constraint 5: limit the number of time slots a professor occupies."""
+    ii, kk = np.nonzero(cols['z'] >= 0)
+    keys = [(i,) for i in data['idx_prof'].tolist()]
+    return keys, ii, cols['z'][ii, kk], np.ones(len(ii)), '<', -(-data['a_arr'] // 3)
+
+
+def _day_time_pos(data):
+    """Position of each time slot's day-time group within idx_day_time."""
+    group_pos = {t: n for n, t in enumerate(data['idx_day_time'])}
+    pos = np.empty(len(data['idx_time']), dtype=np.int64)
+    for t, times in data['day_time_groups'].items():
+        pos[[data['time_index'][k] for k in times]] = group_pos[t]
+    return pos
+
+
+def _course_group_pos(data):
+    """Position of each course's group within idx_group."""
+    group_pos = {g: n for n, g in enumerate(data['idx_group'])}
+    pos = np.empty(len(data['idx_course']), dtype=np.int64)
+    for g, courses in data['course_groups'].items():
+        pos[[data['course_index'][j] for j in courses]] = group_pos[g]
+    return pos
+
+
+def _double_booking_within_grp(data, cols, options):
+    """Constraint 6: at most one class or lab per professor within a day-time group."""
+    T = len(data['idx_day_time'])
+    tpos = _day_time_pos(data)
+    zi, zk = np.nonzero(cols['z'] >= 0)
+    li, lj, lk = np.nonzero(cols['l'] >= 0)
+    keys = [(i, t) for i in data['idx_prof'].tolist() for t in data['idx_day_time']]
+    rows = np.concatenate([zi * T + tpos[zk], li * T + tpos[lk]])
+    col = np.concatenate([cols['z'][zi, zk], cols['l'][li, lj, lk]])
+    return keys, rows, col, np.ones(len(rows)), '<', np.ones(len(keys))
+
+
+def _proper_prof_time(data, cols, options):
+    """Constraint 7: professors only teach at available times (dense mode only)."""
+    if options['sparse']:
+        return None
+    I, K = data['d_arr'].shape
+    ii, kk = np.divmod(np.arange(I * K), K)
+    keys = [(i, k) for i in data['idx_prof'].tolist() for k in data['idx_time'].tolist()]
+    return keys, np.arange(I * K), cols['z'][ii, kk], np.ones(I * K), '<', data['d_arr'][ii, kk]
+
+
+def _link_prof_class(data, cols, options):
+    """Constraint 8: x + y - z <= 1 for every existing x and every time slot."""
+    K = len(data['idx_time'])
+    xi, xj = np.nonzero(cols['x'] >= 0)
+    ii, jj, kk = np.repeat(xi, K), np.repeat(xj, K), np.tile(np.arange(K), len(xi))
+    n = len(ii)
+    zcol = cols['z'][ii, kk]
+    has_z = zcol >= 0
+    rows = np.concatenate([np.arange(n), np.arange(n), np.arange(n)[has_z]])
+    col = np.concatenate([cols['x'][ii, jj], cols['y'][jj, kk], zcol[has_z]])
+    val = np.concatenate([np.ones(n), np.ones(n), -np.ones(int(has_z.sum()))])
+    profs, courses, times = data['idx_prof'].tolist(), data['idx_course'].tolist(), data['idx_time'].tolist()
+    keys = [(profs[a], courses[b], times[c]) for a, b, c in zip(ii.tolist(), jj.tolist(), kk.tolist())]
+    return keys, rows, col, val, '<', np.ones(n)
+
+
+def _no_double_booking_link(data, cols, options):
+    """Constraint 9 (link): x + y - w <= 1, so w >= x*y."""
+    ii, jj, kk = np.nonzero(cols['w'] >= 0)
+    n = len(ii)
+    rows = np.tile(np.arange(n), 3)
+    col = np.concatenate([cols['x'][ii, jj], cols['y'][jj, kk], cols['w'][ii, jj, kk]])
+    val = np.concatenate([np.ones(n), np.ones(n), -np.ones(n)])
+    profs, courses, times = data['idx_prof'].tolist(), data['idx_course'].tolist(), data['idx_time'].tolist()
+    keys = [(profs[a], courses[b], times[c]) for a, b, c in zip(ii.tolist(), jj.tolist(), kk.tolist())]
+    return keys, rows, col, val, '<', np.ones(n)
+
+
+def _no_double_booking(data, cols, options):
+    """Constraint 9: sum_j w - z <= 0, at most one course per professor and time slot."""
+    zi, zk = np.nonzero(cols['z'] >= 0)
+    row_of = np.full(cols['z'].shape, -1, dtype=np.int64)
+    row_of[zi, zk] = np.arange(len(zi))
+    wi, wj, wk = np.nonzero(cols['w'] >= 0)
+    rows = np.concatenate([row_of[wi, wk], np.arange(len(zi))])
+    col = np.concatenate([cols['w'][wi, wj, wk], cols['z'][zi, zk]])
+    val = np.concatenate([np.ones(len(wi)), -np.ones(len(zi))])
+    profs, times = data['idx_prof'].tolist(), data['idx_time'].tolist()
+    keys = [(profs[a], times[c]) for a, c in zip(zi.tolist(), zk.tolist())]
+    return keys, rows, col, val, '<', np.zeros(len(zi))
+
+
+def _lab_exists(data, cols, options):
+    """Constraint 10: sum of a course's labs - e_j * sum_k y = 0."""
+    J, K = cols['y'].shape
+    e = data['e_arr']
+    courses = np.arange(J) if not options['sparse'] else np.nonzero(e == 1)[0]
+    row_of = np.full(J, -1, dtype=np.int64)
+    row_of[courses] = np.arange(len(courses))
+    li, lj, lk = np.nonzero(cols['l'] >= 0)
+    yj, yk = np.repeat(courses, K), np.tile(np.arange(K), len(courses))
+    rows = np.concatenate([row_of[lj], row_of[yj]])
+    col = np.concatenate([cols['l'][li, lj, lk], cols['y'][yj, yk]])
+    val = np.concatenate([np.ones(len(li)), -e[yj].astype(float)])
+    keys = [(j,) for j in data['idx_course'][courses].tolist()]
+    return keys, rows, col, val, '=', np.zeros(len(courses))
+
+
+def _lab_available(data, cols, options):
+    """Constraint 11, tight form (dense mode only): sum_j l_{i,j,k} <= d_{i,k}."""
+    if not options['tight_labs'] or options['sparse']:
+        return None
+    I, K = data['d_arr'].shape
+    li, lj, lk = np.nonzero(cols['l'] >= 0)
+    keys = [(i, k) for i in data['idx_prof'].tolist() for k in data['idx_time'].tolist()]
+    return keys, li * K + lk, cols['l'][li, lj, lk], np.ones(len(li)), '<', data['d_arr'].ravel()
+
+
+def _lab_not_at_lecture(data, cols, options):
+    """Constraint 11, tight form: sum_i l_{i,j,k} + y_{j,k} <= 1 for lab courses."""
+    if not options['tight_labs']:
+        return None
+    J, K = cols['y'].shape
+    courses = np.nonzero(data['e_arr'] == 1)[0]
+    row_of = np.full(J, -1, dtype=np.int64)
+    row_of[courses] = np.arange(len(courses))
+    li, lj, lk = np.nonzero(cols['l'] >= 0)
+    lab = row_of[lj] >= 0
+    li, lj, lk = li[lab], lj[lab], lk[lab]
+    yj, yk = np.repeat(courses, K), np.tile(np.arange(K), len(courses))
+    rows = np.concatenate([row_of[lj] * K + lk, row_of[yj] * K + yk])
+    col = np.concatenate([cols['l'][li, lj, lk], cols['y'][yj, yk]])
+    courses_, times = data['idx_course'].tolist(), data['idx_time'].tolist()
+    keys = [(courses_[j], k) for j in courses.tolist() for k in times]
+    return keys, rows, col, np.ones(len(rows)), '<', np.ones(len(keys))
+
+
+def _prof_lab_time(data, cols, options):
+    """Constraint 11: sum_k l_{i,j,k} - x_{i,j} <= 0 for lab courses (tight), or (1/3)x - (1/3)y - l >= -(1 + d)/3."""
+    if options['tight_labs']:
+        xi, xj = np.nonzero((cols['x'] >= 0) & (data['e_arr'] == 1)[None, :])
+        row_of = np.full(cols['x'].shape, -1, dtype=np.int64)
+        row_of[xi, xj] = np.arange(len(xi))
+        li, lj, lk = np.nonzero(cols['l'] >= 0)
+        lab = row_of[li, lj] >= 0
+        li, lj, lk = li[lab], lj[lab], lk[lab]
+        rows = np.concatenate([row_of[li, lj], np.arange(len(xi))])
+        col = np.concatenate([cols['l'][li, lj, lk], cols['x'][xi, xj]])
+        val = np.concatenate([np.ones(len(li)), -np.ones(len(xi))])
+        profs, courses = data['idx_prof'].tolist(), data['idx_course'].tolist()
+        keys = [(profs[a], courses[b]) for a, b in zip(xi.tolist(), xj.tolist())]
+        return keys, rows, col, val, '<', np.zeros(len(keys))
+    ii, jj, kk = np.nonzero(cols['l'] >= 0)
+    n = len(ii)
+    rows = np.tile(np.arange(n), 3)
+    col = np.concatenate([cols['x'][ii, jj], cols['y'][jj, kk], cols['l'][ii, jj, kk]])
+    val = np.concatenate([np.full(n, 1/3), np.full(n, -1/3), -np.ones(n)])
+    rhs = -(1 + data['d_arr'][ii, kk]) * (1/3)
+    profs, courses, times = data['idx_prof'].tolist(), data['idx_course'].tolist(), data['idx_time'].tolist()
+    keys = [(profs[a], courses[b], times[c]) for a, b, c in zip(ii.tolist(), jj.tolist(), kk.tolist())]
+    return keys, rows, col, val, '>', rhs
+
+
+def _group_conflict(data, cols, options):
+    """Constraint 12: at most one class or lab per course group within a day-time group."""
+    T = len(data['idx_day_time'])
+    tpos, gpos = _day_time_pos(data), _course_group_pos(data)
+    yj, yk = np.nonzero(cols['y'] >= 0)
+    li, lj, lk = np.nonzero(cols['l'] >= 0)
+    rows = np.concatenate([gpos[yj] * T + tpos[yk], gpos[lj] * T + tpos[lk]])
+    col = np.concatenate([cols['y'][yj, yk], cols['l'][li, lj, lk]])
+    keys = [(g, t) for g in data['idx_group'] for t in data['idx_day_time']]
+    return keys, rows, col, np.ones(len(rows)), '<', np.ones(len(keys))
+
+
+def _grad_research_preffered(data, cols, options):
+    """Constraint 13: the 701 research seminar is held in slot 8 or 10."""
+    j = data['course_index'][701]
+    col = cols['y'][j, [data['time_index'][k] for k in RESEARCH_SLOTS]]
+    return None, np.zeros(len(col), dtype=np.int64), col, np.ones(len(col)), '=', np.ones(1)
+
+
+def _max_50_percent(data, cols, slots, share):
+    """Constraints 14/15: (group classes in slots) - share * (all group classes) <= 0."""
+    J, K = cols['y'].shape
+    gpos = _course_group_pos(data)
+    in_slots = np.zeros(K, dtype=bool)
+    in_slots[[data['time_index'][k] for k in slots]] = True
+    # Same course filter as model.py (compares the course number with the 700 group id)
+    keep = data['idx_course'] != data['class_grp_701']
+    jj, kk = np.nonzero(np.broadcast_to(keep[:, None], (J, K)))
+    vals = np.where(in_slots[kk], 1 - share, -share)
+    keys = [(g,) for g in data['idx_group']]
+    return keys, gpos[jj], cols['y'][jj, kk], vals, '<', np.zeros(len(keys))
+
+
+def _max_50_percent_prime(data, cols, options):
+    """Constraint 14: at most half of a course group's classes are in prime time."""
+    return _max_50_percent(data, cols, data['prime_indices'], options['max_prime_share'])
+
+
+def _max_50_percent_tth(data, cols, options):
+    """Constraint 15: at most half of a course group's classes are on T/Th."""
+    return _max_50_percent(data, cols, data['tues_thurs_indices'], options['max_tth_share'])
+
+
+def _ordering(pairs, block, weight):
+    """Rows weight @ block[a] - weight @ block[b] >= 0 for (a, b) positions along axis 0 of block."""
+    rows, col, vals = [], [], []
+    for r, (a, b) in enumerate(pairs):
+        for pos, sign in ((a, 1.0), (b, -1.0)):
+            present = np.flatnonzero(block[pos] >= 0)
+            rows.append(np.full(len(present), r))
+            col.append(block[pos][present])
+            vals.append(sign * weight[present])
+    if not pairs:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    return np.concatenate(rows), np.concatenate(col), np.concatenate(vals)
+
+
+def _prof_symmetry(data, cols, options):
+    """Orders interchangeable professors (see model.prof_symmetry)."""
+    if not options['symmetry']:
+        return None
+    pairs = [(a, b) for profs in prof_classes(data) for a, b in zip(profs, profs[1:])]
+    index = data['prof_index']
+    weight = np.arange(1, len(data['idx_course']) + 1, dtype=float)
+    rows, col, vals = _ordering([(index[a], index[b]) for a, b in pairs], cols['x'], weight)
+    return pairs, rows, col, vals, '>', np.zeros(len(pairs))
+
+
+def _time_symmetry(data, cols, options):
+    """Orders interchangeable time slots (see model.time_symmetry)."""
+    if not options['symmetry']:
+        return None
+    pairs = [(a, b) for times in time_classes(data) for a, b in zip(times, times[1:])]
+    index = data['time_index']
+    weight = np.arange(1, len(data['idx_course']) + 1, dtype=float)
+    rows, col, vals = _ordering([(index[a], index[b]) for a, b in pairs], cols['y'].T, weight)
+    return pairs, rows, col, vals, '>', np.zeros(len(pairs))
+
+
+# Constraint families in model order (same names as model.CONSTRAINTS)
+FAMILIES = {
+    'one_prof': _one_prof,
+    'prof_max': _prof_max,
+    'prop_course': _prop_course,
+    'one_class': _one_class,
+    'limit_prof': _limit_prof,
+    'double_booking_within_grp': _double_booking_within_grp,
+    'proper_prof_time': _proper_prof_time,
+    'link_prof_class': _link_prof_class,
+    'no_double_booking_link': _no_double_booking_link,
+    'no_double_booking': _no_double_booking,
+    'lab_exists': _lab_exists,
+    'lab_available': _lab_available,
+    'lab_not_at_lecture': _lab_not_at_lecture,
+    'prof_lab_time': _prof_lab_time,
+    'group_conflict': _group_conflict,
+    'grad_research_preffered': _grad_research_preffered,
+    'max_50_percent_prime': _max_50_percent_prime,
+    'max_50_percent_T/Th': _max_50_percent_tth,
+    'prof_symmetry': _prof_symmetry,
+    'time_symmetry': _time_symmetry,
+}
+
+
+# --- Assembly ---
+
+def key_name(name, key):
+    """Formats a row name the way Model.addConstrs does."""
+    return f"{name}[{','.join(str(part) for part in key)}]"
+
+
+def assemble(data, options=None, profiler=None):
+    """
+    Assembles the course scheduling model in matrix form:
+        max obj @ v  s.t.  A @ v (sense) rhs,  lb <= v <= ub
+    Returns a dict with the sparse CSR matrix A, the row senses/rhs/names,
+    the column bounds/types/names, the objective and the column layout.
+    """
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    if not options['linearize']:
+        raise ValueError("The matrix builder only supports the linearized Constraint 9")
+
+    cols = layout(data, options)
+    n = cols['num_vars']
+
+    # Columns
+    var_keys = column_keys(data, cols)
+    var_names = [f"{block}_{'_'.join(str(part) for part in key)}" for block, keys in var_keys.items() for key in keys]
+
+    vtype = np.full(n, gp.GRB.BINARY)
+    vtype[cols['w'][cols['w'] >= 0]] = gp.GRB.CONTINUOUS
+    lb, ub = np.zeros(n), np.ones(n)
+
+    # Objective
+    obj = np.zeros(n)
+    xi, xj = np.nonzero(cols['x'] >= 0)
+    obj[cols['x'][xi, xj]] = data['b_arr'][xj]
+
+    # Rows
+    all_rows, all_cols, all_vals, senses, rhss, row_names, families = [], [], [], [], [], [], {}
+    num_rows = 0
+    skip = set(options['skip']) | set(options['lazy'])
+    if 'no_double_booking' in skip:
+        skip.add('no_double_booking_link')
+    if 'prof_lab_time' in skip:
+        skip.update(['lab_available', 'lab_not_at_lecture'])
+    for name, family in FAMILIES.items():
+        if name in skip:
+            continue
+        with phase(profiler, name):
+            block = family(data, cols, options)
+        if block is None:
+            continue
+        keys, rows, col, vals, sense, rhs = block
+        all_rows.append(rows + num_rows)
+        all_cols.append(col)
+        all_vals.append(vals)
+        senses.append(np.full(len(rhs), sense))
+        rhss.append(np.asarray(rhs, dtype=float))
+        row_names += [name] if keys is None else [key_name(name, key) for key in keys]
+        families[name] = (num_rows, num_rows + len(rhs))
+        num_rows += len(rhs)
+
+    A = sp.csr_matrix(
+        (np.concatenate(all_vals), (np.concatenate(all_rows), np.concatenate(all_cols))),
+        shape=(num_rows, n)
+    )
+    A.sum_duplicates()
+    A.eliminate_zeros()
+
+    return {
+        'A': A,
+        'sense': np.concatenate(senses),
+        'rhs': np.concatenate(rhss),
+        'row_names': row_names,
+        'families': families,
+        'obj': obj,
+        'model_sense': gp.GRB.MAXIMIZE,
+        'lb': lb,
+        'ub': ub,
+        'vtype': vtype,
+        'var_names': var_names,
+        'var_keys': var_keys,
+        'cols': cols,
+    }
+
+
+# --- Model API ---
+
+def build_model_matrix(data, options=None, env=None, profiler=None):
+    """
+    Builds the same model as model.build_model through the matrix API
+    (addMVar / addMConstr). Returns the model and the same dict of
+    decision variables, keyed like the expression builder's.
+    """
+    with phase(profiler, 'assemble'):
+        spec = assemble(data, options, profiler)
+    return model_from_spec(spec, env, profiler)
+
+
+def model_from_spec(spec, env=None, profiler=None):
+    """Creates a Gurobi model from an assemble() spec. Returns the model and its variable dict."""
+    m = gp.Model('course_sched', env=env)
+    with phase(profiler, 'vars'):
+        mvar = m.addMVar(len(spec['obj']), lb=spec['lb'], ub=spec['ub'], obj=spec['obj'],
+                         vtype=spec['vtype'], name=spec['var_names'])
+        m.ModelSense = spec['model_sense']
+    with phase(profiler, 'constraints'):
+        m.addMConstr(spec['A'], mvar, spec['sense'], spec['rhs'], name=spec['row_names'])
+    with phase(profiler, 'update'):
+        m.update()
+
+    all_vars = mvar.tolist()
+    v, start = {}, 0
+    for block, keys in spec['var_keys'].items():
+        v[block] = gp.tupledict(zip(keys, all_vars[start:start + len(keys)]))
+        start += len(keys)
+    return m, v
+
+
+# --- Equivalence Check ---
+
+def model_signature(m):
+    """
+    Returns a name-based, order-independent description of a linear model
+    (columns, objective and rows) for comparing two builders.
+    """
+    m.update()
+    names = m.getAttr('VarName', m.getVars())
+    columns = set(zip(names, m.getAttr('VType', m.getVars()),
+                      m.getAttr('LB', m.getVars()), m.getAttr('UB', m.getVars())))
+    objective = {(name, round(c, 9)) for name, c in zip(names, m.getAttr('Obj', m.getVars())) if c != 0}
+
+    A = m.getA().tocsr()
+    constrs = m.getConstrs()
+    rows = set()
+    for r, (cname, sense, rhs) in enumerate(zip(m.getAttr('ConstrName', constrs),
+                                               m.getAttr('Sense', constrs),
+                                               m.getAttr('RHS', constrs))):
+        lo, hi = A.indptr[r], A.indptr[r + 1]
+        terms = frozenset((names[c], round(a, 9)) for c, a in zip(A.indices[lo:hi], A.data[lo:hi]) if a != 0)
+        rows.add((cname, sense, round(rhs, 9), terms))
+    return {'sense': m.ModelSense, 'columns': columns, 'objective': objective, 'rows': rows}
+
+
+def equivalent(m1, m2):
+    """True if two linear models have the same columns, objective and rows (matched by name)."""
+    return model_signature(m1) == model_signature(m2)
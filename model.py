@@ -0,0 +1,461 @@
+import numpy as np
+
+import gurobipy as gp
+
+from profiler import phase
+
+
+# Builder options
+DEFAULT_OPTIONS = {
+    'sparse': True,      # Only create x/z/l vars for eligible (prof, course, time) tuples
+    'linearize': True,   # Keep Constraint 9 linear so the model stays a pure MILP
+    'builder': 'expr',   # 'expr' (addConstrs expressions) or 'matrix' (addMVar, see matrix.py)
+    'skip': (),          # Constraint families (keys of CONSTRAINTS) to leave out
+    'max_prime_share': 0.5,  # Constraint 14 cap on a group's classes in prime time
+    'max_tth_share': 0.5,    # Constraint 15 cap on a group's classes on T/Th
+    'symmetry': False,   # Order interchangeable professors and time slots (see prof_classes/time_classes)
+    'tight_labs': True,  # Aggregated lab linking rows instead of the fractional Constraint 11
+    'lazy': (),          # Constraint families enforced by a lazy-constraint callback instead (see lazy.py)
+}
+
+# Time slots of the 701 research seminar (Constraint 13)
+RESEARCH_SLOTS = (8, 10)
+
+# Solver parameters set on every solve
+DEFAULT_PARAMS = {
+    'OutputFlag': True,
+    'Seed': 123,
+}
+
+
+# --- Decision Vars ---
+
+def variable_masks(data, options):
+    """
+    Returns the x, y, z, l and w variables that exist as boolean masks shaped
+    like the parameter arrays, in creation order. add_vars and matrix.layout
+    both number the variables from these masks, so their column orders agree.
+    """
+    I, J, K = len(data['idx_prof']), len(data['idx_course']), len(data['idx_time'])
+
+    # Eligibility masks (dense = every combination, sparse = only tuples allowed by c/d/e)
+    if options['sparse']:
+        prof_course = data['c_arr'] == 1
+        prof_time = data['d_arr'] == 1
+        lab = prof_course[:, :, None] & (data['e_arr'] == 1)[None, :, None] & prof_time[:, None, :]
+    else:
+        prof_course = np.ones((I, J), dtype=bool)
+        prof_time = np.ones((I, K), dtype=bool)
+        lab = np.ones((I, J, K), dtype=bool)
+
+    # w only exists in the linearized Constraint 9, for eligible (prof, course) and (prof, time) pairs
+    assign = prof_course[:, :, None] & prof_time[:, None, :]
+    if not options['linearize']:
+        assign = np.zeros((I, J, K), dtype=bool)
+
+    return {'x': prof_course, 'y': np.ones((J, K), dtype=bool), 'z': prof_time, 'l': lab, 'w': assign}
+
+
+def add_vars(m, data, options):
+    """Creates the x, y, z, l (and w) decision variables and returns them as a dict."""
+    profs, courses, times = data['idx_prof'].tolist(), data['idx_course'].tolist(), data['idx_time'].tolist()
+    masks = variable_masks(data, options)
+
+    # Eligible index sets
+    ii, jj = np.nonzero(masks['x'])
+    idx_prof_course = [(profs[n], courses[p]) for n, p in zip(ii.tolist(), jj.tolist())]
+    ii, kk = np.nonzero(masks['z'])
+    idx_prof_time = [(profs[n], times[q]) for n, q in zip(ii.tolist(), kk.tolist())]
+    ii, jj, kk = np.nonzero(masks['l'])
+    idx_lab = [(profs[n], courses[p], times[q]) for n, p, q in zip(ii.tolist(), jj.tolist(), kk.tolist())]
+    ii, jj, kk = np.nonzero(masks['w'])
+    idx_assign = [(profs[n], courses[p], times[q]) for n, p, q in zip(ii.tolist(), jj.tolist(), kk.tolist())]
+
+    # x_{i,j} prof to class
+    x_var = gp.tupledict({
+    (i, j): m.addVar(name=f"x_{i}_{j}", vtype=gp.GRB.BINARY)
+    for (i, j) in idx_prof_course
+    })
+
+    # y_{j,k} class to time
+    y_var = gp.tupledict({
+    (j, k): m.addVar(name=f"y_{j}_{k}", vtype=gp.GRB.BINARY)
+    for j in courses for k in times
+    })
+
+    # z_{i,k} prof to time
+    z_var = gp.tupledict({
+    (i, k): m.addVar(name=f"z_{i}_{k}", vtype=gp.GRB.BINARY)
+    for (i, k) in idx_prof_time
+    })
+
+    # l_{j,k} lab to time
+    l_var = gp.tupledict({
+    (i, j, k): m.addVar(name=f"l_{i}_{j}_{k}", vtype=gp.GRB.BINARY)
+    for (i, j, k) in idx_lab
+    })
+
+    # w_{i,j,k} prof teaches class at time (linearizes x_{i,j} * y_{j,k} for Constraint 9)
+    w_var = gp.tupledict({
+    (i, j, k): m.addVar(name=f"w_{i}_{j}_{k}", lb=0, ub=1)
+    for (i, j, k) in idx_assign
+    })
+
+    return {'x': x_var, 'y': y_var, 'z': z_var, 'l': l_var, 'w': w_var}
+
+
+# --- Objective and Constraints ---
+
+def set_objective(m, v, data, options):
+    """Maximize the total credits of the courses that get a professor."""
+    b_var = data['b_var']
+    m.setObjective(
+        (gp.quicksum(v['x'][i, j] * b_var[j] for (i, j) in v['x'])),
+        gp.GRB.MAXIMIZE
+    )
+
+
+def one_prof(m, v, data, options):
+    """Constraint 1: every course is taught by exactly one professor."""
+    return m.addConstrs(
+        (v['x'].sum('*', j) == 1
+         for j in data['idx_course']),
+        name='one_prof'
+    )
+
+
+def prof_max(m, v, data, options):
+    """Constraint 2: a professor's assigned credits stay within their load."""
+    x_var, b_var, a_var = v['x'], data['b_var'], data['a_var']
+    return m.addConstrs(
+        (gp.quicksum(x_var[i, j]*b_var[j] for j in data['idx_course'] if (i, j) in x_var) <= a_var[i]
+         for i in data['idx_prof']),
+        name='prof_max'
+    )
+
+
+def prop_course(m, v, data, options):
+    """Constraint 3: professors only teach eligible courses (implied by the sparse index sets)."""
+    if options['sparse']:
+        return None
+    x_var, c_var = v['x'], data['c_var']
+    return m.addConstrs(
+        (x_var[i, j] <= c_var[i, j]
+         for j in data['idx_course'] for i in data['idx_prof']),
+        name='prop_course'
+    )
+
+
+def one_class(m, v, data, options):
+    """Constraint 4: every course gets exactly one time slot."""
+    y_var, idx_time = v['y'], data['idx_time']
+    return m.addConstrs(
+        (gp.quicksum(y_var[j, k] for k in idx_time) == 1
+         for j in data['idx_course']),
+        name='one_class'
+    )
+
+
+def limit_prof(m, v, data, options):
+    """Constraint 5: limit the number of time slots a professor occupies."""
+    z_var, a_var = v['z'], data['a_var']
+    return m.addConstrs(
+        (z_var.sum(i, '*') <= -(-a_var[i]//3)
+         for i in data['idx_prof']),
+        name='limit_prof'
+    )
+
+
+def double_booking_within_grp(m, v, data, options):
+    """Constraint 6: at most one class or lab per professor within a day-time group."""
+    z_var, l_var, day_time_groups = v['z'], v['l'], data['day_time_groups']
+    return m.addConstrs(
+        (gp.quicksum(z_var.sum(i, k) for k in day_time_groups[t]) +
+         gp.quicksum(l_var.sum(i, '*', k) for k in day_time_groups[t]) <= 1
+         for i in data['idx_prof'] for t in data['idx_day_time']),
+        name='double_booking_within_grp'
+    )
+
+
+def proper_prof_time(m, v, data, options):
+    """Constraint 7: professors only teach at available times (implied by the sparse index sets)."""
+    if options['sparse']:
+        return None
+    z_var, d_var = v['z'], data['d_var']
+    return m.addConstrs(
+        (z_var[i, k] <= d_var[i, k]
+         for i in data['idx_prof'] for k in data['idx_time']),
+        name='proper_prof_time'
+    )
+
+
+def link_prof_class(m, v, data, options):
+    """Constraint 8: a professor teaching a course at time k occupies slot k."""
+    x_var, y_var, z_var = v['x'], v['y'], v['z']
+    return m.addConstrs(
+        (x_var[i, j] + y_var[j, k] - 1 <= z_var.get((i, k), 0)
+         for (i, j) in x_var for k in data['idx_time']),
+        name='link_prof_class'
+    )
+
+
+def no_double_booking(m, v, data, options):
+    """Constraint 9: a professor teaches at most one course per time slot."""
+    x_var, y_var, z_var, w_var = v['x'], v['y'], v['z'], v['w']
+    if options['linearize']:
+        # w >= x*y for binaries, and the w's of a (prof, time) pair share the single z slot
+        m.addConstrs(
+            (x_var[i, j] + y_var[j, k] - 1 <= w_var[i, j, k]
+             for (i, j, k) in w_var),
+            name='no_double_booking_link'
+        )
+        return m.addConstrs(
+            (w_var.sum(i, '*', k) <= z_var[i, k]
+             for (i, k) in z_var),
+            name='no_double_booking'
+        )
+    return m.addConstrs(
+        (gp.quicksum(x_var[i, j] * y_var[j, k] for j in data['idx_course'] if (i, j) in x_var) <= 1
+         for (i, k) in z_var),
+        name='no_double_booking'
+    )
+
+
+def lab_exists(m, v, data, options):
+    """Constraint 10: lab courses get exactly one lab session."""
+    y_var, l_var, e_var, idx_time = v['y'], v['l'], data['e_var'], data['idx_time']
+    return m.addConstrs(
+        (l_var.sum('*', j, '*') == gp.quicksum(y_var[j, k]*e_var[j] for k in idx_time)
+         for j in data['idx_course'] if not options['sparse'] or e_var[j] == 1),
+        name='lab_exists'
+    )
+
+
+def prof_lab_time(m, v, data, options):
+    """Constraint 11: labs are run by the course's professor, at an available time other than the lecture."""
+    x_var, y_var, l_var, d_var = v['x'], v['y'], v['l'], data['d_var']
+    if options['tight_labs']:
+        # l <= x, l <= 1 - y and l <= d, each summed over the lab's other index. Together they
+        # imply the fractional row below, and only lab courses (and, in the sparse model,
+        # available prof times) get rows.
+        e_var = data['e_var']
+        if not options['sparse']:
+            m.addConstrs(
+                (l_var.sum(i, '*', k) <= d_var[i, k]
+                 for i in data['idx_prof'] for k in data['idx_time']),
+                name='lab_available'
+            )
+        m.addConstrs(
+            (l_var.sum('*', j, k) + y_var[j, k] <= 1
+             for j in data['idx_course'] if e_var[j] == 1 for k in data['idx_time']),
+            name='lab_not_at_lecture'
+        )
+        return m.addConstrs(
+            (l_var.sum(i, j, '*') <= x_var[i, j]
+             for (i, j) in x_var if e_var[j] == 1),
+            name='prof_lab_time'
+        )
+    return m.addConstrs(
+        (((1/3)*(x_var[i, j] + (1 - y_var[j, k]) + d_var[i, k])) >= l_var[i, j, k]
+         for (i, j, k) in l_var),
+        name='prof_lab_time'
+    )
+
+
+def group_conflict(m, v, data, options):
+    """Constraint 12: at most one class or lab per course group within a day-time group."""
+    y_var, l_var = v['y'], v['l']
+    course_groups, day_time_groups = data['course_groups'], data['day_time_groups']
+    return m.addConstrs(
+        (gp.quicksum(y_var[j, k] for j in course_groups[g] for k in day_time_groups[t])
+         + gp.quicksum(l_var.sum('*', j, k) for j in course_groups[g] for k in day_time_groups[t]) <= 1
+         for g in data['idx_group'] for t in data['idx_day_time']),
+        name='group_conflict'
+    )
+
+
+def grad_research_preffered(m, v, data, options):
+    """Constraint 13: the 701 research seminar is held in slot 8 or 10."""
+    y_var = v['y']
+    return m.addConstr(
+        gp.quicksum(y_var[701, k] for k in RESEARCH_SLOTS) == 1,
+        name='grad_research_preffered'
+    )
+
+
+def max_50_percent_prime(m, v, data, options):
+    """Constraint 14: at most max_prime_share (half) of a course group's classes are in prime time."""
+    y_var, course_groups, class_grp_701 = v['y'], data['course_groups'], data['class_grp_701']
+    return m.addConstrs(
+        (gp.quicksum(y_var[j, k] for j in course_groups[g] for k in data['prime_indices'] if j != class_grp_701) <=
+         options['max_prime_share'] * gp.quicksum(y_var[j, k] for j in course_groups[g] for k in data['idx_time'] if j != class_grp_701)
+         for g in data['idx_group']),
+        name='max_50_percent_prime'
+    )
+
+
+def max_50_percent_tth(m, v, data, options):
+    """Constraint 15: at most max_tth_share (half) of a course group's classes are on T/Th."""
+    y_var, course_groups, class_grp_701 = v['y'], data['course_groups'], data['class_grp_701']
+    return m.addConstrs(
+        (gp.quicksum(y_var[j, k] for j in course_groups[g] for k in data['tues_thurs_indices'] if j != class_grp_701) <=
+         options['max_tth_share'] * gp.quicksum(y_var[j, k] for j in course_groups[g] for k in data['idx_time'] if j != class_grp_701)
+         for g in data['idx_group']),
+        name='max_50_percent_T/Th'
+    )
+
+
+# --- Symmetry Breaking ---
+
+def prof_classes(data):
+    """
+    Groups of professors (two or more) with identical eligibility c, availability
+    d and load a. Any schedule stays feasible with the same objective when two
+    of them swap their classes, slots and labs.
+    """
+    classes = {}
+    for n, i in enumerate(data['idx_prof'].tolist()):
+        signature = (data['a_arr'][n], data['c_arr'][n].tobytes(), data['d_arr'][n].tobytes())
+        classes.setdefault(signature, []).append(i)
+    return [profs for profs in classes.values() if len(profs) > 1]
+
+
+def time_classes(data):
+    """
+    Groups of time slots (two or more) in the same day-time group, with the same
+    prime-time, T/Th and Constraint 13 membership, and the same availability for
+    every professor who can teach something. Professors without an eligible
+    course never need a slot, so their availability is ignored.
+    """
+    day_time = {k: t for t, times in data['day_time_groups'].items() for k in times}
+    prime, tth = set(data['prime_indices']), set(data['tues_thurs_indices'])
+    teaching = data['c_arr'].sum(axis=1) > 0
+    classes = {}
+    for n, k in enumerate(data['idx_time'].tolist()):
+        signature = (day_time[k], k in prime, k in tth, k in RESEARCH_SLOTS,
+                     data['d_arr'][teaching, n].tobytes())
+        classes.setdefault(signature, []).append(k)
+    return [times for times in classes.values() if len(times) > 1]
+
+
+def prof_symmetry(m, v, data, options):
+    """
+    Orders interchangeable professors: within a class, each professor's
+    course-position weighted load is at least the next one's.
+    """
+    if not options['symmetry']:
+        return None
+    x_var = v['x']
+    weight = {j: n + 1 for n, j in enumerate(data['idx_course'].tolist())}
+    pairs = [(a, b) for profs in prof_classes(data) for a, b in zip(profs, profs[1:])]
+    return m.addConstrs(
+        (gp.quicksum(weight[j] * x_var[a, j] for j in data['idx_course'] if (a, j) in x_var) >=
+         gp.quicksum(weight[j] * x_var[b, j] for j in data['idx_course'] if (b, j) in x_var)
+         for a, b in pairs),
+        name='prof_symmetry'
+    )
+
+
+def time_symmetry(m, v, data, options):
+    """
+    Orders interchangeable time slots: within a class, each slot's
+    course-position weighted sum of classes is at least the next one's.
+    Uses y only, so it combines with prof_symmetry (which uses x only).
+    """
+    if not options['symmetry']:
+        return None
+    y_var = v['y']
+    weight = {j: n + 1 for n, j in enumerate(data['idx_course'].tolist())}
+    pairs = [(a, b) for times in time_classes(data) for a, b in zip(times, times[1:])]
+    return m.addConstrs(
+        (gp.quicksum(weight[j] * y_var[j, a] for j in data['idx_course']) >=
+         gp.quicksum(weight[j] * y_var[j, b] for j in data['idx_course'])
+         for a, b in pairs),
+        name='time_symmetry'
+    )
+
+
+# Constraint families in model order
+CONSTRAINTS = {
+    'one_prof': one_prof,
+    'prof_max': prof_max,
+    'prop_course': prop_course,
+    'one_class': one_class,
+    'limit_prof': limit_prof,
+    'double_booking_within_grp': double_booking_within_grp,
+    'proper_prof_time': proper_prof_time,
+    'link_prof_class': link_prof_class,
+    'no_double_booking': no_double_booking,
+    'lab_exists': lab_exists,
+    'prof_lab_time': prof_lab_time,
+    'group_conflict': group_conflict,
+    'grad_research_preffered': grad_research_preffered,
+    'max_50_percent_prime': max_50_percent_prime,
+    'max_50_percent_T/Th': max_50_percent_tth,
+    'prof_symmetry': prof_symmetry,
+    'time_symmetry': time_symmetry,
+}
+
+
+# --- Model API ---
+
+def build_model(data, options=None, env=None, profiler=None):
+    """
+    Builds the course scheduling model from the output of data.load_data.
+    Returns the Gurobi model and a dict of its decision variables. With a
+    profiler.Profiler, each step and constraint family is timed.
+    """
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    if options['builder'] == 'matrix':
+        from matrix import build_model_matrix
+        m, v = build_model_matrix(data, options, env, profiler)
+    else:
+        m, v = _build_model_expr(data, options, env, profiler)
+
+    if options['lazy']:
+        from lazy import attach
+        with phase(profiler, 'lazy'):
+            attach(m, v, data, options)
+    return m, v
+
+
+def _build_model_expr(data, options, env, profiler):
+    """Builds the model through addConstrs expressions (see build_model)."""
+    m = gp.Model('course_sched', env=env)
+
+    with phase(profiler, 'vars'):
+        v = add_vars(m, data, options)
+
+        # Update model to integrate new variables
+        m.update()
+
+    with phase(profiler, 'objective'):
+        set_objective(m, v, data, options)
+    with phase(profiler, 'constraints'):
+        for name, add_constrs in CONSTRAINTS.items():
+            if name not in options['skip'] and name not in options['lazy']:
+                with phase(profiler, name):
+                    add_constrs(m, v, data, options)
+
+    with phase(profiler, 'update'):
+        m.update()
+    return m, v
+
+
+def solve(m, params=None):
+    """
+    Sets the solver parameters, optimizes the model and returns its status.
+    Callbacks registered in m._callbacks (see lazy.attach and
+    anytime.stream_incumbents) are all called, in order.
+    """
+    for key, value in {**DEFAULT_PARAMS, **(params or {})}.items():
+        m.setParam(key, value)
+    callbacks = getattr(m, '_callbacks', [])
+    if callbacks:
+        def callback(model, where):
+            for cb in callbacks:
+                cb(model, where)
+        m.optimize(callback)
+    else:
+        m.optimize()
+    return m.status
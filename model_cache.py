@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import pickle
+
+import gurobipy as gp
+
+from data import CACHE_DIR
+from lazy import attach
+from model import DEFAULT_OPTIONS, build_model
+from profiler import phase
+
+
+# Bump when a builder changes the model it writes so stale cache entries are ignored
+MODEL_CACHE_VERSION = 1
+
+# Options that change how the model is built but not the model itself
+_LAYOUT_ONLY = ('builder',)
+
+
+def model_cache_key(input_hash, options):
+    """Returns the cache key of the model built from an input (by content hash) with the given options."""
+    relevant = {
+        name: sorted(value) if isinstance(value, (list, tuple, set, frozenset)) else value
+        for name, value in options.items() if name not in _LAYOUT_ONLY
+    }
+    digest = hashlib.sha256(json.dumps(relevant, sort_keys=True).encode()).hexdigest()
+    return f"{input_hash[:16]}-{digest[:16]}-v{MODEL_CACHE_VERSION}"
+
+
+def model_cache_paths(input_hash, options, cache_dir=CACHE_DIR):
+    """Returns the paths of the compressed MPS file and of its index map sidecar."""
+    stem = os.path.join(cache_dir, f"model-{model_cache_key(input_hash, options)}")
+    return f"{stem}.mps.gz", f"{stem}.idx.pkl"
+
+
+def write_model_cache(m, v, model_path, index_path):
+    """
+    Writes m to model_path and, to index_path, a {block: {VarName: key}}
+    map so the variable dict can be rebuilt after gp.read. Both are written
+    to temporary files first; the model is moved into place last, so an
+    existing model file always has its index map.
+    """
+    os.makedirs(os.path.dirname(model_path) or '.', exist_ok=True)
+    index = {}
+    for block, var_dict in v.items():
+        keys = list(var_dict.keys())
+        names = m.getAttr('VarName', list(var_dict.values())) if keys else []
+        index[block] = dict(zip(names, keys))
+
+    tmp_index = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_index, 'wb') as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_index, index_path)
+
+    # Gurobi picks the file format from the extension, so keep it last
+    tmp_model = model_path.replace('.mps.gz', f".{os.getpid()}.tmp.mps.gz")
+    m.write(tmp_model)
+    os.replace(tmp_model, model_path)
+
+
+def read_model_cache(model_path, index_path, env=None):
+    """Reads a cached model and rebuilds its variable dict from the index map."""
+    m = gp.read(model_path, env)
+    with open(index_path, 'rb') as f:
+        index = pickle.load(f)
+    variables = m.getVars()
+    by_name = dict(zip(m.getAttr('VarName', variables), variables))
+    v = {block: gp.tupledict((key, by_name[name]) for name, key in names.items())
+         for block, names in index.items()}
+    return m, v
+
+
+def cached_build_model(data, input_hash, options=None, env=None, cache_dir=CACHE_DIR, profiler=None):
+    """
+    Returns build_model(data, options, env), read from cache_dir when a model
+    was already built for the same input (input_hash, see data.file_hash)
+    and options. On a miss the model is built and written as a compressed
+    MPS file plus an index map (see write_model_cache), so later runs skip
+    the Python-side construction and only differ in solver parameters.
+    Lazy families are re-attached after a read (callbacks are not saved).
+    """
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    if cache_dir is None:
+        return build_model(data, options, env, profiler)
+
+    model_path, index_path = model_cache_paths(input_hash, options, cache_dir)
+    if os.path.exists(model_path) and os.path.exists(index_path):
+        with phase(profiler, 'read_model'):
+            m, v = read_model_cache(model_path, index_path, env)
+        if options['lazy']:
+            with phase(profiler, 'lazy'):
+                attach(m, v, data, options)
+        return m, v
+
+    m, v = build_model(data, options, env, profiler)
+    with phase(profiler, 'write_model'):
+        write_model_cache(m, v, model_path, index_path)
+    return m, v
@@ -0,0 +1,249 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import gurobipy as gp
+
+from data import CACHE_DIR, LOAD_MULTIPLIER, load_data
+from decompose import assigned_pairs, iis_courses, restrict_to_assignment, solve_stage2
+from model import CONSTRAINTS, DEFAULT_OPTIONS, add_vars, build_model, solve
+from utils import RESULT_COLUMNS, selected_keys, tabulate_results
+
+
+# Families replaced by the shared annual load rows
+TERM_SKIP = ('prof_max',)
+
+# Options fixed in multi-term models: symmetry rows order professors within one
+# term, which is no longer valid once the annual load couples the terms
+TERM_OPTIONS = {'symmetry': False}
+
+
+# --- Terms ---
+
+def term_label(file_path):
+    """Name of a term from its workbook (e.g. 'fall' for fall.xlsx), usable in variable names."""
+    return os.path.splitext(os.path.basename(file_path))[0].replace(' ', '_')
+
+
+def load_terms(file_paths, cache_dir=CACHE_DIR):
+    """Loads one workbook per term (see data.load_data) into a {label: data} dict, in the given order."""
+    terms = {}
+    for file_path in file_paths:
+        label = term_label(file_path)
+        if label in terms:
+            raise ValueError(f"Two term workbooks are named {label}")
+        terms[label] = load_data(file_path, cache_dir=cache_dir)
+    return terms
+
+
+def annual_loads(terms, loads_file=None):
+    """
+    Yearly credit capacity per professor: NumCourses * LOAD_MULTIPLIER from
+    the Loads sheet of loads_file, or else the sum of the term workbooks'
+    loads (the hand-made split, added back up).
+    """
+    if loads_file is not None:
+        loads = pd.read_excel(loads_file, sheet_name='Loads')
+        return dict(zip(loads['Prof'], (loads['NumCourses'] * LOAD_MULTIPLIER).astype(float).tolist()))
+    annual = {}
+    for data in terms.values():
+        for i, a in data['a_var'].items():
+            annual[i] = annual.get(i, 0.0) + a
+    return annual
+
+
+def with_loads(data, loads):
+    """Returns a copy of a term's data whose professor loads are the given (annual) ones."""
+    term = dict(data)
+    term['a_arr'] = np.array([loads.get(i, 0.0) for i in data['idx_prof'].tolist()], dtype=float)
+    term['a_var'] = dict(zip(data['idx_prof'].tolist(), term['a_arr'].tolist()))
+    return term
+
+
+def _prefix_new(m, label, num_vars, num_constrs, num_qconstrs):
+    """Prefixes the names of the variables and rows added since the given counts with 'label.'."""
+    m.update()
+    for items, attr in ((m.getVars()[num_vars:], 'VarName'), (m.getConstrs()[num_constrs:], 'ConstrName'),
+                        (m.getQConstrs()[num_qconstrs:], 'QCName')):
+        if items:
+            m.setAttr(attr, items, [f"{label}.{name}" for name in m.getAttr(attr, items)])
+
+
+def add_annual_load(m, x_vars, terms, annual):
+    """Constraint 2 over the year: a professor's credits summed over all terms stay within the annual load."""
+    credits = {}
+    for label, x_var in x_vars.items():
+        b_var = terms[label]['b_var']
+        for (i, j), var in x_var.items():
+            credits.setdefault(i, []).append((b_var[j], var))
+    return m.addConstrs(
+        (gp.LinExpr(*zip(*credits[i])) <= annual.get(i, 0.0) for i in credits),
+        name='annual_load'
+    )
+
+
+# --- Monolithic Model ---
+
+def build_multiterm(terms, annual, options=None, env=None):
+    """
+    Builds one model for all terms: each term gets its own x/y/z/l/w block
+    and Constraints 1 and 3-15 (names prefixed with the term label), and
+    Constraint 2 is replaced by the shared annual_load rows. Constraint 5
+    uses the annual load, since a professor's whole load may fall in one
+    term. Returns the model and a {label: vars} dict.
+    """
+    options = {**DEFAULT_OPTIONS, **(options or {}), **TERM_OPTIONS}
+    skip = set(options['skip']) | set(TERM_SKIP)
+    m = gp.Model('course_sched_multiterm', env=env)
+
+    v = {}
+    objective = gp.LinExpr()
+    for label, data in terms.items():
+        term = with_loads(data, annual)
+        m.update()
+        counts = (m.NumVars, m.NumConstrs, m.NumQConstrs)
+        v[label] = add_vars(m, term, options)
+        m.update()
+        for name, add_constrs in CONSTRAINTS.items():
+            if name not in skip:
+                add_constrs(m, v[label], term, options)
+        _prefix_new(m, label, *counts)
+        objective.add(gp.LinExpr([term['b_var'][j] for (_, j) in v[label]['x']], list(v[label]['x'].values())))
+
+    m.setObjective(objective, gp.GRB.MAXIMIZE)
+    add_annual_load(m, {label: term_v['x'] for label, term_v in v.items()}, terms, annual)
+    m.update()
+    return m, v
+
+
+# --- Decomposition ---
+
+def build_multiterm_master(terms, annual, env=None):
+    """
+    Builds the assignment MIP over every term's x: Constraints 1 and 3 per
+    term, the annual_load rows and, per term, the slot count of
+    decompose.build_master (against the annual load). Returns the model and
+    a {label: x} dict.
+    """
+    m = gp.Model('course_assign_multiterm', env=env)
+    x_vars = {}
+    objective = gp.LinExpr()
+    for label, data in terms.items():
+        profs, courses = data['idx_prof'].tolist(), data['idx_course'].tolist()
+        ii, jj = np.nonzero(data['c_arr'] == 1)
+        x_var = gp.tupledict({
+        (profs[n], courses[p]): m.addVar(name=f"{label}.x_{profs[n]}_{courses[p]}", vtype=gp.GRB.BINARY)
+        for n, p in zip(ii.tolist(), jj.tolist())
+        })
+        x_vars[label] = x_var
+        objective.add(gp.LinExpr([data['b_var'][j] for (_, j) in x_var], list(x_var.values())))
+
+        m.addConstrs((x_var.sum('*', j) == 1 for j in courses), name=f"{label}.one_prof")
+        slots = (data['d_arr'] == 1).sum(axis=1)
+        m.addConstrs(
+            (x_var.sum(i, '*') <= min(-(-annual.get(i, 0.0)//3), slots[n])
+             for n, i in enumerate(profs)),
+            name=f"{label}.slot_count"
+        )
+
+    m.setObjective(objective, gp.GRB.MAXIMIZE)
+    add_annual_load(m, x_vars, terms, annual)
+    m.update()
+    return m, x_vars
+
+
+def solve_multiterm_decomposed(terms, annual, options=None, params=None, env=None, max_iters=50, iis_cuts=True):
+    """
+    Logic-based Benders decomposition over the terms (see
+    decompose.solve_decomposed). The master assigns professors to courses
+    in every term under the shared annual load; once x is fixed the terms'
+    timetables are independent, so each term is solved as its own small
+    model, and only terms whose assignment changed are re-solved. An
+    infeasible term (see decompose.solve_stage2) adds a no-good cut on that
+    term's assignment only; a term whose solve stops without a timetable
+    ends the loop with row['stage2'] set to 'inconclusive'.
+
+    Returns {label: (model, vars)} for the last stage-two models (None once
+    the master is infeasible) and one history row per iteration. The
+    schedule is optimal when every term's status is OPTIMAL.
+    """
+    options = {**DEFAULT_OPTIONS, **(options or {}), **TERM_OPTIONS, 'sparse': True}
+    options['skip'] = tuple(set(options['skip']) | set(TERM_SKIP))
+    master, x_vars = build_multiterm_master(terms, annual, env)
+
+    history = []
+    solved = {}  # label -> (pairs, model, vars, status)
+    for it in range(max_iters):
+        start = time.perf_counter()
+        row = {'iteration': it, 'master_status': solve(master, params)}
+        if master.SolCount == 0:
+            # No assignment left that every term can timetable
+            history.append(row)
+            for _, m, _, _ in solved.values():
+                m.dispose()
+            solved = {}
+            break
+
+        cuts = 0
+        for label, data in terms.items():
+            pairs = frozenset(assigned_pairs(master, x_vars[label]))
+            if label in solved and solved[label][0] == pairs:
+                continue
+            if label in solved:
+                solved[label][1].dispose()
+            term = with_loads(restrict_to_assignment(data, pairs), annual)
+            m, v = build_model(term, options, env)
+            status, outcome = solve_stage2(m, params)
+            solved[label] = (pairs, m, v, status)
+            row[f"{label}_status"] = status
+            if outcome == 'inconclusive':
+                row['stage2'] = outcome
+            if outcome != 'infeasible':
+                continue
+
+            courses = iis_courses(m, v) if iis_cuts else None
+            if courses is None:
+                courses = {j for (_, j) in pairs}
+            cut = [(i, j) for (i, j) in pairs if j in courses]
+            master.addConstr(gp.quicksum(x_vars[label][key] for key in cut) <= len(cut) - 1,
+                             name=f"{label}.no_good[{it}]")
+            cuts += 1
+
+        row['cuts'] = cuts
+        row['seconds'] = time.perf_counter() - start
+        history.append(row)
+        if not cuts or row.get('stage2') == 'inconclusive':
+            break
+
+    master.dispose()
+    if not solved:
+        return None, history
+    return {label: (m, v) for label, (_, m, v, _) in solved.items()}, history
+
+
+# --- Reporting ---
+
+def term_results(m, v, data):
+    """
+    Result tables of one term's variables (see utils.extract_results), with
+    that term's scheduled credits as the objective: in the monolithic model
+    m.ObjVal sums every term.
+    """
+    prof_course = selected_keys(m, v['x'], RESULT_COLUMNS['x'])
+    objective = float(prof_course['Course_Number'].map(data['b_var']).sum())
+    return tabulate_results(prof_course, selected_keys(m, v['y'], RESULT_COLUMNS['y']),
+                            selected_keys(m, v['l'], RESULT_COLUMNS['l']), objective,
+                            data['courses_attr'], data['times_attr'])
+
+
+def load_summary(results, annual):
+    """Credits each professor teaches per term against their annual load."""
+    table = pd.DataFrame({'Prof': sorted(annual)})
+    table['Annual_Load'] = table['Prof'].map(annual)
+    for label, term_results in results.items():
+        credits = term_results['prof_course'].groupby('Prof')['Credits'].sum()
+        table[label] = table['Prof'].map(credits).fillna(0.0)
+    table['Total'] = table[list(results)].sum(axis=1)
+    return table
@@ -0,0 +1,119 @@
+import queue
+import time
+
+import gurobipy as gp
+
+from data import CACHE_DIR, load_data
+from model import DEFAULT_PARAMS, build_model, solve
+from sweep import split_threads, worker_context
+from utils import RESULT_COLUMNS, STATUS_CODES, selected_keys
+from warm_start import apply_start
+
+
+# Parameter settings cycled through by the portfolio members (on top of a per-member seed)
+PORTFOLIO = [
+    {},                                # Gurobi defaults
+    {'MIPFocus': 1},                   # Feasible solutions first
+    {'MIPFocus': 2},                   # Proving optimality
+    {'Heuristics': 0.5},               # More time in primal heuristics
+    {'MIPFocus': 3},                   # Moving the bound
+    {'Heuristics': 0.0, 'Cuts': 2},    # Aggressive cuts, no heuristics
+]
+
+# Statuses that end the race: the winner has proved its result
+DECISIVE_STATUSES = (gp.GRB.OPTIMAL, gp.GRB.INFEASIBLE, gp.GRB.INF_OR_UNBD, gp.GRB.UNBOUNDED)
+
+
+def portfolio_params(size, seed=DEFAULT_PARAMS['Seed']):
+    """Parameters of each of size members: seeds seed, seed + 1, ... over the PORTFOLIO settings."""
+    return [{'Seed': seed + n, **PORTFOLIO[n % len(PORTFOLIO)]} for n in range(size)]
+
+
+def _member(index, file_path, cache_dir, options, params, start, results):
+    """Builds and solves one portfolio member in its own process and puts its result row on results."""
+    row = {'member': index, 'params': params}
+    try:
+        data = load_data(file_path, cache_dir=cache_dir)
+        m, v = build_model(data, options)
+        if start is not None:
+            apply_start(m, v, *start)
+        solve(m, params)
+        row.update({
+            'status': m.status,
+            'objective': m.ObjVal if m.SolCount > 0 else None,
+            'bound': m.ObjBound if m.SolCount > 0 else None,
+            'mip_gap': m.MIPGap if m.SolCount > 0 else None,
+            'runtime': m.Runtime,
+        })
+        if m.SolCount > 0:
+            # Selected keys as in warm_start.load_schedule, so the parent can tabulate them
+            row['schedule'] = {
+                block: set(selected_keys(m, v[block], columns).itertuples(index=False, name=None))
+                for block, columns in RESULT_COLUMNS.items()
+            }
+        m.dispose()
+    except gp.GurobiError as e:
+        row.update({'status': None, 'error': str(e)})
+    results.put(row)
+
+
+def solve_portfolio(file_path, options=None, size=4, threads=None, params=None, cache_dir=CACHE_DIR,
+                    start=None):
+    """
+    Races size copies of the model, each with its own seed and settings
+    (see portfolio_params) in a separate process, with the threads budget
+    (default: all cores) split evenly among them. size is clamped to the
+    budget (see sweep.split_threads) so the members never oversubscribe the
+    cores. The first member to finish with a decisive status (optimal, which
+    includes reaching the MIPGap target, or infeasible) wins and the others
+    are terminated. If none is decisive (e.g. all hit TimeLimit), the best
+    objective wins.
+
+    start is an optional (schedule, mode) pair for warm_start.apply_start.
+    Returns the winning row (None if every member failed) and the rows of
+    every member that finished; the winner's 'schedule' holds its x, y and
+    l keys and 'wall_seconds' the time to the win.
+    """
+    size, per_member = split_threads(size, threads)
+    members = portfolio_params(size)
+    base = {'OutputFlag': 0, **(params or {}), 'Threads': per_member}
+
+    context = worker_context(file_path, cache_dir)
+    results = context.Queue()
+    started = time.perf_counter()
+    processes = [
+        context.Process(target=_member, args=(n, file_path, cache_dir, options, {**base, **member}, start, results),
+                        daemon=True)
+        for n, member in enumerate(members)
+    ]
+    for process in processes:
+        process.start()
+
+    rows, winner = [], None
+    try:
+        while len(rows) < size:
+            try:
+                row = results.get(timeout=1)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    break  # a member died without reporting
+                continue
+            row['wall_seconds'] = time.perf_counter() - started
+            rows.append(row)
+            if row['status'] in DECISIVE_STATUSES:
+                winner = row
+                break
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+
+    if winner is None:
+        solved = [row for row in rows if row.get('objective') is not None]
+        if solved:
+            winner = max(solved, key=lambda row: row['objective'])
+    for row in rows:
+        row['status_name'] = STATUS_CODES.get(row['status'], 'UNKNOWN')
+    return winner, rows
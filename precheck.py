@@ -0,0 +1,236 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import breadth_first_order, maximum_flow
+
+import gurobipy as gp
+
+from model import DEFAULT_OPTIONS, RESEARCH_SLOTS, build_model, solve
+
+
+# Families left out of the reduced diagnosis model: their caps are shares of a
+# group's classes, so dropping courses could make them tighter, not looser
+SHARE_FAMILIES = ('max_50_percent_prime', 'max_50_percent_T/Th')
+
+
+# --- Necessary Conditions ---
+# Each check looks at the parameters only (no model) and returns a list of
+# issues: {'check', 'message', 'courses', 'profs'}. Every condition holds in
+# any feasible schedule, so an issue proves the model infeasible.
+
+def _issue(check, message, courses=(), profs=()):
+    return {'check': check, 'message': message, 'courses': list(courses), 'profs': list(profs)}
+
+
+def day_time_capacity(data):
+    """Number of day-time groups in which each professor has an available slot (Constraint 6)."""
+    d_arr = data['d_arr'] == 1
+    columns = [[data['time_index'][k] for k in data['day_time_groups'][t]] for t in data['idx_day_time']]
+    return np.stack([d_arr[:, cols].any(axis=1) for cols in columns], axis=1).sum(axis=1)
+
+
+def effective_eligibility(data):
+    """
+    Eligibility mask (prof x course) after the rules a single assignment has
+    to satisfy: c_ij = 1, b_j <= a_i (Constraint 2), a free day-time group for
+    the lecture and one more for a lab (Constraints 6 and 10), and for the
+    701 seminar an available research slot (Constraint 13).
+    """
+    eligible = (data['c_arr'] == 1) & (data['b_arr'][None, :] <= data['a_arr'][:, None])
+    eligible &= day_time_capacity(data)[:, None] >= 1 + data['e_arr'][None, :]
+    if 701 in data['course_index']:
+        research = [data['time_index'][k] for k in RESEARCH_SLOTS]
+        eligible[:, data['course_index'][701]] &= (data['d_arr'][:, research] == 1).any(axis=1)
+    return eligible
+
+
+def course_slots(data):
+    """Courses each professor can take: min(ceil(a_i/3), day-time groups with an available slot) (Constraints 5, 6 and 9)."""
+    return np.minimum(-(-data['a_arr'] // 3), day_time_capacity(data)).astype(int)
+
+
+def check_eligibility(data, eligible):
+    """Courses no professor can take on their own (see effective_eligibility)."""
+    courses, profs = data['idx_course'].tolist(), data['idx_prof'].tolist()
+    issues = []
+    for p in np.flatnonzero(~eligible.any(axis=0)).tolist():
+        listed = [profs[n] for n in np.flatnonzero(data['c_arr'][:, p]).tolist()]
+        reason = "no professor is marked eligible" if not listed else \
+            f"none of the eligible professors {listed} has the load and available times it needs"
+        issues.append(_issue('eligibility', f"Course {courses[p]}: {reason}", [courses[p]], listed))
+    return issues
+
+
+def check_capacity(data):
+    """Total course credits against total professor load (Constraints 1 and 2)."""
+    demand, capacity = data['b_arr'].sum(), data['a_arr'].sum()
+    if demand <= capacity:
+        return []
+    return [_issue('capacity', f"Courses need {demand:g} credits but professors can take {capacity:g}")]
+
+
+def check_matching(data, eligible):
+    """
+    Hall condition: every course needs its own professor slot (see
+    course_slots). Solves the course-to-professor matching as a max flow
+    and, when some course stays unmatched, reports the deficient set from
+    the min cut: courses whose eligible professors have fewer slots than
+    the courses need.
+    """
+    courses, profs = data['idx_course'].tolist(), data['idx_prof'].tolist()
+    num_courses, num_profs = len(courses), len(profs)
+    slots = course_slots(data)
+    source, sink = 0, 1 + num_courses + num_profs
+
+    # Courses without any eligible professor are left to check_eligibility
+    has_prof = eligible.any(axis=0)
+    ii, jj = np.nonzero(eligible)
+    rows = np.concatenate([np.zeros(num_courses, dtype=int), 1 + jj, 1 + num_courses + np.arange(num_profs)])
+    cols = np.concatenate([1 + np.arange(num_courses), 1 + num_courses + ii, np.full(num_profs, sink)])
+    caps = np.concatenate([has_prof, np.ones(len(ii)), slots]).astype(np.int32)
+    graph = sp.csr_matrix((caps, (rows, cols)), shape=(sink + 1, sink + 1))
+
+    result = maximum_flow(graph, source, sink)
+    if result.flow_value >= has_prof.sum():
+        return []
+
+    residual = (graph - result.flow).tocsr()
+    residual.data = (residual.data > 0).astype(np.int32)
+    residual.eliminate_zeros()
+    reached = set(breadth_first_order(residual, source, return_predecessors=False).tolist())
+    deficient = [courses[n - 1] for n in range(1, 1 + num_courses) if n in reached]
+    neighbors = [profs[n] for n in range(num_profs) if 1 + num_courses + n in reached]
+    available = int(sum(slots[data['prof_index'][i]] for i in neighbors))
+    return [_issue('matching', f"Courses {deficient} can only be taught by professors {neighbors}, "
+                   f"who have {available} course slots for {len(deficient)} courses", deficient, neighbors)]
+
+
+def check_groups(data):
+    """Classes and labs per course group against the day-time groups (Constraint 12)."""
+    num_day_time = len(data['idx_day_time'])
+    issues = []
+    for g, group in data['course_groups'].items():
+        demand = len(group) + sum(data['e_var'][j] for j in group)
+        if demand > num_day_time:
+            issues.append(_issue('group', f"Course group {g} needs {demand} class and lab sessions "
+                                 f"but there are {num_day_time} day-time groups", group))
+    return issues
+
+
+def allowed_times(data, eligible):
+    """Course x time mask of the slots some eligible professor is available at (701: the research slots only)."""
+    allowed = (eligible.T.astype(int) @ (data['d_arr'] == 1).astype(int)) > 0
+    if 701 in data['course_index']:
+        research = np.zeros(len(data['idx_time']), dtype=bool)
+        research[[data['time_index'][k] for k in RESEARCH_SLOTS]] = True
+        allowed[data['course_index'][701]] &= research
+    return allowed
+
+
+def check_shares(data, eligible, options=None):
+    """
+    Courses that can only be held in prime time (or on T/Th) against the
+    group caps of Constraints 14 and 15, counting classes the way the model
+    does.
+    """
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    allowed = allowed_times(data, eligible)
+    caps = [('prime', data['prime_indices'], options['max_prime_share']),
+            ('T/Th', data['tues_thurs_indices'], options['max_tth_share'])]
+    issues = []
+    for g, group in data['course_groups'].items():
+        counted = [j for j in group if j != data['class_grp_701']]
+        for label, slots, share in caps:
+            outside = np.ones(len(data['idx_time']), dtype=bool)
+            outside[[data['time_index'][k] for k in slots]] = False
+            forced = [j for j in counted if not allowed[data['course_index'][j], outside].any()]
+            if len(forced) > share * len(counted) + 1e-9:
+                issues.append(_issue('share', f"Course group {g}: courses {forced} can only be held in {label} slots, "
+                                     f"but at most {share:g} of the group's {len(counted)} classes may be", forced))
+    return issues
+
+
+def check_data(data, options=None):
+    """Runs every check and returns the issues found (empty if none)."""
+    eligible = effective_eligibility(data)
+    return (check_eligibility(data, eligible) + check_capacity(data) + check_matching(data, eligible)
+            + check_groups(data) + check_shares(data, eligible, options))
+
+
+# --- Reduced IIS ---
+
+def subset_data(data, courses):
+    """
+    Returns the data restricted to the given courses and every professor
+    eligible for one of them (all time slots are kept).
+    """
+    course_pos = sorted(data['course_index'][j] for j in courses)
+    prof_pos = np.flatnonzero(data['c_arr'][:, course_pos].any(axis=1)).tolist()
+    idx_course, idx_prof = data['idx_course'][course_pos], data['idx_prof'][prof_pos]
+    kept, profs, times = set(idx_course.tolist()), idx_prof.tolist(), data['idx_time'].tolist()
+
+    sub = dict(data)
+    sub['idx_course'], sub['idx_prof'] = idx_course, idx_prof
+    sub['course_index'] = {j: n for n, j in enumerate(idx_course.tolist())}
+    sub['prof_index'] = {i: n for n, i in enumerate(profs)}
+    sub['courses_attr'] = data['courses_attr'][data['courses_attr']['Number'].isin(kept)]
+    sub['prof_attr'] = data['prof_attr'][data['prof_attr']['Prof'].isin(profs)]
+    sub['a_arr'], sub['d_arr'] = data['a_arr'][prof_pos], data['d_arr'][prof_pos]
+    sub['b_arr'], sub['e_arr'] = data['b_arr'][course_pos], data['e_arr'][course_pos]
+    sub['c_arr'] = data['c_arr'][np.ix_(prof_pos, course_pos)]
+    sub['a_var'] = {i: data['a_var'][i] for i in profs}
+    sub['b_var'] = {j: data['b_var'][j] for j in sub['course_index']}
+    sub['e_var'] = {j: data['e_var'][j] for j in sub['course_index']}
+    sub['c_var'] = {(i, j): data['c_var'][i, j] for i in profs for j in sub['course_index']}
+    sub['d_var'] = {(i, k): data['d_var'][i, k] for i in profs for k in times}
+    sub['course_groups'] = {g: [j for j in group if j in kept] for g, group in data['course_groups'].items()
+                            if any(j in kept for j in group)}
+    sub['idx_group'] = list(sub['course_groups'])
+    return sub
+
+
+def iis_names(m):
+    """Computes an IIS of an infeasible model and returns the names of its rows and variable bounds."""
+    m.computeIIS()
+    names = []
+    constrs, qconstrs, variables = m.getConstrs(), m.getQConstrs(), m.getVars()
+    if constrs:
+        names += [c.ConstrName for c, in_iis in zip(constrs, m.getAttr('IISConstr', constrs)) if in_iis]
+    if qconstrs:
+        names += [q.QCName for q, in_iis in zip(qconstrs, m.getAttr('IISQConstr', qconstrs)) if in_iis]
+    for var, lb, ub in zip(variables, m.getAttr('IISLB', variables), m.getAttr('IISUB', variables)):
+        if lb:
+            names.append(f"lb({var.VarName})")
+        if ub:
+            names.append(f"ub({var.VarName})")
+    return names
+
+
+def suspects(data, issues):
+    """Course sets to diagnose: those named by the issues, else each course group in turn."""
+    named = [issue['courses'] for issue in issues if issue['courses']]
+    return named or list(data['course_groups'].values())
+
+
+def diagnose(data, course_sets, options=None, params=None, env=None):
+    """
+    Builds the model around each course set in turn (see subset_data, with
+    the share Constraints 14 and 15 left out so it stays a relaxation of the
+    full model) and returns the first one that is infeasible, with its IIS:
+    {'courses', 'profs', 'iis'}. Returns None if every reduced model is
+    feasible, in which case only an IIS of the full model can tell.
+    """
+    options = {**DEFAULT_OPTIONS, **(options or {}), 'lazy': ()}
+    params = {'OutputFlag': 0, **(params or {})}
+    for courses in course_sets:
+        sub = subset_data(data, courses)
+        skip = set(options['skip']) | set(SHARE_FAMILIES)
+        if 701 not in sub['course_index']:
+            skip.add('grad_research_preffered')
+        m, _ = build_model(sub, {**options, 'skip': tuple(skip)}, env)
+        try:
+            if solve(m, params) == gp.GRB.INFEASIBLE:
+                return {'courses': sub['idx_course'].tolist(), 'profs': sub['idx_prof'].tolist(),
+                        'iis': iis_names(m)}
+        finally:
+            m.dispose()
+    return None
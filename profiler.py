@@ -0,0 +1,121 @@
+import contextlib
+import json
+import time
+import tracemalloc
+
+import numpy as np
+
+
+class Profiler:
+    """
+    Records wall time and tracemalloc memory per named phase. Phases nest:
+    a phase opened inside 'build' is recorded as 'build/<name>'. Memory is
+    what Python allocates (tracemalloc), not Gurobi's native memory.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.records = []
+        self.families = {}
+        self.model = None
+        self._stack = []
+
+    def start(self):
+        """Starts tracemalloc (if enabled and not already running)."""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return self
+
+    def stop(self):
+        """Stops tracemalloc."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Times the enclosed block and records its peak traced memory."""
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            if self._stack:
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        frame = {
+            'name': '/'.join([f['name'] for f in self._stack[-1:]] + [name]),
+            'peak': 0,
+            'current': tracemalloc.get_traced_memory()[0] if tracing else 0,
+        }
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            seconds = time.perf_counter() - start
+            self._stack.pop()
+            record = {'phase': frame['name'], 'seconds': seconds}
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(frame['peak'], peak)
+                record['peak_mb'] = peak / 2**20
+                record['retained_mb'] = (current - frame['current']) / 2**20
+                if self._stack:
+                    self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+                tracemalloc.reset_peak()
+            self.records.append(record)
+
+    def count_families(self, m):
+        """
+        Records the rows and nonzeros per constraint family (row name up to
+        '[') and the size of a built model, for reports written without it.
+        """
+        self.families = constraint_stats(m)
+        self.model = model_size(m)
+
+    def report(self, m=None):
+        """Returns the phase records, family counts and model size (of m, else of the last counted model) as a dict."""
+        report = {'phases': self.records, 'families': self.families}
+        model = model_size(m) if m is not None else self.model
+        if model is not None:
+            report['model'] = model
+        return report
+
+    def write(self, path, m=None):
+        """Writes the report as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.report(m), f, indent=2)
+
+
+def phase(profiler, name):
+    """profiler.phase(name), or a no-op context when profiler is None."""
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.phase(name)
+
+
+def model_size(m):
+    """Variable, row and nonzero counts of a model."""
+    return {
+        'num_vars': m.NumVars,
+        'num_constrs': m.NumConstrs,
+        'num_qconstrs': m.NumQConstrs,
+        'num_nzs': m.NumNZs,
+    }
+
+
+def constraint_stats(m):
+    """Returns {family: {'rows': n, 'nnz': n}} for the linear and quadratic rows of m."""
+    m.update()
+    stats = {}
+    constrs = m.getConstrs()
+    if constrs:
+        nnz = np.diff(m.getA().tocsr().indptr)
+        families = [name.split('[', 1)[0] for name in m.getAttr('ConstrName', constrs)]
+        for family, count in zip(families, nnz.tolist()):
+            entry = stats.setdefault(family, {'rows': 0, 'nnz': 0})
+            entry['rows'] += 1
+            entry['nnz'] += count
+    for qc in m.getQConstrs():
+        entry = stats.setdefault(qc.QCName.split('[', 1)[0], {'rows': 0, 'nnz': 0})
+        row = m.getQCRow(qc)
+        entry['rows'] += 1
+        entry['nnz'] += row.size() + row.getLinExpr().size()
+    return stats
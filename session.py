@@ -0,0 +1,144 @@
+import copy
+
+from model import DEFAULT_OPTIONS, build_model, solve
+from utils import extract_results
+
+
+# Variable blocks carried over as MIP start when the model is rebuilt
+START_BLOCKS = ('x', 'y', 'z', 'l', 'w')
+
+
+class Session:
+    """
+    Long-lived course scheduling model for incremental re-solves.
+
+    update() applies a diff of changed parameters directly to the built model
+    (variable bounds and constraint right-hand sides) and keeps the previous
+    incumbent as MIP start, so small preference edits skip the Excel parse,
+    the model build and the cold solve. A diff that needs a variable the
+    sparse model never created (an ineligible tuple becoming eligible) falls
+    back to a rebuild, still warm-started from the previous incumbent.
+    """
+
+    def __init__(self, data, options=None, params=None, env=None):
+        # Own copy: diffs are written back into the parameter dicts and arrays
+        self.data = copy.deepcopy(data)
+        self.options = {**DEFAULT_OPTIONS, **(options or {})}
+        self.params = params
+        self.env = env
+        self.rebuilds = 0
+        self.m, self.v = build_model(self.data, self.options, env)
+
+    # --- Solving ---
+
+    def solve(self):
+        """Optimizes the current model and returns its status."""
+        return solve(self.m, self.params)
+
+    def results(self):
+        """Returns the extracted result tables (see utils.extract_results)."""
+        return extract_results(self.m, self.v['x'], self.v['y'], self.v['l'],
+                               self.data['courses_attr'], self.data['times_attr'])
+
+    def incumbent(self):
+        """Returns the current solution as {block: {key: value}}, or None without one."""
+        if self.m.SolCount == 0:
+            return None
+        values = {}
+        for block in START_BLOCKS:
+            var_dict = self.v.get(block) or {}
+            values[block] = dict(zip(var_dict.keys(), self.m.getAttr('X', list(var_dict.values())))) if var_dict else {}
+        return values
+
+    def _set_start(self, values):
+        """Sets Start on every variable that has a value in values."""
+        for block, block_values in values.items():
+            var_dict = self.v.get(block) or {}
+            keys = [key for key in block_values if key in var_dict]
+            if keys:
+                self.m.setAttr('Start', [var_dict[key] for key in keys], [block_values[key] for key in keys])
+
+    # --- Diffs ---
+
+    def update(self, diff):
+        """
+        Applies a diff of changed parameters and returns 'updated' (in place)
+        or 'rebuilt'. diff may contain:
+            'c_var': {(prof, course): 0/1}   prof course eligibility
+            'd_var': {(prof, time): 0/1}     prof time availability
+            'a_var': {prof: credits}         prof max credit load
+        Call solve() afterwards to re-optimize.
+        """
+        previous = self.incumbent()
+        rebuild = False
+
+        for (i, j), value in diff.get('c_var', {}).items():
+            rebuild |= self._update_course(i, j, int(value))
+        for (i, k), value in diff.get('d_var', {}).items():
+            rebuild |= self._update_time(i, k, int(value))
+        for i, value in diff.get('a_var', {}).items():
+            self._update_load(i, value)
+        # The symmetry-breaking rows depend on which professors and slots are identical
+        rebuild |= self.options['symmetry']
+
+        if rebuild:
+            self.m.dispose()
+            self.m, self.v = build_model(self.data, self.options, self.env)
+            self.rebuilds += 1
+        if previous is not None:
+            self._set_start(previous)
+        self.m.update()
+        return 'rebuilt' if rebuild else 'updated'
+
+    def _set_rhs(self, name, value):
+        """Sets the RHS of a named row, if the row is in the model."""
+        constr = self.m.getConstrByName(name)
+        if constr is not None:
+            constr.RHS = value
+
+    def _update_course(self, i, j, value):
+        """c_{i,j} changed; returns True if the model has to be rebuilt."""
+        data = self.data
+        data['c_var'][i, j] = value
+        data['c_arr'][data['prof_index'][i], data['course_index'][j]] = value
+
+        x = self.v['x'].get((i, j))
+        if x is None:
+            return value == 1
+        x.UB = value
+        if not self.options['sparse']:
+            self._set_rhs(f"prop_course[{j},{i}]", value)
+        return False
+
+    def _update_time(self, i, k, value):
+        """d_{i,k} changed; returns True if the model has to be rebuilt."""
+        data = self.data
+        data['d_var'][i, k] = value
+        data['d_arr'][data['prof_index'][i], data['time_index'][k]] = value
+
+        z = self.v['z'].get((i, k))
+        if z is None:
+            return value == 1
+        z.UB = value
+        if not self.options['sparse']:
+            self._set_rhs(f"proper_prof_time[{i},{k}]", value)
+        # Constraint 11 carries d_{i,k} in its right-hand side (fractional form) or in the
+        # lab_available rows (tight dense form); the sparse tight form relies on the l bounds
+        labs = [(p, j, q) for (p, j, q) in self.v['l'] if p == i and q == k]
+        if self.options['tight_labs']:
+            self._set_rhs(f"lab_available[{i},{k}]", value)
+            for key in labs:
+                self.v['l'][key].UB = value
+        else:
+            for (_, j, _) in labs:
+                self._set_rhs(f"prof_lab_time[{i},{j},{k}]", -(1 + value) * (1/3))
+        return False
+
+    def _update_load(self, i, value):
+        """a_i changed: update the Constraint 2 and 5 right-hand sides."""
+        data = self.data
+        data['a_var'][i] = value
+        data['a_arr'][data['prof_index'][i]] = value
+        data['prof_attr'].loc[data['prof_attr']['Prof'] == i, 'max_credit'] = value
+        self._set_rhs(f"prof_max[{i}]", value)
+        self._set_rhs(f"limit_prof[{i}]", -(-value // 3))
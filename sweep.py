@@ -0,0 +1,147 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from data import CACHE_DIR, LOAD_MULTIPLIER, load_data, scale_loads
+from model import build_model, solve
+from utils import STATUS_CODES
+
+
+# Default grid: relax the prime-time (14) and T/Th (15) caps, drop the 701
+# research slot (13) and vary the load multiplier. Values are cross-joined.
+DEFAULT_GRID = {
+    'max_prime_share': [0.5, 1.0],
+    'max_tth_share': [0.5, 1.0],
+    'skip': [[], ['grad_research_preffered']],
+    'load_multiplier': [LOAD_MULTIPLIER, LOAD_MULTIPLIER + 1],
+}
+
+
+# --- Worker Processes ---
+
+def worker_context(file_path, cache_dir=CACHE_DIR):
+    """
+    Parses the workbook once, so worker processes only read the input cache
+    (skipped when cache_dir is None), and returns the multiprocessing context
+    to start them with. Spawn rather than fork: gurobipy holds native state
+    that must not be shared.
+    """
+    if cache_dir is not None:
+        load_data(file_path, cache_dir=cache_dir)
+    return multiprocessing.get_context('spawn')
+
+
+def split_threads(workers, threads=None):
+    """
+    Clamps workers to the threads budget (default: all cores), so processes
+    never oversubscribe the cores, and returns (workers, threads per worker).
+    """
+    threads = threads or os.cpu_count() or 1
+    workers = max(1, min(workers, threads))
+    return workers, threads // workers
+
+
+# --- Variants ---
+
+def expand_grid(grid):
+    """Cross-joins a {option: [values]} grid into a list of variant dicts."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def variant_label(variant):
+    """Short, stable label for a variant (e.g. 'max_prime_share=1.0,skip=grad_research_preffered')."""
+    parts = []
+    for key, value in variant.items():
+        if isinstance(value, (list, tuple)):
+            value = '+'.join(value) or 'none'
+        parts.append(f"{key}={value}")
+    return ','.join(parts)
+
+
+def run_variant(file_path, variant, params):
+    """
+    Builds and solves one variant in the current process. The variant holds
+    build_model options plus an optional 'load_multiplier' (see data.scale_loads).
+    Returns a result row for the comparison table; a variant that fails
+    records its error in the row rather than aborting the sweep.
+    """
+    options = dict(variant)
+    multiplier = options.pop('load_multiplier', LOAD_MULTIPLIER)
+    row = {'variant': variant_label(variant), **variant}
+
+    m = None
+    try:
+        data = load_data(file_path, cache_dir=CACHE_DIR)
+        if multiplier != LOAD_MULTIPLIER:
+            data = scale_loads(data, multiplier)
+
+        start = time.perf_counter()
+        m, _ = build_model(data, options)
+        row['build_seconds'] = time.perf_counter() - start
+
+        solve(m, params)
+        row.update({
+            'status': STATUS_CODES.get(m.status, 'UNKNOWN'),
+            'objective': m.ObjVal if m.SolCount > 0 else None,
+            'bound': m.ObjBound if m.IsMIP and m.SolCount > 0 else None,
+            'mip_gap': m.MIPGap if m.IsMIP and m.SolCount > 0 else None,
+            'runtime': m.Runtime,
+            'nodes': m.NodeCount,
+        })
+    except Exception as e:
+        row['status'] = None
+        row['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        if m is not None:
+            m.dispose()
+
+    return row
+
+
+# --- Sweep ---
+
+def sweep(file_path="CoursePreferences.xlsx", grid=None, workers=None, threads=None, params=None):
+    """
+    Solves every variant of the grid concurrently across a process pool and
+    returns one comparison table (objective, status, runtime, MIP gap).
+    The threads budget (default: all cores) is split evenly among workers.
+    """
+    variants = expand_grid(grid or DEFAULT_GRID)
+    workers, per_worker = split_threads(min(workers or len(variants), len(variants)), threads)
+    params = {'OutputFlag': 0, **(params or {}), 'Threads': per_worker}
+
+    context = worker_context(file_path)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(run_variant, file_path, variant, params) for variant in variants]
+        rows = [future.result() for future in futures]
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve a grid of model variants in parallel.")
+    parser.add_argument("--file", default="CoursePreferences.xlsx", help="Course preferences workbook")
+    parser.add_argument("--grid", help="JSON file with a {option: [values]} grid (default: DEFAULT_GRID)")
+    parser.add_argument("--workers", type=int, help="Number of worker processes")
+    parser.add_argument("--threads", type=int, help="Total solver threads shared by the workers")
+    parser.add_argument("--time-limit", type=float, help="TimeLimit per variant in seconds")
+    parser.add_argument("--out", default="sweep_results.csv", help="CSV file for the comparison table")
+    args = parser.parse_args()
+
+    grid = None
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+    params = {'TimeLimit': args.time_limit} if args.time_limit else None
+
+    results = sweep(args.file, grid, args.workers, args.threads, params)
+    print(results.to_string(index=False))
+    results.to_csv(args.out, index=False)
+    print(f"\nWrote {len(results)} variants to {args.out}")
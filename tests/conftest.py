@@ -0,0 +1,50 @@
+import contextlib
+import os
+import sys
+
+import gurobipy as gp
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data import load_data, tables_from_sheets  # noqa: E402
+from generator import generate_sheets  # noqa: E402
+
+
+# Generated instances small enough for a size-limited Gurobi license
+SMALL_SIZE = {'num_profs': 8, 'num_courses': 9, 'num_time_blocks': 4}
+
+# Seeds of SMALL_SIZE instances with a feasible schedule (objective 25)
+FEASIBLE_SEEDS = (1, 2, 3)
+
+# Seeds of SMALL_SIZE instances the precheck proves infeasible
+INFEASIBLE_SEEDS = (0, 4)
+
+QUIET = {'OutputFlag': 0}
+
+
+@contextlib.contextmanager
+def size_limited():
+    """Skips the test when a model is too large for a size-limited Gurobi license."""
+    try:
+        yield
+    except gp.GurobiError as e:
+        if 'size-limited' not in str(e):
+            raise
+        pytest.skip(str(e))
+
+
+def small_data(seed):
+    """Parsed data of a SMALL_SIZE generated instance."""
+    return tables_from_sheets(generate_sheets(seed=seed, **SMALL_SIZE))
+
+
+@pytest.fixture(scope='session')
+def shipped_data():
+    return load_data(os.path.join(ROOT, 'CoursePreferences.xlsx'), cache_dir=None)
+
+
+@pytest.fixture(params=FEASIBLE_SEEDS)
+def feasible_data(request):
+    return small_data(request.param)
@@ -0,0 +1,60 @@
+import gurobipy as gp
+import pytest
+
+from conftest import FEASIBLE_SEEDS, INFEASIBLE_SEEDS, QUIET, small_data
+from decompose import solve_decomposed, solve_stage2, stop_message
+from model import build_model, solve
+
+
+def _monolithic(data):
+    m, _ = build_model(data)
+    status = solve(m, QUIET)
+    objective = m.ObjVal if m.SolCount > 0 else None
+    m.dispose()
+    return status, objective
+
+
+@pytest.mark.parametrize('iis_cuts', [True, False])
+@pytest.mark.parametrize('seed', FEASIBLE_SEEDS + INFEASIBLE_SEEDS)
+def test_decomposed_matches_monolithic(seed, iis_cuts):
+    data = small_data(seed)
+    status, objective = _monolithic(data)
+    m, _, history = solve_decomposed(data, params=QUIET, iis_cuts=iis_cuts)
+    assert history
+    if status == gp.GRB.OPTIMAL:
+        assert m.status == gp.GRB.OPTIMAL
+        assert m.ObjVal == pytest.approx(objective)
+    else:
+        assert m is None or m.status == gp.GRB.INFEASIBLE
+    if m is not None:
+        m.dispose()
+
+
+@pytest.mark.parametrize('seed, params, outcome', [(FEASIBLE_SEEDS[0], {}, 'solved'),
+                                                    (INFEASIBLE_SEEDS[0], {}, 'infeasible'),
+                                                    (FEASIBLE_SEEDS[0], {'TimeLimit': 0}, 'inconclusive')])
+def test_stage2_outcome(seed, params, outcome):
+    m, _ = build_model(small_data(seed))
+    status, result = solve_stage2(m, {**QUIET, **params})
+    assert result == outcome
+    assert status == m.status
+    m.dispose()
+
+
+def test_timed_out_decomposition_is_not_reported_infeasible():
+    m, _, history = solve_decomposed(small_data(FEASIBLE_SEEDS[0]), params={**QUIET, 'TimeLimit': 0})
+    last = history[-1]
+    if m is None:
+        assert last['master_status'] == gp.GRB.TIME_LIMIT
+    else:
+        assert last['stage2'] in ('solved', 'inconclusive')
+        m.dispose()
+
+
+@pytest.mark.parametrize('row, words', [({'master_status': gp.GRB.INFEASIBLE}, 'No professor-course assignment'),
+                                        ({'master_status': gp.GRB.TIME_LIMIT}, 'status TIME_LIMIT'),
+                                        ({'master_status': gp.GRB.OPTIMAL, 'cut_size': 3}, 'iteration limit'),
+                                        ({'master_status': gp.GRB.OPTIMAL, 'stage2': 'inconclusive'},
+                                         'Stage 2 inconclusive')])
+def test_stop_message_follows_last_row(row, words):
+    assert words in stop_message([row])
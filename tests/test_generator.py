@@ -0,0 +1,27 @@
+import pytest
+
+from benchmark import SCALING_SIZES
+from data import tables_from_sheets
+from generator import BLOCKS_PER_DAY, MAX_ROUNDS, generate_sheets
+
+
+@pytest.mark.parametrize('name', list(SCALING_SIZES))
+def test_time_blocks_are_distinct(name):
+    size = SCALING_SIZES[name]
+    data = tables_from_sheets(generate_sheets(**size))
+    times = data['times_attr']
+    assert len(data['idx_time']) == 4 * size['num_time_blocks']
+    assert times['Times_Grp'].nunique() == size['num_time_blocks']
+    assert not times[['Times', 'Days']].duplicated().any()
+    assert all(label.endswith(('am', 'pm')) for label in times['Times'])
+
+
+def test_first_round_keeps_workbook_slots():
+    times = generate_sheets(num_time_blocks=BLOCKS_PER_DAY)['Times']
+    assert times['Times'].iloc[0] == '8:30-9:45am'
+    assert times['Times'].iloc[4 * BLOCKS_PER_DAY - 1] == '6:00-7:15pm'
+
+
+def test_too_many_blocks():
+    with pytest.raises(ValueError):
+        generate_sheets(num_time_blocks=BLOCKS_PER_DAY * MAX_ROUNDS + 1)
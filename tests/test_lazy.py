@@ -0,0 +1,46 @@
+import numpy as np
+import gurobipy as gp
+import pytest
+
+from conftest import FEASIBLE_SEEDS, INFEASIBLE_SEEDS, QUIET, small_data
+from lazy import LAZY_FAMILIES
+from model import build_model, solve
+
+
+def _solve(data, options):
+    m, v = build_model(data, options)
+    status = solve(m, QUIET)
+    return m, v, status
+
+
+@pytest.mark.parametrize('builder', ['expr', 'matrix'])
+@pytest.mark.parametrize('seed', FEASIBLE_SEEDS + INFEASIBLE_SEEDS)
+def test_lazy_matches_eager(seed, builder):
+    data = small_data(seed)
+    eager, _, eager_status = _solve(data, {'builder': builder})
+    lazy, v, lazy_status = _solve(data, {'builder': builder, 'lazy': LAZY_FAMILIES})
+    assert lazy_status == eager_status
+    if eager_status == gp.GRB.OPTIMAL:
+        assert lazy.ObjVal == pytest.approx(eager.ObjVal)
+        # The lazy solution satisfies every separated row
+        pool = lazy._lazy
+        values = np.array(lazy.getAttr('X', pool['vars']))
+        assert (pool['A'] @ values <= pool['rhs'] + 1e-6).all()
+    eager.dispose()
+    lazy.dispose()
+
+
+def test_lazy_columns_follow_variable_keys():
+    data = small_data(FEASIBLE_SEEDS[0])
+    m, v = build_model(data, {'lazy': LAZY_FAMILIES})
+    columns = m._lazy['vars']
+    assert len(columns) == m.NumVars
+    assert [var.VarName for var in columns] == [var.VarName for block in ('x', 'y', 'z', 'l', 'w')
+                                                 for var in v[block].values()]
+    m.dispose()
+
+
+@pytest.mark.parametrize('family', ['no_double_booking', 'prof_lab_time', 'one_prof'])
+def test_attach_rejects_other_families(family):
+    with pytest.raises(ValueError):
+        build_model(small_data(FEASIBLE_SEEDS[0]), {'lazy': (family,)})
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from conftest import FEASIBLE_SEEDS, SMALL_SIZE
+from generator import generate_workbook
+from main import main
+
+
+@pytest.fixture
+def workbook(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return generate_workbook(str(tmp_path / 'small.xlsx'), seed=FEASIBLE_SEEDS[0], **SMALL_SIZE)
+
+
+@pytest.mark.parametrize('mode', [[], ['--decompose'], ['--heuristic', 'only'], ['--backend', 'highs']])
+def test_profile_written_in_every_mode(workbook, tmp_path, mode):
+    if mode[-1:] == ['highs']:
+        pytest.importorskip('highspy')
+    path = tmp_path / 'profile.json'
+    main(['--file', workbook, '--no-cache', '--quiet', '--export', 'none', '--profile', str(path)] + mode)
+    report = json.loads(path.read_text())
+    assert report['phases']
+    if mode in ([], ['--decompose']):
+        assert report['model']['num_vars'] > 0
+
+
+def test_matrix_rejects_bilinear():
+    with pytest.raises(SystemExit):
+        main(['--matrix', '--bilinear'])
+
+
+def test_terms_report_their_own_objective(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    paths = [generate_workbook(str(tmp_path / f'{label}.xlsx'), seed=seed, **SMALL_SIZE)
+             for label, seed in zip(('fall', 'spring'), FEASIBLE_SEEDS)]
+    for mode in ([], ['--decompose']):
+        results, _ = main(['--terms', *paths, '--no-cache', '--quiet', '--export', 'none'] + mode)
+        for term in results.values():
+            assert term['objective'] == pytest.approx(term['prof_course']['Credits'].sum())
+
+
+@pytest.mark.parametrize('fmt, files', [('xlsx', ['incumbent.xlsx']),
+                                        ('csv', ['incumbent_Prof_Course_Assignments.csv'])])
+def test_stream_writes_in_export_format(workbook, tmp_path, fmt, files):
+    main(['--file', workbook, '--no-cache', '--quiet', '--export', fmt, '--stream', 'incumbent.xlsx'])
+    assert all((tmp_path / name).exists() for name in files)
+    assert not list(tmp_path.glob('*.tmp*'))
+
+
+def test_stream_rejects_no_export():
+    with pytest.raises(SystemExit):
+        main(['--stream', '--export', 'none'])
+
+
+def test_quiet_pool_prints_nothing(workbook, capsys):
+    main(['--file', workbook, '--no-cache', '--quiet', '--export', 'none', '--pool', '2'])
+    assert 'Changes' not in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('mode, label', [([], 'Optimal Objective Value'),
+                                         (['--heuristic', 'only'], 'Heuristic Objective Value')])
+def test_objective_label_follows_status(workbook, capsys, mode, label):
+    main(['--file', workbook, '--no-cache', '--export', 'none'] + mode)
+    assert f"{label} (Total Credits Scheduled)" in capsys.readouterr().out
+
+
+def test_decompose_time_limit_is_not_called_infeasible(workbook, capsys):
+    main(['--file', workbook, '--no-cache', '--quiet', '--export', 'none', '--decompose', '--time-limit', '0'])
+    assert 'No professor-course assignment' not in capsys.readouterr().out
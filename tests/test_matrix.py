@@ -0,0 +1,52 @@
+import pytest
+
+from conftest import small_data
+from matrix import assemble, equivalent
+from model import build_model
+
+
+BUILDER_OPTIONS = [
+    {'sparse': True},
+    {'sparse': False},
+    {'sparse': True, 'symmetry': True},
+    {'sparse': True, 'tight_labs': False},
+    {'sparse': True, 'skip': ('no_double_booking', 'grad_research_preffered')},
+    {'sparse': True, 'max_prime_share': 0.0, 'max_tth_share': 1.0},
+]
+
+
+def _assert_equivalent(data, options):
+    expr, _ = build_model(data, {**options, 'builder': 'expr'})
+    matrix, _ = build_model(data, {**options, 'builder': 'matrix'})
+    try:
+        assert equivalent(expr, matrix)
+    finally:
+        expr.dispose()
+        matrix.dispose()
+
+
+@pytest.mark.parametrize('options', BUILDER_OPTIONS)
+def test_builders_equivalent_on_workbook(shipped_data, options):
+    _assert_equivalent(shipped_data, options)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+@pytest.mark.parametrize('options', BUILDER_OPTIONS)
+def test_builders_equivalent_on_generated(seed, options):
+    _assert_equivalent(small_data(seed), options)
+
+
+def test_matrix_variable_keys_match(shipped_data):
+    expr, v_expr = build_model(shipped_data, {'builder': 'expr'})
+    matrix, v_matrix = build_model(shipped_data, {'builder': 'matrix'})
+    for block in v_expr:
+        assert list(v_expr[block].keys()) == list(v_matrix[block].keys())
+        assert expr.getAttr('VarName', list(v_expr[block].values())) == \
+            matrix.getAttr('VarName', list(v_matrix[block].values()))
+    expr.dispose()
+    matrix.dispose()
+
+
+def test_assemble_rejects_bilinear(shipped_data):
+    with pytest.raises(ValueError):
+        assemble(shipped_data, {'linearize': False})
@@ -0,0 +1,54 @@
+import gurobipy as gp
+import pytest
+
+from conftest import FEASIBLE_SEEDS, QUIET, size_limited, small_data
+from model import solve
+from multiterm import annual_loads, build_multiterm, solve_multiterm_decomposed, term_results
+
+
+@pytest.fixture
+def terms():
+    return {'fall': small_data(FEASIBLE_SEEDS[0]), 'spring': small_data(FEASIBLE_SEEDS[1])}
+
+
+def test_term_objectives_match_decomposition(terms):
+    annual = annual_loads(terms)
+    m, v = build_multiterm(terms, annual)
+    with size_limited():
+        assert solve(m, QUIET) == gp.GRB.OPTIMAL
+    monolithic = {label: term_results(m, v[label], terms[label])['objective'] for label in terms}
+    assert sum(monolithic.values()) == pytest.approx(m.ObjVal)
+    m.dispose()
+
+    models, history = solve_multiterm_decomposed(terms, annual, params=QUIET)
+    assert models is not None
+    for label, (term_m, term_v) in models.items():
+        assert term_m.status == gp.GRB.OPTIMAL
+        objective = term_results(term_m, term_v, terms[label])['objective']
+        assert objective == pytest.approx(term_m.ObjVal)
+        assert objective == pytest.approx(monolithic[label])
+        term_m.dispose()
+
+
+def test_decomposition_matches_monolithic_status(terms):
+    # Halving every annual load leaves too few credits for both terms
+    annual = {i: a / 2 for i, a in annual_loads(terms).items()}
+    m, _ = build_multiterm(terms, annual)
+    with size_limited():
+        status = solve(m, QUIET)
+    m.dispose()
+    models, _ = solve_multiterm_decomposed(terms, annual, params=QUIET)
+    assert (status == gp.GRB.OPTIMAL) == (models is not None and all(
+        term_m.status == gp.GRB.OPTIMAL for term_m, _ in models.values()))
+
+
+def test_timed_out_terms_get_no_cut(terms):
+    models, history = solve_multiterm_decomposed(terms, annual_loads(terms), params={**QUIET, 'TimeLimit': 0})
+    last = history[-1]
+    if models is None:
+        assert last['master_status'] == gp.GRB.TIME_LIMIT
+    else:
+        assert last['cuts'] == 0
+        assert last.get('stage2') == 'inconclusive' or all(m.SolCount > 0 for m, _ in models.values())
+        for m, _ in models.values():
+            m.dispose()
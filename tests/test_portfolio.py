@@ -0,0 +1,22 @@
+import gurobipy as gp
+
+from conftest import FEASIBLE_SEEDS, SMALL_SIZE
+from generator import generate_workbook
+from portfolio import solve_portfolio
+from sweep import split_threads
+
+
+def test_split_threads_clamps_workers():
+    assert split_threads(4, 8) == (4, 2)
+    assert split_threads(6, 2) == (2, 1)
+    assert split_threads(0, 3) == (1, 3)
+
+
+def test_portfolio_schedule(tmp_path):
+    path = generate_workbook(str(tmp_path / 'small.xlsx'), seed=FEASIBLE_SEEDS[0], **SMALL_SIZE)
+    winner, rows = solve_portfolio(path, size=3, threads=2, cache_dir=str(tmp_path / 'cache'))
+    assert len(rows) <= 2
+    assert winner['status'] == gp.GRB.OPTIMAL
+    assert winner['params']['Threads'] == 1
+    assert len(winner['schedule']['x']) == SMALL_SIZE['num_courses']
+    assert len(winner['schedule']['y']) == SMALL_SIZE['num_courses']
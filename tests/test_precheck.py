@@ -0,0 +1,44 @@
+import gurobipy as gp
+import pytest
+
+from conftest import FEASIBLE_SEEDS, INFEASIBLE_SEEDS, QUIET, small_data
+from model import build_model, solve
+from precheck import check_data, diagnose, suspects
+
+
+def _status(data):
+    m, _ = build_model(data)
+    status = solve(m, QUIET)
+    m.dispose()
+    return status
+
+
+@pytest.mark.parametrize('seed', range(12))
+def test_issues_only_on_infeasible_data(seed):
+    data = small_data(seed)
+    issues = check_data(data)
+    status = _status(data)
+    # Every check is a necessary condition: no false positives on feasible data
+    if status == gp.GRB.OPTIMAL:
+        assert issues == []
+    if issues:
+        assert status == gp.GRB.INFEASIBLE
+
+
+def test_no_issues_on_workbook(shipped_data):
+    assert check_data(shipped_data) == []
+
+
+@pytest.mark.parametrize('seed', FEASIBLE_SEEDS)
+def test_no_issues_on_feasible_seeds(seed):
+    assert check_data(small_data(seed)) == []
+
+
+@pytest.mark.parametrize('seed', INFEASIBLE_SEEDS)
+def test_diagnose_infeasible_seeds(seed):
+    data = small_data(seed)
+    issues = check_data(data)
+    assert issues
+    diagnosis = diagnose(data, suspects(data, issues), params=QUIET)
+    if diagnosis is not None:
+        assert diagnosis['iis']
@@ -0,0 +1,68 @@
+import gurobipy as gp
+import pandas as pd
+import pytest
+
+from conftest import FEASIBLE_SEEDS, QUIET, small_data
+from heuristic import heuristic_schedule, schedule_results
+from model import build_model, solve
+from utils import (RESULT_BLOCKS, RESULT_COLUMNS, export_results, extract_results, extract_pool, objective_label,
+                   pool_params, print_results)
+from warm_start import apply_start, load_schedule
+
+
+@pytest.fixture(scope='module')
+def solved():
+    data = small_data(FEASIBLE_SEEDS[0])
+    m, v = build_model(data)
+    solve(m, {**QUIET, **pool_params(2)})
+    yield data, m, v
+    m.dispose()
+
+
+def test_schedule_round_trips_through_workbook(solved, tmp_path):
+    data, m, v = solved
+    results = extract_results(m, v['x'], v['y'], v['l'], data['courses_attr'], data['times_attr'])
+    path = tmp_path / 'results.xlsx'
+    export_results(results, str(path), verbose=False)
+    schedule = load_schedule(str(path))
+    for block, table in RESULT_BLOCKS.items():
+        expected = set(results[table][RESULT_COLUMNS[block]].itertuples(index=False, name=None)) \
+            if not results[table].empty else set()
+        assert schedule[block] == expected
+    # The tables of a schedule rebuilt from its keys match the model's
+    rebuilt = schedule_results(schedule, data)
+    for table in RESULT_BLOCKS.values():
+        columns = list(results[table].columns)
+        pd.testing.assert_frame_equal(
+            rebuilt[table][columns].sort_values(columns).reset_index(drop=True),
+            results[table].sort_values(columns).reset_index(drop=True), check_dtype=False)
+
+
+def test_pool_tables_use_result_columns(solved):
+    data, m, v = solved
+    pool = extract_pool(m, v['x'], v['y'], v['l'], data['courses_attr'], data['times_attr'], 2)
+    for results in pool:
+        for block, table in RESULT_BLOCKS.items():
+            if not results[table].empty:
+                assert set(RESULT_COLUMNS[block]) <= set(results[table].columns)
+
+
+def test_objective_label_only_claims_proven_optima():
+    assert objective_label('OPTIMAL') == "Optimal Objective Value"
+    for status in ('TIME_LIMIT', 'INTERRUPTED', 'SUBOPTIMAL', 'HEURISTIC'):
+        assert 'Optimal' not in objective_label(status)
+
+
+def test_early_stop_without_bound_prints_no_gap(capsys):
+    data = small_data(FEASIBLE_SEEDS[0])
+    m, v = build_model(data)
+    apply_start(m, v, heuristic_schedule(data)[0], 'start')
+    # Stop at the first incumbent (the MIP start), before the root bound exists
+    m._callbacks = [lambda model, where: model.terminate() if where == gp.GRB.Callback.MIPSOL else None]
+    solve(m, QUIET)
+    assert m.SolCount > 0
+    print_results(m, v['x'], v['y'], v['l'], data['courses_attr'], data['times_attr'], fmt='none', show=False)
+    out = capsys.readouterr().out
+    assert 'inf%' not in out
+    assert 'no bound available yet' in out
+    m.dispose()
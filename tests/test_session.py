@@ -0,0 +1,81 @@
+import copy
+
+import pytest
+
+from conftest import QUIET, size_limited
+from model import build_model, solve
+from session import Session
+from utils import selected_keys
+
+
+def _apply(data, diff):
+    """Applies a Session.update diff to a copy of data, for a fresh build."""
+    data = copy.deepcopy(data)
+    for (i, j), value in diff.get('c_var', {}).items():
+        data['c_var'][i, j] = value
+        data['c_arr'][data['prof_index'][i], data['course_index'][j]] = value
+    for (i, k), value in diff.get('d_var', {}).items():
+        data['d_var'][i, k] = value
+        data['d_arr'][data['prof_index'][i], data['time_index'][k]] = value
+    for i, value in diff.get('a_var', {}).items():
+        data['a_var'][i] = value
+        data['a_arr'][data['prof_index'][i]] = value
+    return data
+
+
+def _fresh(data, options, diff):
+    m, _ = build_model(_apply(data, diff), options)
+    status = solve(m, QUIET)
+    objective = m.ObjVal if m.SolCount > 0 else None
+    m.dispose()
+    return status, objective
+
+
+def _diffs(session):
+    """Diffs against the session's first schedule: drop a taught course, block a busy slot, cut a load, add an ineligible pair."""
+    taught = selected_keys(session.m, session.v['x'], ['Prof', 'Course_Number'])
+    busy = selected_keys(session.m, session.v['z'], ['Prof', 'Time_Index'])
+    i, j = taught.iloc[0]
+    p, k = busy.iloc[-1]
+    data = session.data
+    ineligible = next((a, b) for (a, b), c in data['c_var'].items() if c == 0)
+    every_prof = {(a, j): 0 for a in data['idx_prof'].tolist()}
+    return [
+        ('updated', {'c_var': {(i, j): 0}}),
+        ('updated', {'d_var': {(p, k): 0}}),
+        ('updated', {'a_var': {i: data['a_var'][i] - 3}}),
+        ('rebuilt', {'c_var': {ineligible: 1}}),
+        ('updated', {'c_var': every_prof}),
+    ]
+
+
+@pytest.mark.parametrize('options', [{'sparse': True}, {'sparse': False}, {'tight_labs': False}])
+def test_updates_match_fresh_build(feasible_data, options):
+    session = Session(feasible_data, options, QUIET)
+    with size_limited():
+        session.solve()
+    base = copy.deepcopy(session.data)
+    for expected, diff in _diffs(session):
+        probe = Session(base, options, QUIET)
+        probe.solve()
+        assert probe.update(diff) == expected
+        status = probe.solve()
+        objective = probe.m.ObjVal if probe.m.SolCount > 0 else None
+        assert (status, objective) == _fresh(base, options, diff)
+        probe.m.dispose()
+    session.m.dispose()
+
+
+def test_updates_accumulate(feasible_data):
+    session = Session(feasible_data, params=QUIET)
+    session.solve()
+    base = copy.deepcopy(session.data)
+    combined = {}
+    for _, diff in _diffs(session)[:3]:
+        session.update(diff)
+        session.solve()
+        for name, values in diff.items():
+            combined.setdefault(name, {}).update(values)
+        objective = session.m.ObjVal if session.m.SolCount > 0 else None
+        assert (session.m.status, objective) == _fresh(base, {}, combined)
+    session.m.dispose()
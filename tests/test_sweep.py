@@ -0,0 +1,24 @@
+import pytest
+
+import sweep
+from conftest import FEASIBLE_SEEDS, SMALL_SIZE
+from generator import generate_workbook
+
+
+@pytest.fixture
+def workbook(tmp_path, monkeypatch):
+    monkeypatch.setattr(sweep, 'CACHE_DIR', str(tmp_path / 'cache'))
+    return generate_workbook(str(tmp_path / 'small.xlsx'), seed=FEASIBLE_SEEDS[0], **SMALL_SIZE)
+
+
+@pytest.mark.parametrize('share', [0.0, 0.5, 1.0])
+def test_any_share_is_a_sweep_point(workbook, share):
+    row = sweep.run_variant(workbook, {'max_prime_share': share, 'max_tth_share': share}, {'OutputFlag': 0})
+    assert 'error' not in row
+    assert row['status'] in ('OPTIMAL', 'INFEASIBLE')
+
+
+def test_failed_variant_records_its_error(workbook):
+    row = sweep.run_variant(workbook, {'lazy': ('no_such_family',)}, {'OutputFlag': 0})
+    assert row['status'] is None
+    assert row['error'].startswith('ValueError')
@@ -1,5 +1,13 @@
+import json
+import math
+import os
+
+import numpy as np
 import pandas as pd
 import gurobipy as gp
+from openpyxl import Workbook
+
+from profiler import phase
 
 # --- Helper Functions (From Section 2) ---
 
@@ -23,131 +31,357 @@ def safe_df_creation(data_list, columns):
     return pd.DataFrame(data_list)
 
 
-# --- Output Function (Replaces Section 4) ---
+# --- Output Functions (Replace Section 4) ---
+
+STATUS_CODES = {
+    1: 'LOADED',
+    2: 'OPTIMAL',
+    3: 'INFEASIBLE',
+    4: 'INF_OR_UNBD',
+    5: 'UNBOUNDED',
+    9: 'TIME_LIMIT',
+    11: 'INTERRUPTED',
+    13: 'SUBOPTIMAL',
+}
+
+OUTPUT_FILENAME = 'course_schedule_results.xlsx'
+POOL_FILENAME = 'course_schedule_pool.xlsx'
+
+# Key columns of the x, y and l result tables, and the table each block fills
+RESULT_COLUMNS = {
+    'x': ['Prof', 'Course_Number'],
+    'y': ['Course_Number', 'Time_Index'],
+    'l': ['Prof', 'Course_Number', 'Time_Index'],
+}
+RESULT_BLOCKS = {'x': 'prof_course', 'y': 'course_time', 'l': 'labs'}
 
-def print_results(m, x_var, y_var, l_var, courses_attr, times_attr):
+# Pool solutions kept per schedule asked for: pool members can differ only in z/w
+# (slots marked busy without a class), which extract_pool collapses
+POOL_OVERSAMPLE = 4
+
+def selected_keys(m, var_dict, columns):
     """
-    Extracts, merges, and prints the course, time, and lab assignments
-    from the optimized Gurobi model, and exports results to XLSX.
-    """
-    status_codes = {
-        1: 'LOADED',
-        2: 'OPTIMAL',
-        3: 'INFEASIBLE',
-        4: 'INF_OR_UNBD',
-        5: 'UNBOUNDED'
-    }
+    Returns the keys of the binary variables in var_dict that are set in the
+    current solution, as a DataFrame. All values are read with one getAttr call.
+    """
+    if not var_dict:
+        return pd.DataFrame(columns=columns)
+    keys = list(var_dict.keys())
+    values = np.asarray(m.getAttr('X', list(var_dict.values())))
+    chosen = np.flatnonzero(values > 0.5)
+    return pd.DataFrame([keys[n] for n in chosen], columns=columns)
 
-    if m.status == gp.GRB.OPTIMAL:
-        
-        # --- Data Extraction ---
-
-        # 1. Extract Professor to Course Assignments (x_var)
-        prof_course_assignments = []
-        for (i, j), var in x_var.items():
-            if var.X > 0.5:
-                prof_course_assignments.append({'Prof': i, 'Course_Number': j})
-        
-        prof_course_df = safe_df_creation(prof_course_assignments, ['Prof', 'Course_Number'])
-
-        prof_course_output = prof_course_df.merge(
-            courses_attr[['Number', 'Name', 'Credits', 'Grad/Ugrad']], 
-            left_on='Course_Number', 
-            right_on='Number', 
-            how='left'
-        ).drop(columns=['Number'], errors='ignore') 
+def extract_results(m, x_var, y_var, l_var, courses_attr, times_attr):
+    """
+    Extracts the course, time, and lab assignments from the solved model and
+    merges in the course and time attributes. Returns a dict of DataFrames
+    ('prof_course', 'course_time', 'labs', 'combined') and the objective.
+    """
+    return tabulate_results(
+        selected_keys(m, x_var, RESULT_COLUMNS['x']),
+        selected_keys(m, y_var, RESULT_COLUMNS['y']),
+        selected_keys(m, l_var, RESULT_COLUMNS['l']),
+        m.ObjVal, courses_attr, times_attr
+    )
 
-        # 2. Extract Course to Time Slot Assignments (y_var)
-        course_time_assignments = []
-        for (j, k), var in y_var.items():
-            if var.X > 0.5:
-                course_time_assignments.append({'Course_Number': j, 'Time_Index': k})
-        
-        course_time_df = safe_df_creation(course_time_assignments, ['Course_Number', 'Time_Index'])
+def tabulate_results(prof_course_df, course_time_df, lab_df, objective, courses_attr, times_attr):
+    """
+    Merges the course and time attributes into the selected x, y and l keys
+    and returns the result tables (see extract_results).
+    """
+    # 1. Professor to Course Assignments (x_var)
+    prof_course_output = prof_course_df.merge(
+        courses_attr[['Number', 'Name', 'Credits', 'Grad/Ugrad']],
+        left_on='Course_Number',
+        right_on='Number',
+        how='left'
+    ).drop(columns=['Number'], errors='ignore')
 
-        course_time_output = course_time_df.merge(
-            times_attr[['index', 'Times', 'Days']],
-            left_on='Time_Index',
-            right_on='index',
-            how='left'
-        ).drop(columns=['index'], errors='ignore').merge(
+    # 2. Course to Time Slot Assignments (y_var)
+    course_time_output = course_time_df.merge(
+        times_attr[['index', 'Times', 'Days']],
+        left_on='Time_Index',
+        right_on='index',
+        how='left'
+    ).drop(columns=['index'], errors='ignore').merge(
+        courses_attr[['Number', 'Name']],
+        left_on='Course_Number',
+        right_on='Number',
+        how='left'
+    ).drop(columns=['Number'], errors='ignore')
+
+    # 3. Lab Assignments (l_var)
+    lab_output = pd.DataFrame()
+    if not lab_df.empty:
+        lab_output = lab_df.merge(
             courses_attr[['Number', 'Name']],
             left_on='Course_Number',
             right_on='Number',
             how='left'
-        ).drop(columns=['Number'], errors='ignore')
-
-        # 3. Extract Lab Assignments (l_var)
-        lab_assignments = []
-        for (i, j, k), var in l_var.items():
-            if var.X > 0.5:
-                lab_assignments.append({'Prof': i, 'Course_Number': j, 'Time_Index': k})
-
-        lab_df = safe_df_creation(lab_assignments, ['Prof', 'Course_Number', 'Time_Index'])
-        
-        lab_output = pd.DataFrame()
-        if not lab_df.empty:
-            lab_output = lab_df.merge(
-                courses_attr[['Number', 'Name']],
-                left_on='Course_Number',
-                right_on='Number',
-                how='left'
-            ).drop(columns=['Number'], errors='ignore').merge(
-                times_attr[['index', 'Times', 'Days']],
-                left_on='Time_Index',
-                right_on='index',
-                how='left'
-            ).drop(columns=['index'], errors='ignore')
-
-        # 4. Combined Schedule (Prof, Course, Time)
-        combined_schedule = pd.merge(
-            prof_course_output, 
-            course_time_output.drop(columns=['Name'], errors='ignore'),
-            on='Course_Number', 
-            how='inner'
-        )
-        
-        # --- Terminal Output ---
-        
-        print("\n--- Professor-Course Assignments (x_var) ---")
-        print(prof_course_output.sort_values(by=['Prof', 'Course_Number']))
-        print("-" * 50)
+        ).drop(columns=['Number'], errors='ignore').merge(
+            times_attr[['index', 'Times', 'Days']],
+            left_on='Time_Index',
+            right_on='index',
+            how='left'
+        ).drop(columns=['index'], errors='ignore')
 
-        print("\n--- Course-Time Assignments (y_var) ---")
-        print(course_time_output.sort_values(by=['Course_Number', 'Times']))
+    # 4. Combined Schedule (Prof, Course, Time)
+    combined_schedule = pd.merge(
+        prof_course_output,
+        course_time_output.drop(columns=['Name'], errors='ignore'),
+        on='Course_Number',
+        how='inner'
+    )
+
+    return {
+        'prof_course': prof_course_output,
+        'course_time': course_time_output,
+        'labs': lab_output,
+        'combined': combined_schedule,
+        'objective': objective,
+    }
+
+def objective_label(status):
+    """How show_results names the objective of a schedule with the given status (a STATUS_CODES name, or 'HEURISTIC')."""
+    if status == 'OPTIMAL':
+        return "Optimal Objective Value"
+    if status == 'HEURISTIC':
+        return "Heuristic Objective Value"
+    return f"Best Objective Value ({status})"
+
+def show_results(results, status='OPTIMAL'):
+    """Pretty-prints the tables returned by extract_results; status words the objective line (see objective_label)."""
+    print("\n--- Professor-Course Assignments (x_var) ---")
+    print(results['prof_course'].sort_values(by=['Prof', 'Course_Number']))
+    print("-" * 50)
+
+    print("\n--- Course-Time Assignments (y_var) ---")
+    print(results['course_time'].sort_values(by=['Course_Number', 'Times']))
+    print("-" * 50)
+
+    if not results['labs'].empty:
+        print("\n--- Lab Assignments (l_var) ---")
+        print(results['labs'].sort_values(by=['Prof', 'Course_Number', 'Times']))
         print("-" * 50)
+    else:
+        print("\n--- No Lab Assignments Found ---")
+        print("-" * 50)
+
+    combined_schedule = results['combined']
+    print("\n--- Final Course Schedule ---")
+    final_cols = ['Prof', 'Name', 'Times', 'Days', 'Credits', 'Grad/Ugrad']
+    present_cols = [col for col in final_cols if col in combined_schedule.columns]
+    print(combined_schedule[present_cols].sort_values(by=['Prof', 'Times']))
+    print("-" * 50)
+
+    print(f"\n{objective_label(status)} (Total Credits Scheduled): {results['objective']}")
 
-        if not lab_output.empty:
-            print("\n--- Lab Assignments (l_var) ---")
-            print(lab_output.sort_values(by=['Prof', 'Course_Number', 'Times']))
-            print("-" * 50)
+# Statuses that can stop the solve early with a usable (not proven optimal) schedule
+EARLY_STOP_STATUSES = (9, 11, 13)  # TIME_LIMIT, INTERRUPTED, SUBOPTIMAL
+
+# Output formats of write_tables ('none' skips the export)
+EXPORT_FORMATS = ('xlsx', 'csv', 'parquet', 'json', 'none')
+
+# Sheets (or file suffixes) of the result tables, in export order
+RESULT_SHEETS = {
+    'prof_course': 'Prof_Course_Assignments',
+    'course_time': 'Course_Time_Assignments',
+    'combined': 'Combined_Schedule',
+    'labs': 'Lab_Assignments',
+}
+
+def export_path(output_filename, fmt):
+    """output_filename with the extension of fmt (e.g. results.xlsx -> results.json)."""
+    return f"{os.path.splitext(output_filename)[0]}.{fmt}"
+
+def shown_path(output_filename, fmt):
+    """How the output of write_tables is named in progress messages (one file per table as <stem>_*)."""
+    if fmt in ('csv', 'parquet'):
+        root, ext = os.path.splitext(output_filename)
+        return f"{root}_*{ext}"
+    return output_filename
+
+def _write_xlsx(tables, output_filename):
+    """Writes {sheet: DataFrame} row by row through openpyxl's write-only (streaming) workbook."""
+    workbook = Workbook(write_only=True)
+    for sheet, df in tables.items():
+        worksheet = workbook.create_sheet(sheet)
+        worksheet.append([str(column) for column in df.columns])
+        for row in df.astype(object).where(df.notna(), None).itertuples(index=False, name=None):
+            worksheet.append(row)
+    workbook.save(output_filename)
+
+def write_tables(tables, output_filename, fmt='xlsx'):
+    """
+    Writes {sheet: DataFrame} in one of EXPORT_FORMATS: one workbook sheet
+    per table (xlsx), one file per table named <stem>_<sheet> (csv,
+    parquet; parquet needs pyarrow or fastparquet), or one file of
+    {sheet: records} (json). Returns the paths written.
+    """
+    if fmt == 'none':
+        return []
+    if fmt == 'xlsx':
+        _write_xlsx(tables, output_filename)
+        return [output_filename]
+    if fmt == 'json':
+        with open(output_filename, 'w') as f:
+            json.dump({sheet: json.loads(df.to_json(orient='records')) for sheet, df in tables.items()}, f)
+        return [output_filename]
+
+    root, ext = os.path.splitext(output_filename)
+    paths = []
+    for sheet, df in tables.items():
+        path = f"{root}_{sheet}{ext}"
+        if fmt == 'csv':
+            df.to_csv(path, index=False)
         else:
-            print("\n--- No Lab Assignments Found ---")
-            print("-" * 50)
-        
-        print("\n--- Final Course Schedule ---")
-        final_cols = ['Prof', 'Name', 'Times', 'Days', 'Credits', 'Grad/Ugrad']
-        present_cols = [col for col in final_cols if col in combined_schedule.columns]
-        print(combined_schedule[present_cols].sort_values(by=['Prof', 'Times']))
-        print("-" * 50)
+            df.to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+def result_tables(results):
+    """{sheet: DataFrame} of the tables returned by extract_results, in RESULT_SHEETS order (no lab sheet without labs)."""
+    return {sheet: results[key] for key, sheet in RESULT_SHEETS.items() if key != 'labs' or not results['labs'].empty}
 
-        print(f"\nOptimal Objective Value (Total Credits Scheduled): {m.ObjVal}")
-
-        # --- File Output (XLSX) ---
-        
-        output_filename = 'course_schedule_results.xlsx'
-        print(f"\nWriting results to {output_filename}...")
-        
-        # Removed engine='xlsxwriter'
-        with pd.ExcelWriter(output_filename) as writer: 
-            prof_course_output.to_excel(writer, sheet_name='Prof_Course_Assignments', index=False)
-            course_time_output.to_excel(writer, sheet_name='Course_Time_Assignments', index=False)
-            combined_schedule.to_excel(writer, sheet_name='Combined_Schedule', index=False)
-            if not lab_output.empty:
-                lab_output.to_excel(writer, sheet_name='Lab_Assignments', index=False)
+def export_results(results, output_filename=OUTPUT_FILENAME, verbose=True, fmt='xlsx'):
+    """
+    Writes the tables returned by extract_results in the given format (see
+    write_tables); output_filename gets the format's extension.
+    """
+    if fmt == 'none':
+        return []
+    output_filename = export_path(output_filename, fmt)
+    if verbose:
+        print(f"\nWriting results to {shown_path(output_filename, fmt)}...")
+    paths = write_tables(result_tables(results), output_filename, fmt)
+    if verbose:
         print("Export complete.")
+    return paths
 
-    else:
-        print(f"\nOptimization ended with status: {status_codes.get(m.status, 'UNKNOWN')}")
-        if m.status == gp.GRB.INFEASIBLE:
-            print("Model is infeasible. Consider computing IIS (m.computeIIS()) to debug constraints.")
\ No newline at end of file
+def print_results(m, x_var, y_var, l_var, courses_attr, times_attr, output_filename=OUTPUT_FILENAME, profiler=None,
+                  pool=None, fmt='xlsx', show=True):
+    """
+    Extracts, merges, and prints the course, time, and lab assignments
+    from the optimized Gurobi model, and exports results (XLSX by default,
+    see write_tables for fmt; 'none' skips the export). show=False skips
+    the console tables, the pool summary included. A solve stopped early
+    (time limit, interrupt, suboptimal) reports its best schedule. With
+    pool=k, the k best distinct schedules in the solution pool (see
+    pool_params) are also exported to POOL_FILENAME.
+    """
+    if m.status in EARLY_STOP_STATUSES and m.SolCount > 0:
+        gap = f"MIP gap {m.MIPGap:.2%}" if math.isfinite(m.MIPGap) else "no bound available yet"
+        print(f"\nOptimization stopped with status {STATUS_CODES[m.status]}; "
+              f"reporting the best schedule found ({gap})")
+    if m.status == gp.GRB.OPTIMAL or (m.status in EARLY_STOP_STATUSES and m.SolCount > 0):
+        with phase(profiler, 'extract'):
+            results = extract_results(m, x_var, y_var, l_var, courses_attr, times_attr)
+        if show:
+            with phase(profiler, 'print'):
+                show_results(results, STATUS_CODES[m.status])
+        with phase(profiler, fmt):
+            export_results(results, output_filename, fmt=fmt)
+        if pool:
+            with phase(profiler, 'pool'):
+                schedules = extract_pool(m, x_var, y_var, l_var, courses_attr, times_attr, pool)
+                summary = export_pool(schedules, times_attr, fmt=fmt)
+            if show:
+                print(summary.to_string(index=False))
+        return results
+
+    print(f"\nOptimization ended with status: {STATUS_CODES.get(m.status, 'UNKNOWN')}")
+    if m.status == gp.GRB.INFEASIBLE:
+        print("Model is infeasible. Run with --diagnose for an IIS of a reduced model (see precheck.diagnose).")
+    return None
+
+
+# --- Solution Pool ---
+
+def pool_params(k):
+    """Solver parameters that keep the k best schedules in Gurobi's solution pool (see extract_pool)."""
+    return {'PoolSolutions': k * POOL_OVERSAMPLE, 'PoolSearchMode': 2}
+
+def extract_pool(m, x_var, y_var, l_var, courses_attr, times_attr, k=None):
+    """
+    Extracts the schedules in the solution pool, best first, as a list of
+    extract_results dicts. Pool members with the same x, y and l (differing
+    only in z or w) are collapsed, and at most k schedules are returned.
+    Each solution's values are read with one getAttr call.
+    """
+    blocks = [(x_var, RESULT_COLUMNS['x']), (y_var, RESULT_COLUMNS['y']), (l_var, RESULT_COLUMNS['l'])]
+    keys = [list(var_dict.keys()) for var_dict, _ in blocks]
+    variables = [var for var_dict, _ in blocks for var in var_dict.values()]
+    bounds = np.cumsum([0] + [len(block_keys) for block_keys in keys])
+
+    pool, seen = [], set()
+    for n in range(m.SolCount):
+        m.Params.SolutionNumber = n
+        chosen = np.asarray(m.getAttr('Xn', variables)) > 0.5
+        signature = np.packbits(chosen).tobytes()
+        if signature in seen:
+            continue
+        seen.add(signature)
+        tables = [pd.DataFrame([block_keys[i] for i in np.flatnonzero(chosen[lo:hi])], columns=columns)
+                  for block_keys, (_, columns), lo, hi in zip(keys, blocks, bounds[:-1], bounds[1:])]
+        pool.append(tabulate_results(*tables, m.PoolObjVal, courses_attr, times_attr))
+        if k is not None and len(pool) == k:
+            break
+    m.Params.SolutionNumber = 0
+    return pool
+
+def _assignments(results):
+    """The (assignment, prof, course, time) tuples of one schedule."""
+    rows = {('prof_course', i, j, None) for i, j in results['prof_course'][RESULT_COLUMNS['x']].itertuples(index=False)}
+    rows |= {('course_time', None, j, k) for j, k in results['course_time'][RESULT_COLUMNS['y']].itertuples(index=False)}
+    if not results['labs'].empty:
+        rows |= {('lab', i, j, k) for i, j, k in results['labs'][RESULT_COLUMNS['l']].itertuples(index=False)}
+    return rows
+
+def pool_differences(pool):
+    """
+    Lists the assignments in which each pool schedule differs from the best
+    one (Solution 1): one row per added or removed prof-course, course-time
+    or lab assignment.
+    """
+    columns = ['Solution', 'Change', 'Assignment', 'Prof', 'Course_Number', 'Time_Index']
+    best = _assignments(pool[0]) if pool else set()
+    rows = []
+    for n, results in enumerate(pool[1:], start=2):
+        other = _assignments(results)
+        rows += [(n, 'removed', *row) for row in sorted(best - other, key=str)]
+        rows += [(n, 'added', *row) for row in sorted(other - best, key=str)]
+    return pd.DataFrame(rows, columns=columns).astype({'Time_Index': 'Int64'})
+
+def pool_schedules(pool, times_attr):
+    """Side-by-side view of the pool: one row per course, with each solution's prof, time and lab time."""
+    slot = dict(zip(times_attr['index'], times_attr['Days'].astype(str) + ' ' + times_attr['Times'].astype(str)))
+    table = None
+    for n, results in enumerate(pool, start=1):
+        solution = results['combined'][['Course_Number', 'Name', 'Prof', 'Time_Index']].rename(
+            columns={'Prof': f'Prof_{n}'})
+        solution[f'Time_{n}'] = solution.pop('Time_Index').map(slot)
+        labs = results['labs']
+        lab_times = labs.groupby('Course_Number')['Time_Index'].first().map(slot) if not labs.empty else pd.Series(dtype=str)
+        solution[f'Lab_{n}'] = solution['Course_Number'].map(lab_times)
+        table = solution if table is None else table.merge(solution, on=['Course_Number', 'Name'], how='outer')
+    return table.sort_values('Course_Number').reset_index(drop=True) if table is not None else pd.DataFrame()
+
+def export_pool(pool, times_attr, output_filename=POOL_FILENAME, fmt='xlsx'):
+    """
+    Writes the pool (as an XLSX workbook by default, see write_tables): a
+    ranked summary, the schedules side by side and the differences from the
+    best schedule (see pool_differences). Returns the summary.
+    """
+    differences = pool_differences(pool)
+    summary = pd.DataFrame({
+        'Solution': range(1, len(pool) + 1),
+        'Objective': [results['objective'] for results in pool],
+        'Changes': [0] + [int((differences['Solution'] == n).sum()) for n in range(2, len(pool) + 1)],
+    })
+    if fmt != 'none':
+        output_filename = export_path(output_filename, fmt)
+        print(f"\nWriting {len(pool)} schedules to {shown_path(output_filename, fmt)}...")
+        write_tables({'Pool_Summary': summary, 'Pool_Schedules': pool_schedules(pool, times_attr),
+                      'Pool_Differences': differences}, output_filename, fmt)
+        print("Export complete.")
+    return summary
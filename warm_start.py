@@ -0,0 +1,44 @@
+import pandas as pd
+
+from utils import OUTPUT_FILENAME, RESULT_BLOCKS, RESULT_COLUMNS, RESULT_SHEETS
+
+
+# Position of the course number within each block's keys
+COURSE_POS = {'x': 1, 'y': 0, 'l': 1}
+
+
+def load_schedule(filename=OUTPUT_FILENAME):
+    """
+    Reads a previous results workbook (as written by utils.print_results) and
+    returns the assigned x, y and l keys as a dict of sets.
+    """
+    sheets = pd.read_excel(filename, sheet_name=None)
+    schedule = {}
+    for block, table in RESULT_BLOCKS.items():
+        columns = RESULT_COLUMNS[block]
+        df = sheets.get(RESULT_SHEETS[table], pd.DataFrame(columns=columns))
+        schedule[block] = set(df[columns].itertuples(index=False, name=None))
+    return schedule
+
+
+def apply_start(m, v, schedule, mode='start'):
+    """
+    Maps a previous schedule onto the model's x, y and l variables as MIP start
+    values (mode='start') or variable hints (mode='hint'). Only courses that
+    appear in the previous schedule are set (1 if assigned before, else 0);
+    z, w and new courses are left for Gurobi to complete. Returns the number
+    of previous assignments per block that have no variable in this model.
+    """
+    attr = {'start': 'Start', 'hint': 'VarHintVal'}[mode]
+    courses = {key[COURSE_POS[block]] for block in ('x', 'y') for key in schedule[block]}
+
+    missing = {}
+    for block, chosen in schedule.items():
+        var_dict = v[block]
+        keys = [key for key in var_dict.keys() if key[COURSE_POS[block]] in courses]
+        if keys:
+            m.setAttr(attr, [var_dict[key] for key in keys], [1.0 if key in chosen else 0.0 for key in keys])
+        missing[block] = sum(1 for key in chosen if key not in var_dict)
+
+    m.update()
+    return missing